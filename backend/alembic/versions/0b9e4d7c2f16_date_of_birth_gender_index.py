@@ -0,0 +1,45 @@
+"""Date of birth and gender index.
+
+Replaces the date_of_birth index with one on (date_of_birth, gender):
+age ranges still scan it, age and gender demographics are answered from
+it alone. Both are built and dropped without blocking writes.
+
+Revision ID: 0b9e4d7c2f16
+Revises: f7c2d5b8a391
+Create Date: 2026-10-17 21:36:05.418372
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b9e4d7c2f16'
+down_revision: Union[str, None] = 'f7c2d5b8a391'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_customermaster_date_of_birth_gender',
+                        'customermaster', ['date_of_birth', 'gender'],
+                        unique=False, postgresql_concurrently=True,
+                        if_not_exists=True)
+        # Its leading column makes the single column index redundant.
+        op.drop_index('ix_customermaster_date_of_birth',
+                      table_name='customermaster',
+                      postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_customermaster_date_of_birth', 'customermaster',
+                        ['date_of_birth'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_customermaster_date_of_birth_gender',
+                      table_name='customermaster',
+                      postgresql_concurrently=True, if_exists=True)
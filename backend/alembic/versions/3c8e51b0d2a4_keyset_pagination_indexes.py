@@ -0,0 +1,40 @@
+"""Keyset pagination indexes.
+
+Revision ID: 3c8e51b0d2a4
+Revises: aafd25740a63
+Create Date: 2026-10-17 10:12:41.208315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c8e51b0d2a4'
+down_revision: Union[str, None] = 'aafd25740a63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = (
+    'customermaster',
+    'bodymeasurementmaster',
+    'bodymeasurementaianalysismaster',
+    'injurymaster',
+    'diseasemaster',
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.create_index(op.f(f'ix_{table}_created_at_id'), table,
+                        ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        op.drop_index(op.f(f'ix_{table}_created_at_id'), table_name=table)
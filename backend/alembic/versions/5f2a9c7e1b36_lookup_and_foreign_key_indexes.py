@@ -0,0 +1,56 @@
+"""Lookup and foreign key indexes.
+
+Revision ID: 5f2a9c7e1b36
+Revises: 3c8e51b0d2a4
+Create Date: 2026-10-17 11:03:17.554920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f2a9c7e1b36'
+down_revision: Union[str, None] = '3c8e51b0d2a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Customer lookups.
+    op.create_index('ix_customermaster_mobile_number', 'customermaster',
+                    ['mobile_number'], unique=True,
+                    postgresql_where=sa.text('mobile_number IS NOT NULL'))
+    op.create_index(op.f('ix_customermaster_date_of_birth'), 'customermaster',
+                    ['date_of_birth'], unique=False)
+
+    # Foreign keys used by the relationship loaders.
+    op.create_index('ix_bodymeasurementmaster_customer_id_measured_on',
+                    'bodymeasurementmaster', ['customer_id', 'measured_on'],
+                    unique=False)
+    op.create_index(op.f('ix_injurymaster_customer_id'), 'injurymaster',
+                    ['customer_id'], unique=False)
+    op.create_index(op.f('ix_diseasemaster_customer_id'), 'diseasemaster',
+                    ['customer_id'], unique=False)
+    op.create_index(op.f('ix_bodymeasurementaianalysismaster_bodymeasurement_id'),
+                    'bodymeasurementaianalysismaster', ['bodymeasurement_id'],
+                    unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_bodymeasurementaianalysismaster_bodymeasurement_id'),
+                  table_name='bodymeasurementaianalysismaster')
+    op.drop_index(op.f('ix_diseasemaster_customer_id'),
+                  table_name='diseasemaster')
+    op.drop_index(op.f('ix_injurymaster_customer_id'),
+                  table_name='injurymaster')
+    op.drop_index('ix_bodymeasurementmaster_customer_id_measured_on',
+                  table_name='bodymeasurementmaster')
+    op.drop_index(op.f('ix_customermaster_date_of_birth'),
+                  table_name='customermaster')
+    op.drop_index('ix_customermaster_mobile_number',
+                  table_name='customermaster')
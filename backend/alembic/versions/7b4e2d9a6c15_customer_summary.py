@@ -0,0 +1,57 @@
+"""Customer summary.
+
+Revision ID: 7b4e2d9a6c15
+Revises: 5f2a9c7e1b36
+Create Date: 2026-10-17 15:12:40.318266
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b4e2d9a6c15'
+down_revision: Union[str, None] = '5f2a9c7e1b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SORT_COLUMNS = ("bmi", "weight", "latest_measured_on", "active_conditions")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('customersummary',
+                    sa.Column('customer_id', sa.Uuid(), nullable=False),
+                    sa.Column('latest_measurement_id', sa.Uuid(), nullable=True),
+                    sa.Column('latest_measured_on', sa.Date(), nullable=True),
+                    sa.Column('height', sa.Float(), nullable=True),
+                    sa.Column('weight', sa.Float(), nullable=True),
+                    sa.Column('bmi', sa.Float(), nullable=True),
+                    sa.Column('body_fat_percentage', sa.Float(), nullable=True),
+                    sa.Column('active_conditions', sa.Integer(), nullable=False),
+                    sa.Column('next_condition_end', sa.Date(), nullable=True),
+                    sa.Column('updated_at', sa.DateTime(), nullable=False),
+                    sa.ForeignKeyConstraint(['customer_id'], ['customermaster.id'],
+                                            ondelete='CASCADE'),
+                    sa.PrimaryKeyConstraint('customer_id')
+                    )
+    op.create_index(op.f('ix_customersummary_next_condition_end'),
+                    'customersummary', ['next_condition_end'], unique=False)
+    for column in SORT_COLUMNS:
+        op.create_index(f'ix_customersummary_{column}_customer_id',
+                        'customersummary', [column, 'customer_id'],
+                        unique=False)
+    # Existing data is backfilled with POST /customer-summaries/rebuild.
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in SORT_COLUMNS:
+        op.drop_index(f'ix_customersummary_{column}_customer_id',
+                      table_name='customersummary')
+    op.drop_index(op.f('ix_customersummary_next_condition_end'),
+                  table_name='customersummary')
+    op.drop_table('customersummary')
@@ -0,0 +1,35 @@
+"""Condition date indexes.
+
+Revision ID: 9e3f6a1c8b27
+Revises: 7b4e2d9a6c15
+Create Date: 2026-10-17 16:02:51.774019
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e3f6a1c8b27'
+down_revision: Union[str, None] = '7b4e2d9a6c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("injurymaster", "diseasemaster")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.create_index(op.f(f'ix_{table}_from_date'), table,
+                        ['from_date'], unique=False)
+        op.create_index(op.f(f'ix_{table}_to_date'), table,
+                        ['to_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_index(op.f(f'ix_{table}_to_date'), table_name=table)
+        op.drop_index(op.f(f'ix_{table}_from_date'), table_name=table)
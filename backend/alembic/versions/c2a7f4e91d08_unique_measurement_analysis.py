@@ -0,0 +1,36 @@
+"""Unique measurement analysis.
+
+Revision ID: c2a7f4e91d08
+Revises: 9e3f6a1c8b27
+Create Date: 2026-10-17 17:20:09.416532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2a7f4e91d08'
+down_revision: Union[str, None] = '9e3f6a1c8b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # One analysis per measurement, the background jobs rely on it.
+    op.drop_index(op.f('ix_bodymeasurementaianalysismaster_bodymeasurement_id'),
+                  table_name='bodymeasurementaianalysismaster')
+    op.create_index(op.f('ix_bodymeasurementaianalysismaster_bodymeasurement_id'),
+                    'bodymeasurementaianalysismaster', ['bodymeasurement_id'],
+                    unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_bodymeasurementaianalysismaster_bodymeasurement_id'),
+                  table_name='bodymeasurementaianalysismaster')
+    op.create_index(op.f('ix_bodymeasurementaianalysismaster_bodymeasurement_id'),
+                    'bodymeasurementaianalysismaster', ['bodymeasurement_id'],
+                    unique=False)
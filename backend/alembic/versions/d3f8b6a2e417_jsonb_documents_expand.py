@@ -0,0 +1,50 @@
+"""JSONB documents, expand.
+
+Adds a JSONB shadow next to every JSON document column, kept in sync by a
+trigger, see ``scripts/jsonb_migration.py``. PostgreSQL only, other
+databases keep their JSON columns.
+
+Revision ID: d3f8b6a2e417
+Revises: c2a7f4e91d08
+Create Date: 2026-10-17 18:21:07.402113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from scripts.jsonb_migration import JSONB_COLUMNS, shadow, sync_trigger
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3f8b6a2e417'
+down_revision: Union[str, None] = 'c2a7f4e91d08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for table, columns in JSONB_COLUMNS.items():
+        for column in columns:
+            op.add_column(table, sa.Column(shadow(column), postgresql.JSONB(),
+                                           nullable=True))
+        for statement in sync_trigger(table, columns):
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for table, columns in JSONB_COLUMNS.items():
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_jsonb_sync ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_jsonb_sync()")
+        for column in columns:
+            op.drop_column(table, shadow(column))
@@ -0,0 +1,80 @@
+"""JSONB documents, contract.
+
+Backfills the rows left, swaps the JSONB shadows in for the JSON columns
+and builds their GIN indexes without blocking writes.
+
+Revision ID: e6a1c9d4b830
+Revises: d3f8b6a2e417
+Create Date: 2026-10-17 18:24:55.918230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from scripts.jsonb_migration import (JSONB_COLUMNS, assignments, backfill,
+                                     pending, shadow, sync_trigger)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a1c9d4b830'
+down_revision: Union[str, None] = 'd3f8b6a2e417'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    # Batches commit one by one, nothing is left for the swap to convert
+    # since the triggers cover every write made meanwhile. Offline SQL
+    # scripts can't loop, they convert what's left in one statement.
+    with op.get_context().autocommit_block():
+        for table, columns in JSONB_COLUMNS.items():
+            if op.get_context().as_sql:
+                op.execute(f"UPDATE {table} SET {assignments(table, columns)} "
+                           f"WHERE {pending(columns)}")
+            else:
+                backfill(op.get_bind(), table, columns)
+
+    # Dropping and renaming columns only touches the catalog, the locks
+    # are short. Give up rather than queue behind a long transaction.
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    for table, columns in JSONB_COLUMNS.items():
+        op.execute(f"DROP TRIGGER {table}_jsonb_sync ON {table}")
+        op.execute(f"DROP FUNCTION {table}_jsonb_sync()")
+        for column in columns:
+            op.drop_column(table, column)
+            op.alter_column(table, shadow(column), new_column_name=column)
+
+    with op.get_context().autocommit_block():
+        for table, columns in JSONB_COLUMNS.items():
+            for column in columns:
+                op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+                           f"ix_{table}_{column} ON {table} USING gin ({column})")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    with op.get_context().autocommit_block():
+        for table, columns in JSONB_COLUMNS.items():
+            for column in columns:
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_{column}")
+
+    # Back to JSON in place, this rewrites the tables. The empty shadows
+    # restore the expand revision's state.
+    for table, columns in JSONB_COLUMNS.items():
+        for column in columns:
+            op.alter_column(table, column, type_=sa.JSON(),
+                            postgresql_using=f"{column}::json")
+            op.add_column(table, sa.Column(shadow(column), postgresql.JSONB(),
+                                           nullable=True))
+        for statement in sync_trigger(table, columns):
+            op.execute(statement)
@@ -0,0 +1,50 @@
+"""Customer search indexes.
+
+Trigram and full text GIN indexes behind GET /customers/search.
+PostgreSQL only, other databases search an in-process index.
+
+Revision ID: f7c2d5b8a391
+Revises: e6a1c9d4b830
+Create Date: 2026-10-17 19:08:33.150274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7c2d5b8a391'
+down_revision: Union[str, None] = 'e6a1c9d4b830'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "ix_customermaster_name_trgm": "lower(name) gin_trgm_ops",
+    "ix_customermaster_email_trgm": "lower(email) gin_trgm_ops",
+    "ix_customermaster_mobile_number_trgm": "mobile_number gin_trgm_ops",
+    "ix_customermaster_name_tsv": "to_tsvector('simple'::regconfig, name)",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Built without blocking writes to the customers.
+    with op.get_context().autocommit_block():
+        for name, expression in INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                       f"ON customermaster USING gin ({expression})")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
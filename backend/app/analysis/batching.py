@@ -0,0 +1,141 @@
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Any, Dict, List, Tuple
+
+from app.analysis.models import AnalysisModel
+from app.cache import CacheBackend
+
+logger = logging.getLogger(__name__)
+
+
+def request_key(request: Dict[str, Any], model: str) -> str:
+    """
+    Content hash of an analysis request.
+
+    Covers the measurement values, the customer's conditions, the prompt
+    version and the model, so identical inputs share one analysis while
+    switching models doesn't serve the previous model's results.
+    """
+    canonical = json.dumps({"model": model, "request": request},
+                           sort_keys=True, default=str, separators=(",", ":"))
+    return "analysis:" + hashlib.blake2b(canonical.encode(),
+                                         digest_size=16).hexdigest()
+
+
+class BatchingAnalysisModel(AnalysisModel):
+    """
+    Coalesces concurrent analyses into batched model calls, with a result
+    cache in front.
+
+    The first request opens a batch, which is sent when ``max_batch``
+    requests have joined it or ``window`` seconds have passed. Results are
+    cached by content hash, and identical requests arriving while one is
+    in flight wait for it, so an input is never sent to the model twice.
+
+    Attributes:
+        model (AnalysisModel): The backend the batches are sent to.
+        cache (CacheBackend): Result cache, keyed by ``request_key``.
+        window (float): Seconds a batch stays open.
+        max_batch (int): Requests per batch.
+    """
+
+    def __init__(self, model: AnalysisModel, cache: CacheBackend,
+                 window: float = 0.05, max_batch: int = 16):
+        self.model = model
+        self.cache = cache
+        self.window = window
+        self.max_batch = max_batch
+        self.name = model.name
+
+        self.batch: List[Tuple[str, Dict[str, Any], asyncio.Future]] = []
+        self.timer: asyncio.TimerHandle | None = None
+        self.in_flight: Dict[str, asyncio.Future] = {}
+
+        self.batches = 0
+        self.batched_requests = 0
+        self.largest_batch = 0
+        self.coalesced = 0
+
+    async def analyze(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        key = request_key(request, self.name)
+
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        if key in self.in_flight:
+            self.coalesced += 1
+            return await asyncio.shield(self.in_flight[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self.in_flight[key] = future
+        self.batch.append((key, request, future))
+
+        if len(self.batch) >= self.max_batch:
+            self.flush()
+        elif self.timer is None:
+            self.timer = asyncio.get_running_loop().call_later(
+                self.window, self.flush)
+
+        return await asyncio.shield(future)
+
+    async def analyze_batch(self, requests: List[Dict[str, Any]]
+                            ) -> List[Dict[str, Any]]:
+        return list(await asyncio.gather(
+            *(self.analyze(request) for request in requests)))
+
+    def flush(self) -> None:
+        """
+        Send the open batch to the model.
+        """
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.batch:
+            return
+
+        batch, self.batch = self.batch, []
+        asyncio.get_running_loop().create_task(self.send(batch))
+
+    async def send(self, batch: List[Tuple[str, Dict[str, Any], asyncio.Future]]
+                   ) -> None:
+        self.batches += 1
+        self.batched_requests += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+
+        try:
+            results = await self.model.analyze_batch(
+                [request for _, request, _ in batch])
+        except Exception as error:
+            # Every job of the batch is retried on its own schedule.
+            for key, _, future in batch:
+                self.in_flight.pop(key, None)
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        # Waiters are released before caching, a failing cache must not
+        # leave them, or later requests for the same input, hanging.
+        for (key, _, future), result in zip(batch, results):
+            self.in_flight.pop(key, None)
+            if not future.done():
+                future.set_result(result)
+
+        for (key, _, _), result in zip(batch, results):
+            try:
+                await self.cache.set(key, result)
+            except Exception:
+                logger.warning("Caching analysis %s failed", key, exc_info=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.model.stats(),
+            "batches": self.batches,
+            "average_batch_size": (round(self.batched_requests / self.batches, 2)
+                                   if self.batches else 0.0),
+            "largest_batch": self.largest_batch,
+            "coalesced": self.coalesced,
+            "cache": self.cache.stats(),
+        }
@@ -0,0 +1,157 @@
+import asyncio
+import random
+from typing import Any, Dict, List
+
+import numpy as np
+
+from app.measurements.analytics import ANALYSIS_INPUTS, body_composition
+
+
+class AnalysisModelError(Exception):
+    """
+    A transient model failure, the job is retried.
+    """
+
+
+class AnalysisModel:
+    """
+    Base class of the models analysing a body measurement.
+
+    A request is a JSON document with the ``measurement`` values, the
+    customer's active ``conditions`` and the ``prompt_version``.
+
+    Attributes:
+        name (str): Name recorded with every analysis.
+    """
+
+    name = "base"
+
+    async def analyze(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Analyse a measurement.
+
+        Args:
+            request (Dict[str, Any]): The analysis request.
+
+        Returns:
+            Dict[str, Any]: The analysis, stored as ``ai_analysis``.
+
+        Raises:
+            AnalysisModelError: On a failure worth retrying.
+        """
+        (result,) = await self.analyze_batch([request])
+        return result
+
+    async def analyze_batch(self, requests: List[Dict[str, Any]]
+                            ) -> List[Dict[str, Any]]:
+        """
+        Analyse several measurements in one model call.
+
+        Args:
+            requests (List[Dict[str, Any]]): The analysis requests.
+
+        Returns:
+            List[Dict[str, Any]]: One analysis per request, in order.
+
+        Raises:
+            AnalysisModelError: On a failure worth retrying, it fails the
+                whole batch.
+        """
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        return {"model": self.name}
+
+
+class StubAnalysisModel(AnalysisModel):
+    """
+    Deterministic offline model, for development and tests.
+
+    Derives the body composition figures of the whole batch at once and a
+    few rule based notes. ``latency`` and ``failure_rate`` simulate a
+    remote model, paid once per call whatever the batch size.
+
+    Attributes:
+        latency (float): Seconds every call takes.
+        failure_rate (float): Share of calls raising AnalysisModelError.
+        calls (int): Number of calls made.
+    """
+
+    name = "stub"
+
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.calls = 0
+
+    async def analyze_batch(self, requests: List[Dict[str, Any]]
+                            ) -> List[Dict[str, Any]]:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise AnalysisModelError("Simulated model failure")
+
+        columns = {
+            name: np.array([request["measurement"].get(name)
+                            for request in requests], dtype=np.float64)
+            for name in ANALYSIS_INPUTS
+        }
+        metrics = body_composition(columns)
+
+        results = []
+        for index, request in enumerate(requests):
+            # NaN isn't valid JSON.
+            values = {name: array[index].item()
+                      for name, array in metrics.items()}
+            values = {name: None if value != value else value
+                      for name, value in values.items()}
+            results.append({
+                "model": self.name,
+                "prompt_version": request.get("prompt_version"),
+                "metrics": values,
+                "recommendations": self.recommendations(
+                    values, request.get("conditions", [])),
+            })
+        return results
+
+    def recommendations(self, metrics: Dict[str, Any],
+                        conditions: List[str]) -> List[str]:
+        recommendations = []
+        if metrics["bmi_category"] in ("Over Weight", "Obese"):
+            recommendations.append("Moderate calorie deficit")
+        elif metrics["bmi_category"] == "Under Weight":
+            recommendations.append("Calorie surplus with protein focus")
+        if metrics["waist_to_hip_ratio"] and metrics["waist_to_hip_ratio"] > 0.9:
+            recommendations.append("Reduce refined carbohydrates")
+        if conditions:
+            recommendations.append(
+                f"Adjust for active conditions: {', '.join(conditions)}")
+        return recommendations
+
+    def stats(self) -> Dict[str, Any]:
+        return {"model": self.name, "calls": self.calls}
+
+
+def build_model(name: str) -> AnalysisModel:
+    """
+    Create the analysis model named in the settings.
+
+    Args:
+        name (str): ``stub``, optionally with ``?latency=&failure_rate=``.
+
+    Returns:
+        AnalysisModel: The model.
+
+    Raises:
+        ValueError: If the model is unknown.
+    """
+    kind, _, query = name.partition("?")
+    options = dict(part.split("=", 1) for part in query.split("&") if part)
+
+    if kind == "stub":
+        return StubAnalysisModel(
+            latency=float(options.get("latency", 0)),
+            failure_rate=float(options.get("failure_rate", 0)))
+
+    raise ValueError(f"Unknown analysis model '{name}'")
@@ -0,0 +1,144 @@
+from datetime import date
+from typing import Any, Dict, List, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import select
+
+from app.measurements.analytics import ANALYSIS_INPUTS
+from app.models import (BodyMeasurementAIAnalysisMaster, BodyMeasurementMaster,
+                        DiseaseMaster, InjuryMaster)
+from app.service import BaseService
+
+
+class AnalysisService(BaseService["BodyMeasurementAIAnalysisMaster"]):
+    """
+    Service class for the AI analyses of body measurements.
+
+    Attributes:
+        Inherits all attributes from BaseService.
+    """
+
+    async def get_for_measurement(self, measurement_id: UUID
+                                  ) -> "BodyMeasurementAIAnalysisMaster":
+        """
+        Retrieve the analysis of a measurement.
+
+        Raises:
+            HTTPException: If the measurement has no analysis yet.
+        """
+        statement = select(self.model_class).where(
+            self.model_class.bodymeasurement_id == measurement_id)
+        analysis = (await self.session.exec(statement)).first()
+
+        if not analysis:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No analysis of measurement {measurement_id} yet"
+            )
+        return analysis
+
+    async def exists(self, measurement_id: UUID) -> bool:
+        statement = select(self.model_class.id).where(
+            self.model_class.bodymeasurement_id == measurement_id)
+        return (await self.session.exec(statement)).first() is not None
+
+    async def store(self, measurement_id: UUID, analysis: Dict[str, Any],
+                    notes: str | None = None) -> bool:
+        """
+        Save an analysis, unless the measurement already has one.
+
+        The unique ``bodymeasurement_id`` makes a job that ran twice write
+        a single row.
+
+        Args:
+            measurement_id (UUID): The analysed measurement.
+            analysis (Dict[str, Any]): The model output.
+            notes (str | None, optional): Free text notes.
+
+        Returns:
+            bool: Whether the analysis was written.
+        """
+        table = self.model_class.__table__  # type: ignore
+        instance = self.model_class(bodymeasurement_id=measurement_id,
+                                    ai_analysis=analysis, notes=notes)
+
+        dialect = self.session.bind.dialect.name
+        if dialect == "postgresql":
+            statement = postgresql.insert(table).on_conflict_do_nothing(
+                index_elements=[table.c.bodymeasurement_id])
+        elif dialect == "sqlite":
+            statement = sqlite.insert(table).on_conflict_do_nothing(
+                index_elements=[table.c.bodymeasurement_id])
+        else:
+            statement = insert(table)
+
+        result = await self.session.execute(
+            statement.values(self.column_values(instance)).returning(table.c.id))
+        written = result.scalar_one_or_none() is not None
+        await self.session.commit()
+        return written
+
+    async def build_request(self, measurement_id: UUID, prompt_version: str
+                            ) -> Dict[str, Any] | None:
+        """
+        The model input for a measurement.
+
+        Only what the analysis depends on is included, ids and timestamps
+        are left out so identical inputs hash the same.
+
+        Args:
+            measurement_id (UUID): The measurement to analyse.
+            prompt_version (str): Version of the prompt the model runs.
+
+        Returns:
+            Dict[str, Any] | None: The request, None if the measurement
+                doesn't exist.
+        """
+        statement = select(
+            BodyMeasurementMaster.customer_id,
+            *(getattr(BodyMeasurementMaster, name) for name in ANALYSIS_INPUTS)
+        ).where(BodyMeasurementMaster.id == measurement_id)
+        row = (await self.session.execute(statement)).mappings().first()
+        if row is None:
+            return None
+
+        return {
+            "measurement": {name: row[name] for name in ANALYSIS_INPUTS},
+            "conditions": await self.active_conditions(row["customer_id"]),
+            "prompt_version": prompt_version,
+        }
+
+    async def active_conditions(self, customer_id: UUID) -> List[str]:
+        """
+        Names of the customer's active injuries and diseases, sorted.
+        """
+        today = date.today()
+        names = []
+        for model in (InjuryMaster, DiseaseMaster):
+            statement = select(model.name).where(
+                model.customer_id == customer_id,
+                model.is_active_expression(today))
+            names.extend((await self.session.exec(statement)).all())
+        return sorted(set(names))
+
+    async def unanalysed_ids(self, limit: int = 1000) -> Sequence[UUID]:
+        """
+        Measurements without an analysis, oldest first.
+
+        Picks up the jobs lost by a restart or a full queue.
+
+        Args:
+            limit (int, optional): Maximum number of ids. Defaults to 1000.
+
+        Returns:
+            Sequence[UUID]: The measurement ids.
+        """
+        statement = select(BodyMeasurementMaster.id).outerjoin(
+            self.model_class,
+            self.model_class.bodymeasurement_id == BodyMeasurementMaster.id
+        ).where(self.model_class.id.is_(None)).order_by(
+            BodyMeasurementMaster.created_at).limit(limit)
+        return (await self.session.exec(statement)).all()
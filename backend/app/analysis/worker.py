@@ -0,0 +1,235 @@
+import asyncio
+import logging
+import random
+from typing import Any, Callable, Dict, List, Set
+from uuid import UUID
+
+from app.analysis.batching import BatchingAnalysisModel
+from app.analysis.models import AnalysisModel, build_model
+from app.analysis.service import AnalysisService
+from app.cache import build_cache
+from app.config import settings
+from app.database import async_session_factory
+from app.models import BodyMeasurementAIAnalysisMaster
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisWorker:
+    """
+    Background pool analysing new body measurements.
+
+    Measurement ids are queued by the measurement service and picked up by
+    ``concurrency`` tasks, so requests never wait on the model. A failing
+    job is retried with exponential backoff and jitter. The database is the
+    source of truth: a job skips measurements that already have an
+    analysis, and a periodic sweep re-queues the ones lost by a restart or
+    a full queue.
+
+    Attributes:
+        model (AnalysisModel): The model producing the analyses.
+        concurrency (int): Jobs running at the same time.
+        max_attempts (int): Tries per job before giving up.
+        backoff_base (float): Delay before the first retry, in seconds.
+        backoff_max (float): Upper bound of the retry delay, in seconds.
+        sweep_interval (float): Seconds between sweeps, 0 disables them.
+        prompt_version (str): Sent with every request, part of its cache key.
+    """
+
+    def __init__(self, model: AnalysisModel, concurrency: int = 4,
+                 queue_size: int = 10_000, max_attempts: int = 5,
+                 backoff_base: float = 0.5, backoff_max: float = 60.0,
+                 sweep_interval: float = 300, prompt_version: str = "v1",
+                 session_factory: Callable = async_session_factory):
+        self.model = model
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.sweep_interval = sweep_interval
+        self.prompt_version = prompt_version
+        self.session_factory = session_factory
+
+        self.queue: asyncio.Queue[UUID] = asyncio.Queue(maxsize=queue_size)
+        # Queued or running, so the same measurement isn't queued twice.
+        self.pending: Set[UUID] = set()
+        # Gave up on until the next restart, the sweep leaves them alone.
+        self.failed: Set[UUID] = set()
+        self.tasks: List[asyncio.Task] = []
+
+        self.completed = 0
+        self.skipped = 0
+        self.retries = 0
+        self.failures = 0
+        self.dropped = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self.tasks)
+
+    def enqueue(self, measurement_id: UUID) -> bool:
+        """
+        Queue a measurement for analysis, without waiting.
+
+        Args:
+            measurement_id (UUID): The measurement to analyse.
+
+        Returns:
+            bool: False if it was already queued, or the queue is full. A
+                dropped job is picked up again by the next sweep.
+        """
+        if measurement_id in self.pending:
+            return False
+        try:
+            self.queue.put_nowait(measurement_id)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+
+        self.pending.add(measurement_id)
+        self.failed.discard(measurement_id)
+        return True
+
+    async def start(self) -> None:
+        """
+        Start the worker tasks and the sweep.
+        """
+        if self.running:
+            return
+        self.tasks = [asyncio.create_task(self.work())
+                      for _ in range(self.concurrency)]
+        if self.sweep_interval:
+            self.tasks.append(asyncio.create_task(self.sweep_forever()))
+
+    async def stop(self) -> None:
+        """
+        Cancel the worker tasks, queued jobs are left to the next sweep.
+        """
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    async def join(self) -> None:
+        """
+        Wait until every queued job is done.
+        """
+        await self.queue.join()
+
+    async def work(self) -> None:
+        while True:
+            measurement_id = await self.queue.get()
+            try:
+                await self.process(measurement_id)
+            except Exception:
+                logger.exception("Analysis of measurement %s failed",
+                                 measurement_id)
+            finally:
+                self.pending.discard(measurement_id)
+                self.queue.task_done()
+
+    async def process(self, measurement_id: UUID) -> None:
+        """
+        Analyse one measurement, retrying failures with backoff.
+
+        Args:
+            measurement_id (UUID): The measurement to analyse.
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                await self.run_once(measurement_id)
+                return
+            except Exception as error:
+                if attempt == self.max_attempts:
+                    self.failures += 1
+                    self.failed.add(measurement_id)
+                    logger.warning("Giving up on measurement %s after %d "
+                                   "attempts: %s", measurement_id, attempt,
+                                   error)
+                    return
+
+                self.retries += 1
+                delay = min(self.backoff_max,
+                            self.backoff_base * 2 ** (attempt - 1))
+                # Full jitter spreads out retries of jobs failing together.
+                await asyncio.sleep(random.uniform(0, delay))
+
+    async def run_once(self, measurement_id: UUID) -> None:
+        async with self.session_factory() as session:
+            service = AnalysisService(BodyMeasurementAIAnalysisMaster, session)
+
+            if await service.exists(measurement_id):
+                self.skipped += 1
+                return
+
+            request = await service.build_request(measurement_id,
+                                                  self.prompt_version)
+            if request is None:
+                # Deleted before its turn came.
+                self.skipped += 1
+                return
+
+        # The connection goes back to the pool while the model runs.
+        analysis = await self.model.analyze(request)
+
+        async with self.session_factory() as session:
+            service = AnalysisService(BodyMeasurementAIAnalysisMaster, session)
+            if await service.store(measurement_id, analysis):
+                self.completed += 1
+            else:
+                self.skipped += 1
+
+    async def sweep(self) -> int:
+        """
+        Queue the measurements that have no analysis.
+
+        Returns:
+            int: Number of measurements queued.
+        """
+        async with self.session_factory() as session:
+            service = AnalysisService(BodyMeasurementAIAnalysisMaster, session)
+            ids = await service.unanalysed_ids(limit=self.queue.maxsize)
+
+        return sum(self.enqueue(id) for id in ids if id not in self.failed)
+
+    async def sweep_forever(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except Exception:
+                logger.exception("Analysis sweep failed")
+            await asyncio.sleep(self.sweep_interval)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.model.stats(),
+            "running": self.running,
+            "queued": self.queue.qsize(),
+            "completed": self.completed,
+            "skipped": self.skipped,
+            "retries": self.retries,
+            "failures": self.failures,
+            "dropped": self.dropped,
+        }
+
+
+analysis_worker = AnalysisWorker(
+    BatchingAnalysisModel(
+        build_model(settings.ANALYSIS_MODEL),
+        cache=build_cache(settings.CACHE_URL, settings.ANALYSIS_CACHE_TTL,
+                          settings.ANALYSIS_CACHE_MAX_ENTRIES),
+        window=settings.ANALYSIS_BATCH_WINDOW,
+        max_batch=settings.ANALYSIS_BATCH_SIZE,
+    ),
+    concurrency=settings.ANALYSIS_CONCURRENCY,
+    queue_size=settings.ANALYSIS_QUEUE_SIZE,
+    max_attempts=settings.ANALYSIS_MAX_ATTEMPTS,
+    backoff_base=settings.ANALYSIS_BACKOFF_BASE,
+    backoff_max=settings.ANALYSIS_BACKOFF_MAX,
+    sweep_interval=settings.ANALYSIS_SWEEP_INTERVAL,
+    prompt_version=settings.ANALYSIS_PROMPT_VERSION,
+)
+
+
+def get_analysis_worker() -> AnalysisWorker | None:
+    return analysis_worker if settings.ANALYSIS_ENABLED else None
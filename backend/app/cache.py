@@ -0,0 +1,167 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+from app.config import settings
+
+
+class CacheBackend:
+    """
+    Base class for the key/value caches sitting in front of the database.
+
+    Values are JSON compatible documents. Subclasses implement the storage,
+    this class keeps the hit and miss counters.
+
+    Attributes:
+        ttl (int): Seconds an entry stays valid.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that had to go to the database.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Any | None:
+        """
+        Fetch a value and count the hit or miss.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Any | None: The cached value, None if missing or expired.
+        """
+        value = await self._get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def peek(self, key: str) -> Any | None:
+        """
+        Fetch a bookkeeping value, e.g. an invalidation marker, without
+        counting a hit or miss.
+        """
+        return await self._get(key)
+
+    async def set(self, key: str, value: Any) -> None:
+        raise NotImplementedError
+
+    async def delete(self, *keys: str) -> None:
+        raise NotImplementedError
+
+    async def _get(self, key: str) -> Any | None:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Counters for monitoring.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class MemoryCache(CacheBackend):
+    """
+    In-process LRU cache with a time to live.
+
+    Each worker process has its own copy, so an entry written through
+    another worker can be stale for up to ``ttl`` seconds.
+    """
+
+    def __init__(self, ttl: int, max_entries: int):
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+
+    async def _get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+
+        # Evict the least recently used entries.
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "entries": len(self._entries)}
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache shared by all workers, stored in Redis.
+
+    Any client exposing the ``redis.asyncio`` ``get``/``set``/``delete``
+    coroutines works, e.g. ``fakeredis.aioredis.FakeRedis`` locally.
+    """
+
+    def __init__(self, client: Any, ttl: int, prefix: str = "dietitian:"):
+        super().__init__(ttl)
+        self.client = client
+        self.prefix = prefix
+
+    async def _get(self, key: str) -> Any | None:
+        raw = await self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    async def set(self, key: str, value: Any) -> None:
+        await self.client.set(self.prefix + key, json.dumps(value),
+                              ex=self.ttl)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*(self.prefix + key for key in keys))
+
+
+def build_cache(url: str, ttl: int, max_entries: int) -> CacheBackend:
+    """
+    Create the cache backend named by a URL.
+
+    Args:
+        url (str): ``memory://`` or a ``redis://`` URL.
+        ttl (int): Seconds an entry stays valid.
+        max_entries (int): Size bound of the in-process cache.
+
+    Returns:
+        CacheBackend: The configured backend.
+    """
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        # Only needed when Redis is configured.
+        from redis.asyncio import from_url
+
+        return RedisCache(from_url(url), ttl)
+
+    return MemoryCache(ttl, max_entries)
+
+
+cache = build_cache(settings.CACHE_URL, settings.CACHE_TTL,
+                    settings.CACHE_MAX_ENTRIES)
+
+
+def get_cache() -> CacheBackend:
+    return cache
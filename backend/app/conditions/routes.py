@@ -0,0 +1,126 @@
+from datetime import date
+from typing import Any, Dict, List
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.conditions.schemas import (ConditionCustomer, ConditionKind,
+                                    ConditionResponse)
+from app.conditions.service import CONDITION_MODELS, ConditionService
+from app.database import get_session
+
+
+router = APIRouter(
+    prefix="/conditions",
+    tags=['conditions']
+)
+
+
+# Dependency to get the ConditionService
+async def get_condition_service(kind: ConditionKind,
+                                session: AsyncSession = Depends(get_session)) -> ConditionService:
+    """
+    Dependency that provides a ConditionService for injuries or diseases.
+
+    Args:
+        kind (ConditionKind): ``injuries`` or ``diseases``, from the path.
+        session (AsyncSession): The database session dependency.
+
+    Returns:
+        ConditionService: An instance of the ConditionService.
+    """
+    return ConditionService(CONDITION_MODELS[kind], session)
+
+
+def condition_filters(
+    name: str | None = Query(None, description="Exact condition name."),
+    active: bool | None = Query(
+        None, description="Only active (true) or ended (false) conditions."),
+    min_duration: int | None = Query(
+        None, ge=0, description="Minimum duration in days."),
+    max_duration: int | None = Query(
+        None, ge=0, description="Maximum duration in days."),
+    started_from: date | None = Query(None, description="Earliest from_date."),
+    started_to: date | None = Query(None, description="Latest from_date."),
+) -> Dict[str, Any]:
+    """
+    Query parameters shared by the condition listings.
+
+    Raises:
+        HTTPException: If a range is inverted.
+    """
+    if min_duration is not None and max_duration is not None \
+            and min_duration > max_duration:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="min_duration cannot be greater than max_duration"
+        )
+    if started_from and started_to and started_from > started_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="started_from cannot be after started_to"
+        )
+
+    return {"name": name, "active": active, "min_duration": min_duration,
+            "max_duration": max_duration, "started_from": started_from,
+            "started_to": started_to}
+
+
+@router.get("/{kind}", response_model=List[ConditionResponse])
+async def search_conditions(
+    response: Response,
+    customer_id: UUID | None = Query(None, description="Only this customer's conditions."),
+    limit: int = Query(100, ge=1, le=100, description="Maximum number of conditions to return."),
+    cursor: str | None = Query(
+        None, description="Cursor from the X-Next-Cursor header of the previous page."),
+    filters: Dict[str, Any] = Depends(condition_filters),
+    service: ConditionService = Depends(get_condition_service)
+):
+    """
+    Search injuries or diseases, e.g. active ones or those lasting over 90 days.
+
+    The filters run in the database, ``is_active`` and ``duration_days``
+    are computed there too.
+
+    Args:
+        response (Response): The outgoing response, used to set the cursor header.
+        customer_id (UUID | None): Only this customer's conditions.
+        limit (int): Maximum number of conditions to return.
+        cursor (str | None): Keyset cursor of the page to fetch.
+        filters (Dict[str, Any]): The condition filters.
+        service (ConditionService): The condition service dependency.
+
+    Returns:
+        List[ConditionResponse]: The matching conditions.
+    """
+    result = await service.search(filters, customer_id=customer_id,
+                                  limit=limit, cursor=cursor)
+
+    next_cursor = service.next_cursor(result, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return result
+
+
+@router.get("/{kind}/customers", response_model=List[ConditionCustomer])
+async def get_condition_customers(
+    skip: int = Query(0, ge=0, description="Number of customers to skip."),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of customers to return."),
+    filters: Dict[str, Any] = Depends(condition_filters),
+    service: ConditionService = Depends(get_condition_service)
+):
+    """
+    Customers with matching injuries or diseases, e.g. an active disease.
+
+    Args:
+        skip (int): Number of customers to skip.
+        limit (int): Maximum number of customers to return.
+        filters (Dict[str, Any]): The condition filters.
+        service (ConditionService): The condition service dependency.
+
+    Returns:
+        List[ConditionCustomer]: Customers and their number of matching
+            conditions, most affected first.
+    """
+    return await service.customers(filters, limit=limit, skip=skip)
@@ -0,0 +1,43 @@
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict
+from uuid import UUID
+
+from sqlmodel import SQLModel
+
+from app.schemas import HealthConditionFields
+
+
+class ConditionKind(str, Enum):
+    INJURIES = "injuries"
+    DISEASES = "diseases"
+
+
+class ConditionResponse(HealthConditionFields):
+    """
+    An injury or a disease, with ``is_active`` and ``duration_days``
+    computed by the database. Fields of the other kind stay ``None``.
+    """
+    id: UUID
+    created_at: datetime
+    updated_at: datetime
+    is_active: bool
+    duration_days: int | None = None
+
+    # Injuries
+    injury_type: str | None = None
+    affected_body_part: str | None = None
+
+    # Diseases
+    diagnosis_date: date | None = None
+    medications: Dict[str, Any] | None = None
+
+    impact_on_diet: Dict[str, Any] | None = None
+
+
+class ConditionCustomer(SQLModel):
+    """
+    A customer with matching conditions.
+    """
+    customer_id: UUID
+    conditions: int
@@ -0,0 +1,129 @@
+from datetime import date
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import func
+from sqlmodel import select
+
+from app.conditions.schemas import ConditionKind
+from app.models import DiseaseMaster, InjuryMaster
+from app.service import BaseService
+
+CONDITION_MODELS = {
+    ConditionKind.INJURIES: InjuryMaster,
+    ConditionKind.DISEASES: DiseaseMaster,
+}
+
+
+class ConditionService(BaseService[InjuryMaster | DiseaseMaster]):
+    """
+    Service class for injury and disease queries.
+
+    ``is_active`` and ``duration_days`` are evaluated by the database
+    through the SQL equivalents of the model properties, so filtering on
+    them never loads the rows into Python.
+
+    Attributes:
+        Inherits all attributes from BaseService.
+    """
+
+    def filters(self, today: date, name: str | None = None,
+                active: bool | None = None,
+                min_duration: int | None = None,
+                max_duration: int | None = None,
+                started_from: date | None = None,
+                started_to: date | None = None) -> List[Any]:
+        """
+        Build the ``WHERE`` clauses of a condition query.
+
+        Args:
+            today (date): The day ``is_active`` and open durations are
+                evaluated on.
+            name (str | None, optional): Exact condition name.
+            active (bool | None, optional): Only active, or only ended,
+                conditions.
+            min_duration (int | None, optional): Minimum duration in days.
+            max_duration (int | None, optional): Maximum duration in days.
+            started_from (date | None, optional): Earliest ``from_date``.
+            started_to (date | None, optional): Latest ``from_date``.
+
+        Returns:
+            List[Any]: The clauses.
+        """
+        model = self.model_class
+        filters = []
+
+        if name is not None:
+            filters.append(model.name == name)
+        if active is not None:
+            is_active = model.is_active_expression(today)
+            filters.append(is_active if active else ~is_active)
+        if started_from is not None:
+            filters.append(model.from_date >= started_from)
+        if started_to is not None:
+            filters.append(model.from_date <= started_to)
+
+        if min_duration is not None or max_duration is not None:
+            duration = model.duration_days_expression(today)
+            if min_duration is not None:
+                filters.append(duration >= min_duration)
+            if max_duration is not None:
+                filters.append(duration <= max_duration)
+
+        return filters
+
+    async def search(self, filters: Dict[str, Any], customer_id: Any = None,
+                     limit: int = 100, cursor: str | None = None
+                     ) -> List[Dict[str, Any]]:
+        """
+        List conditions matching some filters.
+
+        Args:
+            filters (Dict[str, Any]): Keyword arguments of ``filters``.
+            customer_id (UUID | None, optional): Only this customer's conditions.
+            limit (int, optional): Maximum number of conditions. Defaults to 100.
+            cursor (str | None, optional): Keyset cursor of the previous page.
+
+        Returns:
+            List[Dict[str, Any]]: Condition columns with ``is_active`` and
+                ``duration_days``.
+        """
+        model = self.model_class
+        table = model.__table__  # type: ignore
+        today = date.today()
+
+        statement = select(
+            *table.c,
+            model.is_active_expression(today).label("is_active"),
+            model.duration_days_expression(today).label("duration_days"),
+        ).where(*self.filters(today, **filters))
+        if customer_id is not None:
+            statement = statement.where(model.customer_id == customer_id)
+
+        statement = self.paginate(statement, limit=limit, cursor=cursor)
+        result = await self.session.execute(statement)
+        return [dict(row) for row in result.mappings().all()]
+
+    async def customers(self, filters: Dict[str, Any], limit: int = 100,
+                        skip: int = 0) -> Sequence[Any]:
+        """
+        Customers having conditions matching some filters.
+
+        Args:
+            filters (Dict[str, Any]): Keyword arguments of ``filters``.
+            limit (int, optional): Maximum number of customers. Defaults to 100.
+            skip (int, optional): Number of customers to skip. Defaults to 0.
+
+        Returns:
+            Sequence[Any]: ``(customer_id, conditions)`` rows, most affected
+                customers first.
+        """
+        model = self.model_class
+        conditions = func.count().label("conditions")
+
+        statement = select(model.customer_id, conditions).where(
+            *self.filters(date.today(), **filters)
+        ).group_by(model.customer_id).order_by(
+            conditions.desc(), model.customer_id).offset(skip).limit(limit)
+
+        result = await self.session.execute(statement)
+        return result.mappings().all()
@@ -6,6 +6,59 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     ALEMBIC_DATABASE_URL: str
 
+    # Connection pool tuning.
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_POOL_RECYCLE: int = 1800  # in seconds
+    DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statements
+    DATABASE_ECHO: bool = False  # log every statement, for debugging only
+
+    # Prometheus metrics at /metrics, and the per-request query budget
+    # above which a request is flagged as a likely N+1.
+    METRICS_ENABLED: bool = True
+    METRICS_QUERY_BUDGET: int = 25
+    METRICS_REPEATED_QUERY_BUDGET: int = 5
+
+    # Opt-in sampling profiler. Requests slower than the threshold, and a
+    # random fraction of the others, keep their profile and SQL statements
+    # in a ring buffer served under /admin/profiles.
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.01
+    PROFILING_SLOW_THRESHOLD: float = 1.0  # in seconds
+    PROFILING_INTERVAL: float = 0.005  # in seconds, between stack samples
+    PROFILING_BUFFER_SIZE: int = 50
+    # Required in the X-Admin-Token header of the admin endpoints, which
+    # are closed while it is unset.
+    ADMIN_TOKEN: str | None = None
+
+    # Read-through cache for customer lookups, "memory://" or a redis URL.
+    CACHE_URL: str = "memory://"
+    CACHE_TTL: int = 300  # in seconds
+    CACHE_MAX_ENTRIES: int = 10_000
+
+    # Background AI analysis of new body measurements.
+    ANALYSIS_ENABLED: bool = True
+    ANALYSIS_MODEL: str = "stub"
+    ANALYSIS_PROMPT_VERSION: str = "v1"
+    ANALYSIS_CONCURRENCY: int = 16
+    ANALYSIS_QUEUE_SIZE: int = 10_000
+    ANALYSIS_MAX_ATTEMPTS: int = 5
+    ANALYSIS_BACKOFF_BASE: float = 0.5  # in seconds, doubled per attempt
+    ANALYSIS_BACKOFF_MAX: float = 60.0  # in seconds
+    ANALYSIS_SWEEP_INTERVAL: int = 300  # in seconds
+    ANALYSIS_BATCH_WINDOW: float = 0.05  # in seconds
+    ANALYSIS_BATCH_SIZE: int = 16
+    ANALYSIS_CACHE_TTL: int = 7 * 24 * 3600  # in seconds
+    ANALYSIS_CACHE_MAX_ENTRIES: int = 50_000
+
+    # NDJSON or CSV food dataset, the built-in foods when unset.
+    FOOD_CATALOG_PATH: str | None = None
+
+    # Worker processes of the batch meal planner, the CPU count when unset.
+    MEAL_PLAN_PROCESSES: int | None = None
+
     model_config = SettingsConfigDict(env_file="../.env")
 
 
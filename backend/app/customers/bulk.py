@@ -0,0 +1,149 @@
+import csv
+import json
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Tuple
+
+from pydantic import ValidationError
+
+from app.customers.schemas import CustomerCreate
+
+# Columns holding JSON documents when a customer is imported from CSV.
+CSV_JSON_COLUMNS = ("preferences", "allergies")
+
+UNTERMINATED_CELL = "Invalid CSV: unterminated quoted cell"
+
+
+async def iter_lines(stream: AsyncIterator[bytes], keepends: bool = False
+                     ) -> AsyncIterator[str]:
+    """
+    Split a byte stream into decoded, non-empty lines.
+
+    Args:
+        stream (AsyncIterator[bytes]): The request body stream.
+        keepends (bool, optional): Yield every line, blank ones included,
+            with its ``\n`` terminator. Defaults to False.
+
+    Yields:
+        str: One line at a time, without the line terminator unless
+            ``keepends`` is set.
+    """
+    pending = b""
+    async for chunk in stream:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if keepends:
+                yield line.decode("utf-8-sig") + "\n"
+            elif line.strip():
+                yield line.decode("utf-8-sig").rstrip("\r")
+
+    if pending.strip():
+        yield pending.decode("utf-8-sig") if keepends else \
+            pending.decode("utf-8-sig").rstrip("\r")
+
+
+async def iter_ndjson(stream: AsyncIterator[bytes]
+                      ) -> AsyncIterator[Dict[str, Any] | str]:
+    """
+    Read one JSON object per line.
+
+    Yields:
+        Dict[str, Any] | str: The parsed record, or an error message when
+            the line isn't a JSON object.
+    """
+    async for line in iter_lines(stream):
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield f"Invalid JSON: {e.msg}"
+            continue
+
+        yield record if isinstance(record, dict) else "Expected a JSON object"
+
+
+async def iter_csv(stream: AsyncIterator[bytes]
+                   ) -> AsyncIterator[Dict[str, Any] | str]:
+    """
+    Read a CSV with a header row, one customer per record.
+
+    Lines are buffered until their quotes balance, so a quoted cell may
+    span several lines, and each complete record is read by the same
+    ``csv.reader``. Empty cells are read as null and the JSON columns are
+    decoded.
+
+    Yields:
+        Dict[str, Any] | str: The parsed record, or an error message when
+            the record can't be read.
+    """
+    pending: Deque[str] = deque()
+    # Only advanced once a record's quotes balance. An IndexError means the
+    # lines ran out inside a quoted cell, e.g. a stray quote in ab"c,"d.
+    reader = csv.reader(iter(pending.popleft, None))
+    header: List[str] | None = None
+    quotes = 0
+
+    async for line in iter_lines(stream, keepends=True):
+        pending.append(line)
+        quotes += line.count('"')
+        if quotes % 2:
+            continue
+        quotes = 0
+        if len(pending) == 1 and not line.strip():
+            pending.clear()
+            continue
+
+        try:
+            cells = next(reader)
+        except (csv.Error, IndexError) as e:
+            yield (f"Invalid CSV: {e}" if isinstance(e, csv.Error)
+                   else UNTERMINATED_CELL)
+            pending.clear()
+            reader = csv.reader(iter(pending.popleft, None))
+            continue
+
+        if header is None:
+            header = [cell.strip() for cell in cells]
+            continue
+
+        if len(cells) != len(header):
+            yield f"Expected {len(header)} columns, got {len(cells)}"
+            continue
+
+        record: Dict[str, Any] = {
+            key: (value if value != "" else None)
+            for key, value in zip(header, cells)
+        }
+        try:
+            for key in CSV_JSON_COLUMNS:
+                if record.get(key) is not None:
+                    record[key] = json.loads(record[key])
+                else:
+                    # Let an empty cell fall back to the field default.
+                    record.pop(key, None)
+        except json.JSONDecodeError as e:
+            yield f"Invalid JSON in {key}: {e.msg}"
+            continue
+
+        yield record
+
+    if pending:
+        yield UNTERMINATED_CELL
+
+
+def validate_record(record: Dict[str, Any] | str
+                    ) -> Tuple[Dict[str, Any] | None, Any]:
+    """
+    Validate a parsed record against ``CustomerCreate``.
+
+    Returns:
+        Tuple[Dict[str, Any] | None, Any]: The customer data and None, or
+            None and the error details.
+    """
+    if isinstance(record, str):
+        return None, record
+
+    try:
+        return CustomerCreate.model_validate(record).model_dump(), None
+    except ValidationError as e:
+        return None, e.errors(include_url=False, include_context=False,
+                              include_input=False)
@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List, Sequence
+from uuid import UUID
+
+# Columns exported for every customer.
+CUSTOMER_COLUMNS = (
+    "id", "name", "date_of_birth", "gender", "email", "alternate_email",
+    "mobile_number", "alternate_mobile_number", "preferences", "allergies",
+    "created_at", "updated_at",
+)
+
+# Columns of the latest body measurement, exported as ``latest_<column>``.
+MEASUREMENT_COLUMNS = (
+    "measured_on", "height", "weight", "body_fat_percentage",
+    "waist_circumference", "hip_circumference", "chest_circumference",
+    "arm_circumference", "thigh_circumference",
+)
+
+
+def _default(value: Any) -> Any:
+    """
+    JSON encoder fallback for the column types of the export.
+    """
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value: Any) -> Any:
+    """
+    Cell value of a column, JSON columns are written as JSON text.
+    """
+    if isinstance(value, Enum):
+        return value.value
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return _default(value)
+
+
+def export_columns(include_latest_measurement: bool) -> List[str]:
+    """
+    Column names of an export, in output order.
+    """
+    columns = list(CUSTOMER_COLUMNS)
+    if include_latest_measurement:
+        columns += [f"latest_{column}" for column in MEASUREMENT_COLUMNS]
+    return columns
+
+
+async def ndjson_chunks(partitions: AsyncIterator[Sequence[Dict[str, Any]]]
+                        ) -> AsyncIterator[str]:
+    """
+    Encode partitions of rows as NDJSON, one chunk per partition.
+    """
+    async for rows in partitions:
+        yield "".join(json.dumps(dict(row), default=_default) + "\n"
+                      for row in rows)
+
+
+async def csv_chunks(partitions: AsyncIterator[Sequence[Dict[str, Any]]],
+                     columns: List[str]) -> AsyncIterator[str]:
+    """
+    Encode partitions of rows as CSV with a header row.
+
+    JSON columns are written as JSON text, so the file can be fed back to
+    ``POST /customers/bulk``.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    async for rows in partitions:
+        for row in rows:
+            writer.writerow([_csv_value(row[column]) for column in columns])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    # Header only, for an empty table.
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -1,15 +1,25 @@
 
 import asyncio
-from typing import List
+from datetime import datetime
+from typing import List, Literal
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.cache import CacheBackend, get_cache
+from app.customers.bulk import iter_csv, iter_ndjson
+from app.customers.export import csv_chunks, export_columns, ndjson_chunks
 from app.customers.service import CustomerService
-from app.database import get_session
+from app.database import async_session_factory, get_session
+from app.etag import check_if_match, compute_etag, not_modified
 from app.models import CustomerMaster
-from app.customers.schemas import CustomerCreate, CustomerPublicResponse, CustomerUpdate
+from app.serialization import RowSerializer, orjson_response
+from app.customers.schemas import (AgeBucketCount, BulkImportResponse,
+                                   CustomerCreate, CustomerListResponse,
+                                   CustomerPublicResponse, CustomerSearchResult,
+                                   CustomerUpdate)
 
 
 router = APIRouter(
@@ -17,39 +27,249 @@ router = APIRouter(
     tags=['customers']
 )
 
+list_serializer = RowSerializer(CustomerListResponse)
+
 
 # Dependency to get the CustomerService
-async def get_customer_service(session: AsyncSession = Depends(get_session)) -> CustomerService:
+async def get_customer_service(session: AsyncSession = Depends(get_session),
+                               cache: CacheBackend = Depends(get_cache)) -> CustomerService:
     """
     Dependency that provides a CustomerService instance.
 
     Args:
         session (AsyncSession): The database session dependency.
+        cache (CacheBackend): The customer profile cache.
 
     Returns:
         CustomerService: An instance of the CustomerService.
     """
-    return CustomerService(CustomerMaster, session)
+    return CustomerService(CustomerMaster, session, cache=cache)
+
+
+async def if_match_precondition(request: Request, customer_id: UUID,
+                                service: CustomerService) -> datetime | None:
+    """
+    Check the ``If-Match`` header of a write against the current customer.
 
+    Args:
+        request (Request): The incoming request.
+        customer_id (UUID): The customer being written.
+        service (CustomerService): The customer service.
+
+    Returns:
+        datetime | None: The ``updated_at`` the write must still find, None
+            when no precondition was sent.
 
-@router.get("/", response_model=List[CustomerPublicResponse])
-async def get_all_customers(skip: int = Query(0, ge=0, description="Number of customers to skip."),
+    Raises:
+        HTTPException: If the customer doesn't exist or has changed.
+    """
+    if "if-match" not in request.headers:
+        return None
+
+    profile = await service.get_profile(customer_id)
+    check_if_match(request, compute_etag(profile))
+    return datetime.fromisoformat(profile["updated_at"])
+
+
+@router.get("/", response_model=List[CustomerListResponse])
+async def get_all_customers(request: Request,
+                            response: Response,
+                            skip: int = Query(0, ge=0, description="Number of customers to skip."),
                             limit: int = Query(
                                 100, ge=1, le=100, description="Maximum number of customers to return."),
+                            cursor: str | None = Query(
+                                None, description="Cursor from the X-Next-Cursor header of the previous page."),
+                            include: str | None = Query(
+                                None, description="Comma separated relationships to embed: measurements, injuries, diseases."),
                             service: CustomerService = Depends(get_customer_service)):
     """
     Fetch all customers with pagination.
 
+    Customers are ordered by creation time. When the page is full the
+    ``X-Next-Cursor`` response header carries the cursor of the next page,
+    which stays cheap however deep the client pages, unlike ``skip``.
+    Pages carry an ETag, an unchanged page is answered with a 304. The
+    projected rows are encoded as they are, see ``RowSerializer``.
+
     Args:
+        request (Request): The incoming request, read for ``If-None-Match``.
+        response (Response): The outgoing response, used to set the cursor header.
         skip (int): Number of customers to skip.
         limit (int): Maximum number of customers to return.
+        cursor (str | None): Keyset cursor of the page to fetch.
+        include (str | None): Relationships to embed in each customer.
         service (CustomerService): The customer service dependency.
 
     Returns:
-        List[CustomerPublic]: List of customers.
+        List[CustomerListResponse]: List of customers.
+
+    Raises:
+        HTTPException: If both skip and cursor are given.
     """
+    if cursor and skip:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="skip cannot be combined with cursor"
+        )
+
+    result = await service.get_all_projected(
+        CustomerListResponse, skip=skip, limit=limit, cursor=cursor,
+        include=service.resolve_includes(include))
+
+    next_cursor = service.next_cursor(result, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+    etag = compute_etag(result, skip, limit, cursor, include)
+    return (not_modified(request, response, etag)
+            or orjson_response(list_serializer.complete(result), response))
+
+
+@router.get("/export")
+async def export_customers(
+    format: Literal["ndjson", "csv"] = Query(
+        "ndjson", description="Output format."),
+    include_latest_measurement: bool = Query(
+        False, description="Add each customer's latest body measurement."),
+):
+    """
+    Stream every customer as NDJSON or CSV.
+
+    Rows are read through a server-side cursor and written as they arrive,
+    so memory use stays flat whatever the size of the table.
 
-    result = await service.get_all(skip=skip, limit=limit)
+    Args:
+        format (str): ``ndjson`` or ``csv``.
+        include_latest_measurement (bool): Add ``latest_*`` measurement columns.
+
+    Returns:
+        StreamingResponse: The export file.
+    """
+    async def content():
+        # The request scoped session is closed before the body is streamed,
+        # so the export runs in a session of its own.
+        async with async_session_factory() as session:
+            service = CustomerService(CustomerMaster, session)
+            partitions = service.stream_export(include_latest_measurement)
+
+            if format == "csv":
+                chunks = csv_chunks(
+                    partitions, export_columns(include_latest_measurement))
+            else:
+                chunks = ndjson_chunks(partitions)
+
+            async for chunk in chunks:
+                yield chunk
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        content(), media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=customers.{format}"}
+    )
+
+
+@router.get("/search", response_model=List[CustomerSearchResult])
+async def search_customers(
+    q: str = Query(..., min_length=1, max_length=100,
+                   description="Part of a name, email or phone number."),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of customers to return."),
+    service: CustomerService = Depends(get_customer_service)
+):
+    """
+    Find customers as the user types, by partial name, email fragment or
+    phone digits. Tolerates typos in names.
+
+    Args:
+        q (str): What the user typed.
+        limit (int): Maximum number of customers to return.
+        service (CustomerService): The customer service dependency.
+
+    Returns:
+        List[CustomerSearchResult]: The matches, best first.
+    """
+    return await service.search(q, limit=limit)
+
+
+@router.get("/demographics", response_model=List[AgeBucketCount])
+async def get_age_demographics(
+    bucket_size: int = Query(10, ge=1, le=50, description="Years per age bucket."),
+    service: CustomerService = Depends(get_customer_service)
+):
+    """
+    Customer counts per age bucket and gender, for demographic dashboards.
+
+    Computed in a single grouped query, no customer is loaded.
+
+    Args:
+        bucket_size (int): Years per age bucket.
+        service (CustomerService): The customer service dependency.
+
+    Returns:
+        List[AgeBucketCount]: The non-empty buckets, youngest first.
+    """
+    return await service.age_demographics(bucket_size=bucket_size)
+
+
+@router.get("/filter", response_model=List[CustomerListResponse])
+async def filter_customers(
+    response: Response,
+    allergic_to: List[str] = Query(
+        [], description="Declared allergens, e.g. peanuts. All must match."),
+    preference: List[str] = Query(
+        [], description="key:value pairs the preferences must contain, e.g. "
+                        "diet:vegetarian, or a bare key that must be set."),
+    medication: List[str] = Query(
+        [], description="Medications of an active disease, e.g. metformin."),
+    skip: int = Query(0, ge=0, description="Number of customers to skip."),
+    limit: int = Query(100, ge=1, le=100, description="Maximum number of customers to return."),
+    cursor: str | None = Query(
+        None, description="Cursor from the X-Next-Cursor header of the previous page."),
+    service: CustomerService = Depends(get_customer_service)
+):
+    """
+    Customers by allergies, preferences and medications, e.g. all
+    customers allergic to peanuts or all on metformin.
+
+    Args:
+        response (Response): The outgoing response, used to set the cursor header.
+        allergic_to (List[str]): Allergens the customers declared.
+        preference (List[str]): Preferences the customers set.
+        medication (List[str]): Medications the customers take.
+        skip (int): Number of customers to skip.
+        limit (int): Maximum number of customers to return.
+        cursor (str | None): Keyset cursor of the page to fetch.
+        service (CustomerService): The customer service dependency.
+
+    Returns:
+        List[CustomerListResponse]: The matching customers.
+
+    Raises:
+        HTTPException: If no filter is given, or both skip and cursor are.
+    """
+    if not (allergic_to or preference or medication):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one of allergic_to, preference or medication is required"
+        )
+    if cursor and skip:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="skip cannot be combined with cursor"
+        )
+
+    pairs = [item.split(":", 1) for item in preference]
+    conditions = service.document_filters(
+        allergic_to=allergic_to,
+        preferences={pair[0]: pair[1] for pair in pairs if len(pair) == 2},
+        preference_keys=[pair[0] for pair in pairs if len(pair) == 1],
+        medications=medication)
+
+    result = await service.find_by_documents(
+        CustomerListResponse, conditions, skip=skip, limit=limit, cursor=cursor)
+
+    next_cursor = service.next_cursor(result, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return result
 
 
@@ -72,28 +292,53 @@ async def create_customer(
     Raises:
         HTTPException: If a customer with the same email or mobile already exists.
     """
-    if customer.mobile_number:
-        existing_customer = await service.get_by_mobile(customer.mobile_number)
-        if existing_customer:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f"Customer with mobile number {customer.mobile_number} already exists."
-            )
-
-    # Check if a customer with the same email already exists
-    if customer.email:
-        existing_customer = await service.get_by_email(customer.email)
-        if existing_customer:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f"Customer with email {customer.email} already exists"
-            )
-
+    # The unique constraints on email and mobile number report conflicts.
     return await service.create(customer.model_dump())
 
 
+@router.post("/bulk", response_model=BulkImportResponse)
+async def bulk_import_customers(
+    request: Request,
+    chunk_size: int = Query(
+        1000, ge=1, le=5000, description="Rows validated and inserted per batch."),
+    service: CustomerService = Depends(get_customer_service)
+):
+    """
+    Import many customers from an NDJSON or CSV body.
+
+    The body is read as a stream, one customer per line. CSV files need a
+    header row naming the customer fields, ``preferences`` and
+    ``allergies`` cells hold JSON.
+
+    Args:
+        request (Request): The incoming request, its body is the file.
+        chunk_size (int): Rows validated and inserted per batch.
+        service (CustomerService): The customer service dependency.
+
+    Returns:
+        BulkImportResponse: How many rows were inserted and why the others weren't.
+
+    Raises:
+        HTTPException: If the content type isn't NDJSON or CSV.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0]
+
+    if content_type == "text/csv":
+        records = iter_csv(request.stream())
+    elif content_type in ("application/x-ndjson", "application/jsonl"):
+        records = iter_ndjson(request.stream())
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Expected a text/csv or application/x-ndjson body"
+        )
+
+    return await service.bulk_import(records, chunk_size=chunk_size)
+
+
 @router.put("/{customer_id}", response_model=CustomerPublicResponse)
 async def update_customer(
+    request: Request,
     customer_id: UUID,
     customer: CustomerUpdate,
     service: CustomerService = Depends(get_customer_service)
@@ -101,51 +346,38 @@ async def update_customer(
     """
     Update a specific customer.
 
+    Only the fields present in the body are written. Sending back the
+    ``updated_at`` that was read makes the update fail with a 409 if the
+    customer changed in the meantime, an ``If-Match`` ETag that no longer
+    matches fails with a 412. When both are sent, both are checked.
+
     Args:
+        request (Request): The incoming request, read for ``If-Match``.
         customer_id (UUID): The ID of the customer to update.
         customer (CustomerUpdate): The updated customer data.
         service (CustomerService): The customer service dependency.
 
     Returns:
-        CustomerPublicResponse: The updated customer.
+        CustomerPublicResponse: The updated customer, with its children.
 
     Raises:
-        HTTPException: If the customer is not found or if updating the email/mobile
+        HTTPException: If the customer is not found, was modified
+                      concurrently, or if updating the email/mobile
                       would conflict with an existing customer.
     """
-    # Check if the customer exists
-    current_customer = await service.get_by_id(customer_id)
-
-    # If updating email, check if it would conflict with another customer
-    if current_customer:
-        if customer.email and customer.email != current_customer.email:
-            existing_customer = await service.get_by_email(customer.email)
-            if existing_customer and existing_customer.id != customer_id:
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail=f"Customer with email {customer.email} already exists"
-                )
-
-        # If updating mobile, check if it would conflict with another customer
-        if customer.mobile_number and customer.mobile_number != current_customer.mobile_number:
-            existing_customer = await service.get_by_mobile(customer.mobile_number)
-            if existing_customer and existing_customer.id != customer_id:
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail=f"Customer with mobile number {customer.mobile_number} already exists"
-                )
-        # Update the customer
-        return await service.update(customer_id,
-                                    customer.model_dump(exclude_unset=True))
-    else:
-        return HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Customer not found!"
-        )
+    data = customer.model_dump(exclude_unset=True)
+    body_updated_at = data.pop("updated_at", None)
+    header_updated_at = await if_match_precondition(request, customer_id, service)
+
+    # The unique constraints on email and mobile number report conflicts.
+    await service.update(customer_id, data,
+                         expected_updated_at=body_updated_at or header_updated_at)
+    return orjson_response(await service.get_profile(customer_id))
 
 
 @router.delete("/{customer_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_customer(
+    request: Request,
     customer_id: UUID,
     service: CustomerService = Depends(get_customer_service)
 ):
@@ -153,25 +385,37 @@ async def delete_customer(
     Delete a specific customer.
 
     Args:
+        request (Request): The incoming request, read for ``If-Match``.
         customer_id (UUID): The ID of the customer to delete.
         service (CustomerService): The customer service dependency.
 
     Raises:
-        HTTPException: If the customer is not found.
+        HTTPException: If the customer is not found, or doesn't match the
+                      ``If-Match`` ETag.
     """
-    await service.delete(customer_id)
+    expected_updated_at = await if_match_precondition(request, customer_id,
+                                                      service)
+    await service.delete(customer_id, expected_updated_at=expected_updated_at)
     return None
 
 
 @router.get("/{customer_id}", response_model=CustomerPublicResponse)
 async def get_customer(
+    request: Request,
+    response: Response,
     customer_id: UUID,
     service: CustomerService = Depends(get_customer_service)
 ):
     """
     Fetch a specific customer by ID.
 
+    The ETag covers the customer and its child rows, a client sending it
+    back in ``If-None-Match`` gets a 304 while nothing changed. Profiles
+    are stored serialized, they're encoded without being validated again.
+
     Args:
+        request (Request): The incoming request, read for ``If-None-Match``.
+        response (Response): The outgoing response, used to set the ETag.
         customer_id (UUID): The ID of the customer to fetch.
         service (CustomerService): The customer service dependency.
 
@@ -181,7 +425,9 @@ async def get_customer(
     Raises:
         HTTPException: If the customer is not found.
     """
-    return await service.get_by_id(customer_id)
+    profile = await service.get_profile(customer_id)
+    return (not_modified(request, response, compute_etag(profile))
+            or orjson_response(profile, response))
 
 
 @router.get("/email/{email}", response_model=CustomerPublicResponse)
@@ -202,13 +448,13 @@ async def get_customer_by_email(
     Raises:
         HTTPException: If the customer is not found.
     """
-    customer = await service.get_by_email(email)
+    customer = await service.get_profile_by_email(email)
     if not customer:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Customer with email {email} not found"
         )
-    return customer
+    return orjson_response(customer)
 
 
 @router.get("/mobile/{mobile_number}", response_model=CustomerPublicResponse)
@@ -229,13 +475,13 @@ async def get_customer_by_mobile(
     Raises:
         HTTPException: If the customer is not found.
     """
-    customer = await service.get_by_mobile(mobile_number)
+    customer = await service.get_profile_by_mobile(mobile_number)
     if not customer:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Customer with mobile number {mobile_number} not found"
         )
-    return customer
+    return orjson_response(customer)
 
 
 @router.get("/age-range/", response_model=List[CustomerPublicResponse])
@@ -245,7 +491,7 @@ async def get_customers_by_age_range(
     service: CustomerService = Depends(get_customer_service)
 ):
     """
-    Fetch customers within a specific age range.
+    Fetch customers within a specific age range, both ends included.
 
     Args:
         min_age (int): The minimum age in the range.
@@ -264,4 +510,5 @@ async def get_customers_by_age_range(
             detail="min_age cannot be greater than max_age"
         )
 
-    return await service.get_customers_by_age_range(min_age, max_age)
+    return orjson_response(
+        await service.get_customers_by_age_range(min_age, max_age))
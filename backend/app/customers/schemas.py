@@ -1,21 +1,131 @@
 
-from typing import List
+from datetime import date, datetime
+from typing import Any, Dict, List
 from uuid import UUID
-from app.schemas import CustomerBase
-from app.models import (
-    BaseModelMixin, BodyMeasurementMaster, DiseaseMaster, InjuryMaster,)
+
+from pydantic import EmailStr, field_validator
+from sqlmodel import SQLModel
+
+from app.enums import Gender
+from app.schemas import (BodyMeasurementBase, CustomerBase, DiseaseBase,
+                         InjuryBase)
+
+
+# Child rows nested in customers, their columns only, so the responses
+# don't depend on the table models and their relationships.
+class BodyMeasurementRead(BodyMeasurementBase):
+    id: UUID
+    created_at: datetime
+    updated_at: datetime
+
+
+class InjuryRead(InjuryBase):
+    id: UUID
+    created_at: datetime
+    updated_at: datetime
+
+
+class DiseaseRead(DiseaseBase):
+    id: UUID
+    created_at: datetime
+    updated_at: datetime
 
 
 class CustomerPublicResponse(CustomerBase):
     id: UUID
-    body_measurements: List["BodyMeasurementMaster"] = []
-    injuries: List["InjuryMaster"] = []
-    diseases: List["DiseaseMaster"] = []
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+    body_measurements: List[BodyMeasurementRead] = []
+    injuries: List[InjuryRead] = []
+    diseases: List[DiseaseRead] = []
+
+
+class CustomerListResponse(SQLModel):
+    """
+    Customer row returned by listings and updates.
+
+    Only these columns are selected from the database, relationships stay
+    ``None`` unless requested through ``?include=``.
+    """
+    id: UUID
+    name: str
+    date_of_birth: date
+    gender: Gender
+    email: str | None = None
+    alternate_email: str | None = None
+    mobile_number: str | None = None
+    alternate_mobile_number: str | None = None
+    preferences: Dict[str, Any] | None = None
+    allergies: Dict[str, Any] | None = None
+    created_at: datetime
+    updated_at: datetime
+
+    body_measurements: List[BodyMeasurementRead] | None = None
+    injuries: List[InjuryRead] | None = None
+    diseases: List[DiseaseRead] | None = None
+
+
+class CustomerSearchResult(SQLModel):
+    """
+    A search hit, only what a typeahead shows.
+    """
+    id: UUID
+    name: str
+    email: str | None = None
+    mobile_number: str | None = None
+    score: float
+
+
+class AgeBucketCount(SQLModel):
+    """
+    Number of customers of a gender in an age bucket.
+    """
+    min_age: int
+    max_age: int | None = None  # None for the open-ended last bucket
+    gender: Gender
+    customers: int
 
 
 class CustomerCreate(CustomerBase):
     pass
 
 
-class CustomerUpdate(BaseModelMixin, CustomerBase):
-    pass
+class CustomerUpdate(SQLModel):
+    """
+    Partial customer update, only the fields that are sent are written.
+
+    ``updated_at`` is the value the client last read. When given, the update
+    only goes through if nobody changed the customer in the meantime.
+    """
+    name: str | None = None
+    date_of_birth: date | None = None
+    gender: Gender | None = None
+    email: EmailStr | None = None
+    alternate_email: str | None = None
+    mobile_number: str | None = None
+    alternate_mobile_number: str | None = None
+    preferences: Dict[str, Any] | None = None
+    allergies: Dict[str, Any] | None = None
+
+    updated_at: datetime | None = None
+
+    @field_validator('mobile_number', 'alternate_mobile_number')
+    def mobile_validator(cls, v: str | None) -> str | None:
+        if type(v) == str:
+            if not v.isdigit() or len(v) != 10:
+                raise ValueError("Mobile number must be exactly 10 digits.")
+        return v
+
+
+class BulkImportError(SQLModel):
+    """
+    A row of a bulk import that wasn't inserted.
+    """
+    row: int
+    detail: Any
+
+
+class BulkImportResponse(SQLModel):
+    received: int = 0
+    inserted: int = 0
+    errors: List[BulkImportError] = []
@@ -0,0 +1,126 @@
+import re
+from typing import Any, Dict, Iterable, List, Set, Tuple
+from uuid import UUID
+
+# Word similarity a name needs to match a query with typos, the default
+# ``pg_trgm.word_similarity_threshold``.
+WORD_SIMILARITY_THRESHOLD = 0.6
+# Score added when the name starts with the query, typeahead favours them.
+PREFIX_BOOST = 0.5
+# Fewer digits than this don't search phone numbers.
+MIN_PHONE_DIGITS = 3
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    The trigrams of each word, padded like ``pg_trgm`` does.
+    """
+    grams = set()
+    for word in re.findall(r"\w+", text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[index:index + 3] for index in range(len(padded) - 2))
+    return grams
+
+
+def word_similarity(query: Set[str], text: Set[str]) -> float:
+    """
+    Share of the query's trigrams found in the text, an approximation of
+    ``pg_trgm``'s ``word_similarity``.
+    """
+    if not query:
+        return 0.0
+    return len(query & text) / len(query)
+
+
+class NgramIndex:
+    """
+    In-process trigram index of the customers' names, emails and phone
+    numbers.
+
+    Stands in for the ``pg_trgm`` and full text indexes on databases that
+    have neither, such as the SQLite used in tests, and ranks the same
+    way: the best of the name's and email's word similarity and a phone
+    digits match, plus a boost for names starting with the query. It is
+    loaded lazily and marked stale by every write, the next search
+    reloads it.
+
+    Attributes:
+        rows (Dict[UUID, Dict[str, Any]]): The indexed customers.
+        postings (Dict[str, Set[UUID]]): Customers by trigram.
+        stale (bool): Whether the index must be reloaded before use.
+    """
+
+    def __init__(self):
+        self.rows: Dict[UUID, Dict[str, Any]] = {}
+        self.grams: Dict[UUID, Tuple[Set[str], Set[str]]] = {}
+        self.postings: Dict[str, Set[UUID]] = {}
+        self.stale = True
+
+    def invalidate(self) -> None:
+        self.stale = True
+
+    def build(self, rows: Iterable[Dict[str, Any]]) -> None:
+        self.rows, self.grams, self.postings = {}, {}, {}
+        for row in rows:
+            name, email = trigrams(row["name"]), trigrams(row["email"] or "")
+            self.rows[row["id"]] = row
+            self.grams[row["id"]] = (name, email)
+            for gram in name | email:
+                self.postings.setdefault(gram, set()).add(row["id"])
+        self.stale = False
+
+    def candidates(self, query: Set[str], digits: str) -> Iterable[UUID]:
+        # Short queries have no full trigram to look up, and phone numbers
+        # aren't indexed by word, both scan.
+        if digits or not any(gram.strip() and len(gram.strip()) == 3
+                             for gram in query):
+            return self.rows
+        ids: Set[UUID] = set()
+        for gram in query:
+            ids |= self.postings.get(gram, set())
+        return ids
+
+    def search(self, text: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Customers matching ``text``, best first.
+
+        Args:
+            text (str): A partial name, email or phone number.
+            limit (int, optional): Maximum number of customers.
+
+        Returns:
+            List[Dict[str, Any]]: The customer rows with their ``score``.
+        """
+        needle = text.strip().lower()
+        query = trigrams(needle)
+        digits = re.sub(r"\D", "", needle)
+        if len(digits) < MIN_PHONE_DIGITS:
+            digits = ""
+
+        results = []
+        for id in self.candidates(query, digits):
+            row = self.rows[id]
+            name, email = row["name"].lower(), (row["email"] or "").lower()
+            name_grams, email_grams = self.grams[id]
+
+            matches = (needle in name or needle in email
+                       or any(word.startswith(needle) for word in name.split())
+                       or word_similarity(query, name_grams)
+                       >= WORD_SIMILARITY_THRESHOLD
+                       or (digits and digits in (row["mobile_number"] or "")))
+            if not matches:
+                continue
+
+            score = max(word_similarity(query, name_grams),
+                        word_similarity(query, email_grams),
+                        1.0 if digits and digits in (row["mobile_number"] or "")
+                        else 0.0)
+            if name.startswith(needle):
+                score += PREFIX_BOOST
+            results.append({**row, "score": round(score, 4)})
+
+        results.sort(key=lambda result: (-result["score"], result["name"]))
+        return results[:limit]
+
+
+ngram_index = NgramIndex()
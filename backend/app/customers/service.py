@@ -1,14 +1,55 @@
-from datetime import date
-from typing import Optional, Sequence
+import re
+import time
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Type
+from uuid import UUID
 
 from fastapi import Depends
+from pydantic import BaseModel
 
+from sqlalchemy import and_, case, exists, func, literal, literal_column, or_
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.customers.bulk import validate_record
+from app.customers.export import CUSTOMER_COLUMNS, MEASUREMENT_COLUMNS
+from app.customers.search import MIN_PHONE_DIGITS, PREFIX_BOOST, ngram_index
+from app.cache import CacheBackend
+from app.customers.schemas import (BulkImportError, BulkImportResponse,
+                                   CustomerPublicResponse)
 from app.service import BaseService
 from app.database import get_session
-from app.models import CustomerMaster
+from app.expressions import json_contains, json_has_key
+from app.foods.catalog import allergen_names
+from app.models import BodyMeasurementMaster, CustomerMaster, DiseaseMaster
+
+SEARCH_COLUMNS = ("id", "name", "email", "mobile_number")
+# Customers this age or older share the last demographics bucket.
+MAX_AGE = 100
+# Text search configuration of the name index, no stemming nor stop words.
+SIMPLE = literal_column("'simple'::regconfig")
+
+
+def years_before(day: date, years: int) -> date:
+    """
+    The same day ``years`` earlier, the date someone born then turns
+    ``years`` old.
+
+    On 29 February, in a year without one, that's the 28th: someone born
+    on 28 February has had their birthday by then, not someone born on
+    1 March, as ``CustomerBase.age`` counts it.
+
+    Args:
+        day (date): The reference day, usually today.
+        years (int): Number of years to go back.
+
+    Returns:
+        date: The date ``years`` before ``day``.
+    """
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
 
 
 class CustomerService(BaseService["CustomerMaster"]):
@@ -19,8 +60,270 @@ class CustomerService(BaseService["CustomerMaster"]):
 
     Attributes:
         Inherits all attributes from BaseService.
+        cache (CacheBackend | None): Read-through cache for customer
+            profiles, shared by the id, email and mobile number lookups.
     """
 
+    includes = {
+        "measurements": "body_measurements",
+        "injuries": "injuries",
+        "diseases": "diseases",
+    }
+
+    unique_conflicts = {
+        "email": "Customer with email {value} already exists",
+        "alternate_email": "Customer with email {value} already exists",
+        "mobile_number": "Customer with mobile number {value} already exists.",
+    }
+
+    def __init__(self, model_class: Type["CustomerMaster"], session: AsyncSession,
+                 cache: CacheBackend | None = None):
+        """
+        Initializing the customer service.
+
+        Args:
+            model_class (Type[CustomerMaster]): The customer model.
+            session (AsyncSession): The SQLAlchemy async session for database operations.
+            cache (CacheBackend | None, optional): Cache for customer profiles.
+        """
+        super().__init__(model_class, session)
+        self.cache = cache
+
+    async def invalidated_since(self, id: UUID, read_at: float) -> bool:
+        """
+        Whether a customer was invalidated after a read of it started.
+        """
+        marker = await self.cache.peek(f"customer:invalidated:{id}")
+        return marker is not None and marker >= read_at
+
+    async def cache_profile(self, customer: "CustomerMaster",
+                            read_at: float) -> Dict[str, Any]:
+        """
+        Serialize a customer with its children and store it in the cache.
+
+        Entries are keyed by id, the email and mobile number keys only map
+        to the id. The customer and its children are dumped as they are,
+        they already have the fields of the response schema and validating
+        them into it costs more than the dump itself.
+
+        A read that raced a write isn't stored: when the customer was
+        invalidated after ``read_at``, before or while the entry is
+        written, the loaded profile may predate the write.
+
+        Args:
+            customer (CustomerMaster): The loaded customer.
+            read_at (float): ``time.time()`` before the customer was loaded.
+
+        Returns:
+            Dict[str, Any]: The ``CustomerPublicResponse`` document.
+        """
+        profile = customer.model_dump(mode="json")
+        for attribute in self.includes.values():
+            profile[attribute] = [child.model_dump(mode="json")
+                                  for child in getattr(customer, attribute)]
+
+        if self.cache is None or await self.invalidated_since(customer.id, read_at):
+            return profile
+
+        await self.cache.set(f"customer:{customer.id}", profile)
+        if customer.email:
+            await self.cache.set(f"customer:email:{customer.email}",
+                                 profile["id"])
+        if customer.mobile_number:
+            await self.cache.set(f"customer:mobile:{customer.mobile_number}",
+                                 profile["id"])
+
+        # An invalidation that landed while the entry was written wins.
+        if await self.invalidated_since(customer.id, read_at):
+            await self.cache.delete(f"customer:{customer.id}")
+
+        return profile
+
+    async def invalidate(self, id: UUID, email: str | None = None,
+                         mobile_number: str | None = None) -> None:
+        """
+        Drop a customer's cached profile, and the in-process search index.
+
+        Stale email and mobile number keys are harmless, lookups check the
+        profile they point to, but the keys given are dropped as well. The
+        invalidation time is recorded so that reads which started before
+        it don't store their profile afterwards.
+
+        Args:
+            id (UUID): The customer whose data changed.
+            email (str | None, optional): Email address whose key to drop.
+            mobile_number (str | None, optional): Mobile number whose key
+                to drop.
+        """
+        ngram_index.invalidate()
+        if self.cache is not None:
+            await self.cache.set(f"customer:invalidated:{id}", time.time())
+            await self.cache.delete(f"customer:{id}")
+            if email:
+                await self.cache.delete(f"customer:email:{email}")
+            if mobile_number:
+                await self.cache.delete(f"customer:mobile:{mobile_number}")
+
+    async def _cached_profile(self, key: str, field: str | None = None,
+                              value: str | None = None
+                              ) -> Dict[str, Any] | None:
+        """
+        Resolve a secondary key to a cached profile, None on a miss.
+        """
+        if self.cache is None:
+            return None
+
+        id = await self.cache.get(key)
+        if id is None:
+            return None
+
+        profile = await self.cache.get(f"customer:{id}")
+        if profile is None or profile.get(field) != value:
+            return None
+        return profile
+
+    async def get_profile(self, id: UUID) -> Dict[str, Any]:
+        """
+        Customer with its children, served from the cache when possible.
+
+        Args:
+            id (UUID): The customer id.
+
+        Returns:
+            Dict[str, Any]: The ``CustomerPublicResponse`` document.
+
+        Raises:
+            HTTPException: If the customer doesn't exist.
+        """
+        if self.cache is not None:
+            profile = await self.cache.get(f"customer:{id}")
+            if profile is not None:
+                return profile
+
+        read_at = time.time()
+        return await self.cache_profile(await self.get_by_id(id), read_at)
+
+    async def get_profile_by_email(self, email: str) -> Dict[str, Any] | None:
+        """
+        Cached counterpart of ``get_by_email``.
+
+        Args:
+            email (str): The email address to search for.
+
+        Returns:
+            Dict[str, Any] | None: The customer document if found, None otherwise.
+        """
+        profile = await self._cached_profile(f"customer:email:{email}",
+                                             "email", email)
+        if profile is not None:
+            return profile
+
+        read_at = time.time()
+        customer = await self.get_by_email(email)
+        return await self.cache_profile(customer, read_at) if customer else None
+
+    async def get_profile_by_mobile(self, mobile_number: str
+                                    ) -> Dict[str, Any] | None:
+        """
+        Cached counterpart of ``get_by_mobile``.
+
+        Args:
+            mobile_number (str): The mobile number to search for.
+
+        Returns:
+            Dict[str, Any] | None: The customer document if found, None otherwise.
+        """
+        profile = await self._cached_profile(
+            f"customer:mobile:{mobile_number}", "mobile_number", mobile_number)
+        if profile is not None:
+            return profile
+
+        read_at = time.time()
+        customer = await self.get_by_mobile(mobile_number)
+        return await self.cache_profile(customer, read_at) if customer else None
+
+    async def update(self, id: UUID, data: Dict[str, Any],
+                     expected_updated_at: datetime | None = None
+                     ) -> Dict[str, Any]:
+        row = await super().update(id, data, expected_updated_at)
+        await self.invalidate(id)
+        return row
+
+    async def delete(self, id: UUID,
+                     expected_updated_at: datetime | None = None) -> bool:
+        deleted = await super().delete(id, expected_updated_at)
+        await self.invalidate(id)
+        return deleted
+
+    async def create(self, data: Dict[str, Any]) -> "CustomerMaster":
+        customer = await super().create(data)
+        await self.invalidate(customer.id, customer.email, customer.mobile_number)
+        return customer
+
+    async def bulk_create(self, rows: List[Dict[str, Any]]) -> List[UUID | None]:
+        ids = await super().bulk_create(rows)
+        ngram_index.invalidate()
+        return ids
+
+    async def search(self, text: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Customers by partial name, email or phone number, best first.
+
+        On PostgreSQL every branch of the match is served by a GIN index:
+        trigrams for substrings and typos in names and emails, and for
+        phone digits, the ``simple`` text search configuration for word
+        prefixes such as ``ann smi``. Hits are ranked by the best
+        ``word_similarity`` of name and email, phone matches count as
+        exact, and names starting with the query are boosted. Other
+        databases use the in-process ``NgramIndex``, ranked the same way.
+
+        Args:
+            text (str): What the user typed.
+            limit (int, optional): Maximum number of customers. Defaults to 10.
+
+        Returns:
+            List[Dict[str, Any]]: ``CustomerSearchResult`` documents.
+        """
+        model = self.model_class
+        columns = [getattr(model, name) for name in SEARCH_COLUMNS]
+
+        if self.session.bind.dialect.name != "postgresql":
+            if ngram_index.stale:
+                result = await self.session.exec(select(*columns))
+                ngram_index.build(dict(row) for row in result.mappings())
+            return ngram_index.search(text, limit)
+
+        needle = text.strip().lower()
+        escaped = re.sub(r"([\\%_])", r"\\\1", needle)
+        digits = re.sub(r"\D", "", needle)
+        name, email = func.lower(model.name), func.lower(model.email)
+
+        conditions = [name.like(f"%{escaped}%", escape="\\"),
+                      email.like(f"%{escaped}%", escape="\\"),
+                      literal(needle).op("<%")(name)]
+        words = re.findall(r"\w+", needle)
+        if words:
+            query = " & ".join(f"{word}:*" for word in words)
+            conditions.append(
+                func.to_tsvector(SIMPLE, model.name).op("@@")(
+                    func.to_tsquery(SIMPLE, query)))
+        phone = literal(0.0)
+        if len(digits) >= MIN_PHONE_DIGITS:
+            matches_phone = model.mobile_number.like(f"%{digits}%")
+            conditions.append(matches_phone)
+            phone = case((matches_phone, 1.0), else_=0.0)
+
+        score = (func.greatest(func.word_similarity(needle, name),
+                               func.word_similarity(needle, func.coalesce(email, "")),
+                               phone)
+                 + case((name.like(f"{escaped}%", escape="\\"), PREFIX_BOOST),
+                        else_=0.0)).label("score")
+
+        statement = (select(*columns, score).where(or_(*conditions))
+                     .order_by(score.desc(), model.name).limit(limit))
+        result = await self.session.exec(statement)
+        return [dict(row) for row in result.mappings()]
+
     async def get_by_email(self, email: str) -> Optional["CustomerMaster"]:
         """
         Retrieve a customer by their email address.
@@ -57,31 +360,258 @@ class CustomerService(BaseService["CustomerMaster"]):
         result = await self.session.exec(statement)
         return result.first()
 
-    async def get_customers_by_age_range(self, min_age: int, max_age: int) -> Sequence["CustomerMaster"]:
+    def document_filters(self, allergic_to: Sequence[str] = (),
+                         preferences: Dict[str, Any] | None = None,
+                         preference_keys: Sequence[str] = (),
+                         medications: Sequence[str] = ()) -> List[Any]:
+        """
+        Conditions on the customers' JSON documents.
+
+        Every condition is a containment or key lookup, which PostgreSQL
+        answers from the GIN indexes of the JSONB columns.
+
+        Args:
+            allergic_to (Sequence[str]): Allergens the customer must have
+                declared, either as ``{"peanuts": true}`` or in an
+                ``{"allergens": [...]}`` list. Aliases such as ``peanut``
+                or ``milk`` are matched too.
+            preferences (Dict[str, Any] | None): Document the preferences
+                must contain, e.g. ``{"diet": "vegetarian"}``.
+            preference_keys (Sequence[str]): Keys the preferences must have.
+            medications (Sequence[str]): Medications, keys of
+                ``medications``, of an active disease of the customer.
+
+        Returns:
+            List[Any]: The conditions, all of which must hold.
+        """
+        model = self.model_class
+        conditions = []
+
+        for allergen in allergic_to:
+            conditions.append(or_(*(
+                condition for name in allergen_names(allergen)
+                for condition in (json_contains(model.allergies, {name: True}),
+                                  json_contains(model.allergies,
+                                                {"allergens": [name]})))))
+
+        if preferences:
+            conditions.append(json_contains(model.preferences, preferences))
+        conditions.extend(json_has_key(model.preferences, key)
+                          for key in preference_keys)
+
+        for medication in medications:
+            conditions.append(exists().where(
+                DiseaseMaster.customer_id == model.id,
+                DiseaseMaster.is_active_expression(),
+                json_has_key(DiseaseMaster.medications, medication)))
+
+        return conditions
+
+    async def find_by_documents(self, response_model: Type[BaseModel],
+                                conditions: List[Any], skip: int = 0,
+                                limit: int = 100, cursor: str | None = None
+                                ) -> List[Dict[str, Any]]:
         """
-        Retrieve customers within a specific age range.
+        Customers matching conditions from ``document_filters``.
+
+        Args:
+            response_model (Type[BaseModel]): The schema the rows will be
+                serialized with, only its columns are loaded.
+            conditions (List[Any]): The conditions.
+            skip (int, optional): Number of customers to skip.
+            limit (int, optional): Maximum number of customers to return.
+            cursor (str | None, optional): Keyset cursor from ``next_cursor``.
+
+        Returns:
+            List[Dict[str, Any]]: One mapping per customer.
+        """
+        statement = self.paginate(
+            select(*self.projected_columns(response_model)).where(*conditions),
+            skip=skip, limit=limit, cursor=cursor)
+
+        result = await self.session.exec(statement)
+        return [dict(row) for row in result.mappings()]
+
+    async def get_customers_by_age_range(self, min_age: int, max_age: int
+                                         ) -> List[Dict[str, Any]]:
+        """
+        Retrieve customers within a specific age range, with their children.
+
+        The ages become a ``date_of_birth`` range, a scan of its index.
+        Customers are loaded as plain rows, and each relationship with one
+        ``IN`` query, like the listings.
 
         Args:
             min_age (int): The minimum age in the range.
-            max_age (int): The maximum age in the range.
+            max_age (int): The maximum age in the range, inclusive.
 
         Returns:
-            List[CustomerMaster]: List of customers matching the age criteria.
+            List[Dict[str, Any]]: ``CustomerPublicResponse`` documents,
+                youngest first.
         """
         today = date.today()
+        model = self.model_class
 
-        # Calculate date range based on age
-        # For max_age, we want people born at least max_age years ago
-        # For min_age, we want people born at most min_age years ago
-        max_date = date(today.year - min_age, today.month, today.day)
-        min_date = date(today.year - max_age, today.month, today.day)
-
-        # Create a select statement filtering by birth date range
-        statement = select(self.model_class).where(
-            self.model_class.date_of_birth <= max_date,  # Born before or on max_date
-            self.model_class.date_of_birth >= min_date   # Born after or on min_date
+        # Aged min_age or more: born on or before the min_age-th birthday.
+        # Aged max_age or less: not yet (max_age + 1) on the day.
+        statement = (
+            select(*self.projected_columns(CustomerPublicResponse))
+            .where(model.date_of_birth <= years_before(today, min_age),
+                   model.date_of_birth > years_before(today, max_age + 1))
+            .order_by(model.date_of_birth.desc(), model.id)
         )
 
-        results = await self.session.exec(statement)
+        result = await self.session.exec(statement)
+        rows = [dict(row) for row in result.mappings()]
+        return await self.load_includes(rows, list(self.includes.values()))
+
+    async def age_demographics(self, bucket_size: int = 10,
+                               max_age: int = MAX_AGE) -> List[Dict[str, Any]]:
+        """
+        Customer counts per age bucket and gender, in one ``GROUP BY``.
+
+        The bucket of each customer is computed from ``date_of_birth``
+        against precomputed boundary dates, so PostgreSQL answers from the
+        ``(date_of_birth, gender)`` index without reading the table.
+
+        Args:
+            bucket_size (int): Years per bucket, e.g. 10 for 0-9, 10-19...
+            max_age (int): Customers this age or older share the last
+                bucket, which starts at the last multiple of ``bucket_size``
+                not above it, e.g. 90 for buckets of 30 years.
+
+        Returns:
+            List[Dict[str, Any]]: ``min_age``, ``max_age`` (None for the
+                last bucket), ``gender`` and ``customers``, by bucket then
+                gender. Empty buckets are left out.
+        """
+        today = date.today()
+        model = self.model_class
+        # Full buckets below the open-ended last one.
+        buckets = max_age // bucket_size
+
+        # The first boundary a customer was born after is their bucket:
+        # bucket n is under (n + 1) * bucket_size, the earlier ones took
+        # everyone younger than n * bucket_size.
+        bucket = case(
+            *((model.date_of_birth > years_before(today, (index + 1) * bucket_size),
+               index) for index in range(buckets)),
+            else_=buckets,
+        ).label("bucket")
+
+        # Grouped by the output column, PostgreSQL wouldn't match a repeated
+        # CASE whose boundaries are separate parameters.
+        statement = (select(bucket, model.gender, func.count().label("customers"))
+                     .group_by(literal_column("bucket"), model.gender)
+                     .order_by(literal_column("bucket"), model.gender))
+        result = await self.session.exec(statement)
+
+        return [{
+            "min_age": index * bucket_size,
+            "max_age": (index + 1) * bucket_size - 1 if index < buckets else None,
+            "gender": gender,
+            "customers": customers,
+        } for index, gender, customers in result.all()]
+
+    async def bulk_import(self, records: AsyncIterator[Dict[str, Any] | str],
+                          chunk_size: int = 1000) -> BulkImportResponse:
+        """
+        Validate and insert customers in chunks.
+
+        Invalid rows and rows clashing with an existing email or mobile
+        number are reported back, the rest of the import carries on.
+
+        Args:
+            records (AsyncIterator[Dict[str, Any] | str]): Parsed rows, or an
+                error message for rows that couldn't be parsed.
+            chunk_size (int, optional): Rows per insert statement. Defaults to 1000.
+
+        Returns:
+            BulkImportResponse: Counts and the per-row errors.
+        """
+        report = BulkImportResponse()
+        chunk: List[Dict[str, Any]] = []
+        chunk_rows: List[int] = []
+
+        async def flush() -> None:
+            ids = await self.bulk_create(chunk)
+            for row, id in zip(chunk_rows, ids):
+                if id is None:
+                    report.errors.append(BulkImportError(
+                        row=row,
+                        detail="Customer with this email or mobile number already exists"
+                    ))
+                else:
+                    report.inserted += 1
+            chunk.clear()
+            chunk_rows.clear()
+
+        async for record in records:
+            report.received += 1
+            data, errors = validate_record(record)
+
+            if errors is not None:
+                report.errors.append(
+                    BulkImportError(row=report.received, detail=errors))
+                continue
+
+            chunk.append(data)
+            chunk_rows.append(report.received)
+            if len(chunk) >= chunk_size:
+                await flush()
+
+        if chunk:
+            await flush()
+
+        report.errors.sort(key=lambda error: error.row)
+        return report
+
+    async def stream_export(self, include_latest_measurement: bool = False,
+                            partition_size: int = 1000
+                            ) -> AsyncIterator[Sequence[Dict[str, Any]]]:
+        """
+        Stream every customer through a server-side cursor.
+
+        Only ``partition_size`` rows are held in memory at a time, whatever
+        the size of the table.
+
+        Args:
+            include_latest_measurement (bool, optional): Join in each
+                customer's most recent body measurement as ``latest_*``
+                columns. Defaults to False.
+            partition_size (int, optional): Rows fetched per round trip.
+                Defaults to 1000.
+
+        Yields:
+            Sequence[Dict[str, Any]]: The next partition of rows.
+        """
+        table = self.model_class.__table__
+        columns = [table.c[column] for column in CUSTOMER_COLUMNS]
+        statement = select(*columns)
+
+        if include_latest_measurement:
+            measurement = BodyMeasurementMaster
+
+            # Rank each customer's measurements, newest first.
+            ranked = select(
+                measurement.customer_id,
+                *[getattr(measurement, column) for column in MEASUREMENT_COLUMNS],
+                func.row_number().over(
+                    partition_by=measurement.customer_id,
+                    order_by=(measurement.measured_on.desc(),
+                              measurement.created_at.desc())
+                ).label("position")
+            ).subquery()
+
+            statement = statement.add_columns(*[
+                ranked.c[column].label(f"latest_{column}")
+                for column in MEASUREMENT_COLUMNS
+            ]).outerjoin(ranked, and_(ranked.c.customer_id == table.c.id,
+                                      ranked.c.position == 1))
+
+        statement = statement.order_by(table.c.created_at, table.c.id)
 
-        return results.all()
+        result = await self.session.stream(
+            statement.execution_options(yield_per=partition_size))
+        async for partition in result.mappings().partitions():
+            yield partition
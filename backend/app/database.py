@@ -1,16 +1,48 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.ext.asyncio import create_async_engine
 
 from app.config import settings
+from app.instrumentation import TimedQueuePool, instrument
 
-engine = create_async_engine(settings.DATABASE_URL,
-                             echo=True,
-                             future=True)
 
+def _engine_options() -> dict:
+    """
+    Build the engine keyword arguments from the application settings.
 
-async_session = AsyncSession(engine,)
+    The asyncpg statement cache is a driver level option, so it is only
+    passed through when the database URL points at PostgreSQL.
+    """
+    options = {
+        "echo": settings.DATABASE_ECHO,
+        "poolclass": TimedQueuePool,
+        "future": True,
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+    }
+
+    if make_url(settings.DATABASE_URL).get_backend_name() == "postgresql":
+        options["connect_args"] = {
+            "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+        }
+
+    return options
+
+
+engine = create_async_engine(settings.DATABASE_URL, **_engine_options())
+if settings.METRICS_ENABLED or settings.PROFILING_ENABLED:
+    instrument(engine.sync_engine)
+
+# Every request gets its own session (and identity map) from this factory.
+# Objects stay usable after commit, the services refresh them explicitly.
+async_session_factory = async_sessionmaker(engine,
+                                           class_=AsyncSession,
+                                           expire_on_commit=False)
 
 
 async def get_session() -> AsyncSession:  # type: ignore
-    async with async_session as session:
+    async with async_session_factory() as session:
         yield session  # type: ignore
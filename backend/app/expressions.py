@@ -0,0 +1,117 @@
+import json
+from typing import Any, Dict, List
+
+from sqlalchemy import JSON, Boolean, Integer, String, cast, literal
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class days_between(FunctionElement):
+    """
+    Whole days from the second date to the first, like ``(end - start).days``.
+
+    PostgreSQL subtracts dates natively, SQLite goes through ``julianday``.
+    """
+    type = Integer()
+    inherit_cache = True
+    name = "days_between"
+
+
+@compiles(days_between)
+def _days_between(element, compiler, **kw):
+    end, start = list(element.clauses)
+    return f"({compiler.process(end, **kw)} - {compiler.process(start, **kw)})"
+
+
+@compiles(days_between, "sqlite")
+def _days_between_sqlite(element, compiler, **kw):
+    end, start = list(element.clauses)
+    return (f"CAST(julianday({compiler.process(end, **kw)}) - "
+            f"julianday({compiler.process(start, **kw)}) AS INTEGER)")
+
+
+# JSON documents are stored as JSONB on PostgreSQL, which GIN indexes and
+# the containment operators work on, and as JSON text elsewhere.
+JSONDocument = JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+
+class json_contains(FunctionElement):
+    """
+    Whether a JSON document column contains ``document``, like ``@>``.
+
+    ``{"allergens": ["peanuts"]}`` matches any document whose ``allergens``
+    list holds ``"peanuts"``. PostgreSQL answers it from the column's GIN
+    index, SQLite compares the document's values one by one through its
+    JSON functions, which covers nested objects and lists of scalars.
+    """
+    type = Boolean()
+    # The SQL depends on the document's shape, not just its values.
+    inherit_cache = False
+    name = "json_contains"
+
+    def __init__(self, column, document: Dict[str, Any]):
+        self.document = document
+        super().__init__(column)
+
+
+class json_has_key(FunctionElement):
+    """
+    Whether a JSON document column has a top-level ``key``, like ``?``.
+    """
+    type = Boolean()
+    inherit_cache = True
+    name = "json_has_key"
+
+    def __init__(self, column, key: str):
+        super().__init__(column, literal(key, String))
+
+
+@compiles(json_contains)
+def _json_contains(element, compiler, **kw):
+    column = list(element.clauses)[0]
+    document = cast(literal(json.dumps(element.document), String),
+                    postgresql.JSONB)
+    return (f"({compiler.process(column, **kw)} @> "
+            f"{compiler.process(document, **kw)})")
+
+
+def _json_path(path: str, key: str) -> str:
+    return f'{path}."{key}"'
+
+
+def _sqlite_conditions(column: str, document: Any, path: str,
+                       compiler, **kw) -> List[str]:
+    if isinstance(document, dict):
+        return [condition for key, value in document.items()
+                for condition in _sqlite_conditions(
+                    column, value, _json_path(path, key), compiler, **kw)]
+
+    bind = compiler.process(literal(path, String), **kw)
+    if isinstance(document, list):
+        return [f"EXISTS (SELECT 1 FROM json_each({column}, {bind}) "
+                f"WHERE value = {compiler.process(literal(item), **kw)})"
+                for item in document]
+    return [f"json_extract({column}, {bind}) = "
+            f"{compiler.process(literal(document), **kw)}"]
+
+
+@compiles(json_contains, "sqlite")
+def _json_contains_sqlite(element, compiler, **kw):
+    column = compiler.process(list(element.clauses)[0], **kw)
+    conditions = _sqlite_conditions(column, element.document, "$",
+                                    compiler, **kw)
+    return f"({' AND '.join(conditions or ['1'])})"
+
+
+@compiles(json_has_key)
+def _json_has_key(element, compiler, **kw):
+    column, key = list(element.clauses)
+    return f"({compiler.process(column, **kw)} ? {compiler.process(key, **kw)})"
+
+
+@compiles(json_has_key, "sqlite")
+def _json_has_key_sqlite(element, compiler, **kw):
+    column, key = list(element.clauses)
+    return (f"(json_type({compiler.process(column, **kw)}, "
+            f"'$.\"' || {compiler.process(key, **kw)} || '\"') IS NOT NULL)")
@@ -0,0 +1,380 @@
+import bisect
+import csv
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.enums import MealType
+from app.foods.data import DEFAULT_FOODS
+from app.foods.schemas import Food
+
+# One bit per allergen, the names are the keys expected in
+# ``CustomerBase.allergies``.
+ALLERGENS = ("gluten", "dairy", "egg", "nuts", "peanuts", "soy", "fish",
+             "shellfish", "sesame", "mustard", "celery", "sulphites",
+             "lupin", "molluscs")
+
+# Other spellings customers and datasets use.
+ALLERGEN_ALIASES = {
+    "wheat": "gluten", "milk": "dairy", "lactose": "dairy", "eggs": "egg",
+    "tree nuts": "nuts", "tree_nuts": "nuts", "treenuts": "nuts",
+    "peanut": "peanuts", "groundnuts": "peanuts", "soya": "soy",
+    "crustaceans": "shellfish", "shrimp": "shellfish", "prawns": "shellfish",
+    "sesame seeds": "sesame", "sulfites": "sulphites",
+}
+
+NUTRIENTS = ("calories", "protein", "carbs", "fat", "fiber")
+# Macros per 100 kcal, derived when the catalog is built.
+DENSITIES = tuple(f"{name}_per_100kcal" for name in NUTRIENTS[1:])
+METRICS = NUTRIENTS + DENSITIES
+
+MEAL_TYPES = tuple(MealType)
+
+
+def normalize_allergen(name: str) -> str:
+    name = name.strip().lower()
+    return ALLERGEN_ALIASES.get(name, name)
+
+
+def allergen_names(name: str) -> List[str]:
+    """
+    A name of an allergen and all the others it goes by.
+    """
+    canonical = normalize_allergen(name)
+    names = [name, canonical] + [alias for alias, target in ALLERGEN_ALIASES.items()
+                                 if target == canonical]
+    return list(dict.fromkeys(names))
+
+
+def trigrams(text: str) -> List[str]:
+    padded = f"  {text.lower()} "
+    return list({padded[index:index + 3] for index in range(len(padded) - 2)})
+
+
+class FoodCatalog:
+    """
+    Read-only food catalog held column by column.
+
+    Nutrients are a float32 matrix, allergens and meal types are bitsets,
+    one integer per food, and tags a boolean matrix as datasets bring
+    their own. Built once, it answers lookups through
+    precomputed indexes:
+
+    - sorted arrays per nutrient and per macro density, so a range such as
+      "protein over 20 g per 100 kcal" is two binary searches;
+    - the sorted names and name words, for prefix lookups;
+    - a trigram inverted index, for fuzzy name lookups.
+
+    Food ids are positions in the catalog.
+
+    Attributes:
+        names (List[str]): Food names.
+        metrics (Dict[str, np.ndarray]): Nutrient and density columns.
+        allergen_bits (np.ndarray): Allergen bitset of every food.
+        tag_matrix (np.ndarray): Foods by tags, True where a food has a tag.
+        meal_bits (np.ndarray): MealType bitset of every food.
+        tags (List[str]): Tag of every column of ``tag_matrix``.
+    """
+
+    def __init__(self, foods: Sequence[Food]):
+        self.names = [food.name for food in foods]
+        size = len(self.names)
+
+        nutrients = np.array([[getattr(food, name) for name in NUTRIENTS]
+                              for food in foods],
+                             dtype=np.float32).reshape(size, len(NUTRIENTS))
+        self.metrics: Dict[str, np.ndarray] = {
+            name: nutrients[:, index] for index, name in enumerate(NUTRIENTS)}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            per_100kcal = 100 / nutrients[:, 0]
+            for name, density in zip(NUTRIENTS[1:], DENSITIES):
+                self.metrics[density] = np.where(
+                    nutrients[:, 0] > 0,
+                    self.metrics[name] * per_100kcal, 0).astype(np.float32)
+
+        self.tags = sorted({tag.lower() for food in foods for tag in food.tags})
+        self.allergen_bits = np.array(
+            [self.allergen_mask(food.allergens) for food in foods],
+            dtype=np.uint32)
+        positions = {tag: index for index, tag in enumerate(self.tags)}
+        self.tag_matrix = np.zeros((size, len(self.tags)), dtype=bool)
+        for id, food in enumerate(foods):
+            for tag in food.tags:
+                self.tag_matrix[id, positions[tag.lower()]] = True
+        self.meal_bits = np.array(
+            [sum(1 << MEAL_TYPES.index(MealType(meal))
+                 for meal in food.meal_types) for food in foods],
+            dtype=np.uint32)
+
+        # Range indexes: food ids ordered by value, and the values in order.
+        self.order = {name: np.argsort(values, kind="stable")
+                      for name, values in self.metrics.items()}
+        self.sorted = {name: values[self.order[name]]
+                       for name, values in self.metrics.items()}
+
+        # Prefix indexes over whole names and over each word.
+        self.name_index: List[Tuple[str, int]] = sorted(
+            (name.lower(), id) for id, name in enumerate(self.names))
+        self.name_keys = [key for key, _ in self.name_index]
+        self.word_index: List[Tuple[str, int]] = sorted(
+            (word, id) for id, name in enumerate(self.names)
+            for word in set(name.lower().split()))
+        self.word_keys = [key for key, _ in self.word_index]
+
+        # Fuzzy index: trigram -> ids of the names containing it.
+        postings: Dict[str, List[int]] = {}
+        counts = np.zeros(size, dtype=np.int32)
+        for id, name in enumerate(self.names):
+            grams = trigrams(name)
+            counts[id] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(id)
+        self.trigram_index = {gram: np.array(ids, dtype=np.int32)
+                              for gram, ids in postings.items()}
+        self.trigram_counts = counts
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "FoodCatalog":
+        """
+        Load a catalog from an NDJSON or CSV file.
+
+        One food per line or row, with the Food fields. In CSV files the
+        ``allergens``, ``tags`` and ``meal_types`` cells are ``|``
+        separated lists.
+
+        Args:
+            path (str | Path): ``.ndjson``, ``.jsonl`` or ``.csv`` file.
+
+        Returns:
+            FoodCatalog: The catalog.
+        """
+        path = Path(path)
+        with path.open(newline="", encoding="utf-8") as file:
+            if path.suffix == ".csv":
+                records = [cls.csv_record(row) for row in csv.DictReader(file)]
+            else:
+                records = [json.loads(line) for line in file if line.strip()]
+        return cls([Food(**record) for record in records])
+
+    @staticmethod
+    def csv_record(row: Dict[str, str]) -> Dict[str, Any]:
+        record: Dict[str, Any] = {key: value for key, value in row.items()
+                                  if value not in (None, "")}
+        for key in ("allergens", "tags", "meal_types"):
+            if key in record:
+                record[key] = [item.strip() for item in record[key].split("|")
+                               if item.strip()]
+        return record
+
+    def allergen_mask(self, allergens: Iterable[str]) -> int:
+        """
+        Bitset of some allergen names, unknown names are ignored.
+        """
+        mask = 0
+        for allergen in allergens:
+            name = normalize_allergen(allergen)
+            if name in ALLERGENS:
+                mask |= 1 << ALLERGENS.index(name)
+        return mask
+
+    def named(self, name: str) -> List[int]:
+        """
+        Ids of the foods called ``name``, case insensitive.
+        """
+        name = name.lower()
+        start = bisect.bisect_left(self.name_keys, name)
+        end = bisect.bisect_right(self.name_keys, name)
+        return [id for _, id in self.name_index[start:end]]
+
+    def allowed(self, allergens: Iterable[str] = (), tags: Iterable[str] = (),
+                names: Iterable[str] = ()) -> np.ndarray:
+        """
+        Mask of the foods free of some allergens and tags.
+
+        Args:
+            allergens (Iterable[str]): Allergen names or aliases.
+            tags (Iterable[str]): Food tags, e.g. ``meat``.
+            names (Iterable[str]): Food names, case insensitive.
+
+        Returns:
+            np.ndarray: One bool per food.
+        """
+        allowed = (self.allergen_bits
+                   & np.uint32(self.allergen_mask(allergens))) == 0
+        columns = [self.tags.index(tag) for tag in {tag.lower() for tag in tags}
+                   if tag in self.tags]
+        if columns:
+            allowed &= ~self.tag_matrix[:, columns].any(axis=1)
+        for name in names:
+            allowed[self.named(name)] = False
+        return allowed
+
+    def meal_mask(self, meal: MealType) -> np.ndarray:
+        return (self.meal_bits & np.uint32(1 << MEAL_TYPES.index(meal))) != 0
+
+    def range_ids(self, metric: str, minimum: float | None = None,
+                  maximum: float | None = None) -> np.ndarray:
+        """
+        Ids of the foods with ``minimum <= metric <= maximum``, in
+        increasing order of the metric.
+        """
+        values = self.sorted[metric]
+        start = 0 if minimum is None else np.searchsorted(values, minimum, "left")
+        end = len(values) if maximum is None else np.searchsorted(values, maximum, "right")
+        return self.order[metric][start:end]
+
+    def query(self, ranges: Dict[str, Tuple[float | None, float | None]],
+              allowed: np.ndarray | None = None, meal: MealType | None = None,
+              sort: str | None = None, descending: bool = False,
+              limit: int = 50) -> List[int]:
+        """
+        Foods within nutrient ranges, optionally sorted by a metric.
+
+        The most selective range is read from its sorted index, the other
+        conditions are only checked on the ids it returns.
+
+        Args:
+            ranges (Dict[str, Tuple[float | None, float | None]]): Inclusive
+                bounds keyed by metric, None leaves a side open.
+            allowed (np.ndarray | None, optional): Mask from ``allowed``.
+            meal (MealType | None, optional): Only foods for this meal.
+            sort (str | None, optional): Metric to order by.
+            descending (bool, optional): Largest values first.
+            limit (int, optional): Maximum number of ids. Defaults to 50.
+
+        Returns:
+            List[int]: The food ids.
+        """
+        candidates = None
+        for metric, (minimum, maximum) in ranges.items():
+            ids = self.range_ids(metric, minimum, maximum)
+            if candidates is None or len(ids) < len(candidates):
+                candidates, driver = ids, metric
+        if candidates is None:
+            driver = sort or "calories"
+            candidates = self.order[driver]
+
+        keep = np.ones(len(candidates), dtype=bool)
+        for metric, (minimum, maximum) in ranges.items():
+            if metric == driver:
+                continue
+            values = self.metrics[metric][candidates]
+            if minimum is not None:
+                keep &= values >= minimum
+            if maximum is not None:
+                keep &= values <= maximum
+        if allowed is not None:
+            keep &= allowed[candidates]
+        if meal is not None:
+            keep &= self.meal_mask(meal)[candidates]
+        candidates = candidates[keep]
+
+        if sort is not None and sort != driver:
+            candidates = candidates[np.argsort(self.metrics[sort][candidates],
+                                               kind="stable")]
+        if descending:
+            candidates = candidates[::-1]
+        return candidates[:limit].tolist()
+
+    def prefix(self, prefix: str, limit: int = 20, words: bool = True) -> List[int]:
+        """
+        Foods whose name, or a word of it, starts with ``prefix``.
+
+        Whole-name matches come first, alphabetically.
+        """
+        prefix = prefix.lower()
+        ids: List[int] = []
+        indexes = [(self.name_keys, self.name_index)]
+        if words and " " not in prefix:
+            indexes.append((self.word_keys, self.word_index))
+
+        for keys, index in indexes:
+            start = bisect.bisect_left(keys, prefix)
+            for position in range(start, len(keys)):
+                if not keys[position].startswith(prefix) or len(ids) >= limit:
+                    break
+                if index[position][1] not in ids:
+                    ids.append(index[position][1])
+        return ids
+
+    def fuzzy(self, text: str, limit: int = 20, threshold: float = 0.3
+              ) -> List[Tuple[int, float]]:
+        """
+        Foods whose name is similar to ``text``, tolerating typos.
+
+        Similarity is the Jaccard index of the trigram sets.
+
+        Returns:
+            List[Tuple[int, float]]: ``(id, similarity)``, most similar first.
+        """
+        grams = trigrams(text)
+        postings = [self.trigram_index[gram] for gram in grams
+                    if gram in self.trigram_index]
+        if not postings:
+            return []
+
+        shared = np.bincount(np.concatenate(postings), minlength=len(self))
+        ids = np.flatnonzero(shared)
+        shared = shared[ids]
+        scores = shared / (len(grams) + self.trigram_counts[ids] - shared)
+
+        keep = scores >= threshold
+        ids, scores = ids[keep], scores[keep]
+        if len(ids) > limit:
+            top = np.argpartition(-scores, limit)[:limit]
+            ids, scores = ids[top], scores[top]
+        ranking = np.lexsort((ids, -scores))
+        return [(int(ids[index]), round(float(scores[index]), 3))
+                for index in ranking]
+
+    def search(self, text: str, limit: int = 20, fuzzy: bool = True) -> List[int]:
+        """
+        Prefix matches first, then fuzzy matches to fill up the page.
+        """
+        ids = self.prefix(text, limit=limit)
+        if fuzzy and len(ids) < limit:
+            for id, _ in self.fuzzy(text, limit=limit):
+                if id not in ids:
+                    ids.append(id)
+                if len(ids) >= limit:
+                    break
+        return ids
+
+    def food(self, id: int) -> Dict[str, Any]:
+        """
+        The fields of a food, as a FoodResponse document.
+        """
+        return {
+            "id": id,
+            "name": self.names[id],
+            **{name: round(float(self.metrics[name][id]), 2)
+               for name in NUTRIENTS},
+            "meal_types": [meal for index, meal in enumerate(MEAL_TYPES)
+                           if self.meal_bits[id] & (1 << index)],
+            "allergens": [allergen for index, allergen in enumerate(ALLERGENS)
+                          if self.allergen_bits[id] & (1 << index)],
+            "tags": [self.tags[index]
+                     for index in np.flatnonzero(self.tag_matrix[id])],
+        }
+
+
+def build_catalog(path: str | None) -> FoodCatalog:
+    """
+    The catalog from the configured dataset, the built-in foods otherwise.
+    """
+    if path:
+        return FoodCatalog.load(path)
+    return FoodCatalog(DEFAULT_FOODS)
+
+
+catalog = build_catalog(settings.FOOD_CATALOG_PATH)
+
+
+def get_catalog() -> FoodCatalog:
+    return catalog
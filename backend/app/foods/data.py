@@ -0,0 +1,81 @@
+from typing import List
+
+from app.enums import MealType
+from app.foods.schemas import Food
+
+BREAKFASTS = [MealType.FIRST_MEAL, MealType.BREAKFAST]
+SNACKS = [MealType.MORNING_SNACK, MealType.AFTERNOON_SNACK,
+          MealType.EVENING_SNACK, MealType.BEFORE_SLEEP]
+WORKOUT = [MealType.PRE_WORKOUT, MealType.POST_WORKOUT, MealType.IN_WORKOUT]
+MAINS = [MealType.LUNCH, MealType.DINNER]
+
+
+def food(name: str, calories: float, protein: float, carbs: float, fat: float,
+         meal_types: List[MealType], allergens: List[str] | None = None,
+         tags: List[str] | None = None) -> Food:
+    return Food(name=name, calories=calories, protein=protein, carbs=carbs,
+                fat=fat, meal_types=meal_types, allergens=allergens or [],
+                tags=tags or [])
+
+
+# Per serving. Tags name the animal products and sugars that diets and
+# conditions exclude, allergens the usual declared allergens.
+DEFAULT_FOODS: List[Food] = [
+    # Breakfast
+    food("Oat porridge with milk", 300, 11, 48, 7, BREAKFASTS, ["gluten", "dairy"], ["dairy"]),
+    food("Oat porridge with water", 190, 6, 33, 3.5, BREAKFASTS, ["gluten"], ["vegan"]),
+    food("Scrambled eggs", 200, 13, 2, 15, BREAKFASTS, ["egg"], ["egg"]),
+    food("Boiled eggs", 155, 13, 1, 11, BREAKFASTS + SNACKS, ["egg"], ["egg"]),
+    food("Greek yogurt", 130, 12, 6, 6, BREAKFASTS + SNACKS, ["dairy"], ["dairy"]),
+    food("Whole wheat toast", 140, 6, 24, 2, BREAKFASTS, ["gluten"], ["vegan"]),
+    food("Peanut butter toast", 280, 11, 26, 15, BREAKFASTS, ["gluten", "peanuts"], ["vegan"]),
+    food("Vegetable poha", 250, 5, 45, 6, BREAKFASTS, [], ["vegan"]),
+    food("Idli with sambar", 270, 9, 50, 3, BREAKFASTS, [], ["vegan"]),
+    food("Moong dal chilla", 230, 13, 30, 6, BREAKFASTS, [], ["vegan"]),
+    food("Paneer paratha", 360, 14, 40, 16, BREAKFASTS, ["gluten", "dairy"], ["dairy"]),
+    food("Tofu scramble", 180, 15, 5, 11, BREAKFASTS, ["soy"], ["vegan"]),
+    food("Muesli with milk", 330, 11, 55, 8, BREAKFASTS, ["gluten", "dairy", "nuts"], ["dairy", "sugar"]),
+    # Snacks
+    food("Apple", 95, 0.5, 25, 0.3, SNACKS + WORKOUT, [], ["vegan", "fruit"]),
+    food("Banana", 105, 1.3, 27, 0.4, SNACKS + WORKOUT + BREAKFASTS, [], ["vegan", "fruit"]),
+    food("Orange", 62, 1.2, 15, 0.2, SNACKS, [], ["vegan", "fruit"]),
+    food("Almonds", 165, 6, 6, 14, SNACKS, ["nuts"], ["vegan"]),
+    food("Roasted chana", 120, 7, 20, 2, SNACKS, [], ["vegan"]),
+    food("Hummus with carrots", 150, 5, 15, 8, SNACKS, ["sesame"], ["vegan"]),
+    food("Cottage cheese", 110, 13, 4, 5, SNACKS, ["dairy"], ["dairy"]),
+    food("Buttermilk", 60, 3, 5, 2, SNACKS, ["dairy"], ["dairy"]),
+    food("Sprouts salad", 110, 8, 18, 1, SNACKS, [], ["vegan"]),
+    food("Dark chocolate", 170, 2, 13, 12, SNACKS, ["dairy"], ["sugar"]),
+    food("Whey protein shake", 120, 24, 3, 1.5, WORKOUT, ["dairy"], ["dairy"]),
+    food("Pea protein shake", 120, 22, 4, 2, WORKOUT, [], ["vegan"]),
+    food("Sports drink", 80, 0, 21, 0, [MealType.IN_WORKOUT], [], ["vegan", "sugar"]),
+    food("Dates", 130, 1, 34, 0.2, WORKOUT + SNACKS, [], ["vegan", "fruit"]),
+    # Mains
+    food("Grilled chicken breast", 230, 43, 0, 5, MAINS, [], ["meat"]),
+    food("Chicken curry", 320, 30, 10, 18, MAINS, ["dairy"], ["meat", "dairy"]),
+    food("Baked salmon", 280, 30, 0, 17, MAINS, ["fish"], ["fish"]),
+    food("Fish curry", 260, 26, 8, 14, MAINS, ["fish"], ["fish"]),
+    food("Prawn stir fry", 220, 25, 10, 9, MAINS, ["shellfish", "soy"], ["fish"]),
+    food("Mutton curry", 380, 28, 8, 26, MAINS, [], ["meat"]),
+    food("Egg curry", 250, 14, 10, 17, MAINS, ["egg"], ["egg"]),
+    food("Paneer tikka", 300, 20, 8, 21, MAINS, ["dairy"], ["dairy"]),
+    food("Dal tadka", 200, 12, 28, 5, MAINS, [], ["vegan"]),
+    food("Rajma", 230, 13, 36, 4, MAINS, [], ["vegan"]),
+    food("Chole", 260, 12, 38, 7, MAINS, [], ["vegan"]),
+    food("Tofu stir fry", 210, 17, 10, 12, MAINS, ["soy"], ["vegan"]),
+    food("Mixed vegetable sabzi", 140, 4, 16, 7, MAINS, [], ["vegan"]),
+    food("Palak", 120, 5, 10, 7, MAINS, [], ["vegan"]),
+    food("Steamed brown rice", 215, 5, 45, 1.8, MAINS, [], ["vegan"]),
+    food("Steamed white rice", 205, 4, 45, 0.4, MAINS, [], ["vegan"]),
+    food("Quinoa", 220, 8, 39, 3.5, MAINS, [], ["vegan"]),
+    food("Whole wheat roti", 120, 4, 20, 3, MAINS, ["gluten"], ["vegan"]),
+    food("Millet roti", 110, 3, 22, 1.5, MAINS, [], ["vegan"]),
+    food("Green salad", 50, 2, 9, 0.5, MAINS + SNACKS, [], ["vegan"]),
+    food("Curd", 100, 6, 7, 5, MAINS + SNACKS, ["dairy"], ["dairy"]),
+    food("Lentil soup", 180, 12, 26, 3, MAINS, [], ["vegan"]),
+    food("Whole wheat pasta with vegetables", 350, 13, 62, 6, MAINS, ["gluten"], ["vegan"]),
+    # Before sleep
+    food("Warm turmeric milk", 130, 8, 12, 5, [MealType.BEFORE_SLEEP], ["dairy"], ["dairy"]),
+    food("Casein shake", 120, 24, 4, 1, [MealType.BEFORE_SLEEP], ["dairy"], ["dairy"]),
+    food("Chamomile tea with walnuts", 100, 2, 2, 9, [MealType.BEFORE_SLEEP], ["nuts"], ["vegan"]),
+]
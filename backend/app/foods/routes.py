@@ -0,0 +1,139 @@
+from typing import Dict, List, Tuple
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.database import get_session
+from app.enums import MealType
+from app.foods.catalog import ALLERGEN_ALIASES, ALLERGENS, get_catalog
+from app.foods.schemas import AllergenList, FoodResponse, FoodSort
+from app.foods.service import FoodService
+
+
+router = APIRouter(
+    prefix="/foods",
+    tags=['foods']
+)
+
+
+# Dependency to get the FoodService
+async def get_food_service(session: AsyncSession = Depends(get_session)) -> FoodService:
+    """
+    Dependency that provides a FoodService over the shared catalog.
+
+    Args:
+        session (AsyncSession): The database session dependency.
+
+    Returns:
+        FoodService: An instance of the FoodService.
+    """
+    return FoodService(get_catalog(), session)
+
+
+def nutrient_ranges(
+    min_calories: float | None = Query(None, ge=0),
+    max_calories: float | None = Query(None, ge=0),
+    min_protein: float | None = Query(None, ge=0, description="In g."),
+    max_protein: float | None = Query(None, ge=0, description="In g."),
+    min_carbs: float | None = Query(None, ge=0, description="In g."),
+    max_carbs: float | None = Query(None, ge=0, description="In g."),
+    min_fat: float | None = Query(None, ge=0, description="In g."),
+    max_fat: float | None = Query(None, ge=0, description="In g."),
+    min_fiber: float | None = Query(None, ge=0, description="In g."),
+    max_fiber: float | None = Query(None, ge=0, description="In g."),
+    min_protein_per_100kcal: float | None = Query(
+        None, ge=0, description="Grams of protein per 100 kcal, e.g. 10 for lean foods."),
+    max_carbs_per_100kcal: float | None = Query(
+        None, ge=0, description="Grams of carbs per 100 kcal."),
+    max_fat_per_100kcal: float | None = Query(
+        None, ge=0, description="Grams of fat per 100 kcal."),
+    min_fiber_per_100kcal: float | None = Query(
+        None, ge=0, description="Grams of fiber per 100 kcal."),
+) -> Dict[str, Tuple[float | None, float | None]]:
+    """
+    Nutrient bounds of the food listing, keyed by catalog metric.
+    """
+    bounds = {
+        "calories": (min_calories, max_calories),
+        "protein": (min_protein, max_protein),
+        "carbs": (min_carbs, max_carbs),
+        "fat": (min_fat, max_fat),
+        "fiber": (min_fiber, max_fiber),
+        "protein_per_100kcal": (min_protein_per_100kcal, None),
+        "carbs_per_100kcal": (None, max_carbs_per_100kcal),
+        "fat_per_100kcal": (None, max_fat_per_100kcal),
+        "fiber_per_100kcal": (min_fiber_per_100kcal, None),
+    }
+    return {metric: bound for metric, bound in bounds.items()
+            if bound != (None, None)}
+
+
+@router.get("", response_model=List[FoodResponse])
+async def find_foods(
+    ranges: Dict[str, Tuple[float | None, float | None]] = Depends(nutrient_ranges),
+    exclude_allergens: List[str] = Query(
+        [], description="Allergens to avoid, aliases such as milk are understood."),
+    exclude_tags: List[str] = Query([], description="Tags to avoid, e.g. meat."),
+    customer_id: UUID | None = Query(
+        None, description="Also avoid the allergens this customer declared."),
+    meal_type: MealType | None = Query(None, description="Only foods for this meal."),
+    sort: FoodSort | None = Query(None, description="Metric to order by."),
+    descending: bool = Query(False, description="Largest values first."),
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of foods to return."),
+    service: FoodService = Depends(get_food_service)
+):
+    """
+    Foods within nutrient ranges, e.g. high protein per calorie and nut free.
+
+    Args:
+        ranges (Dict[str, Tuple[float | None, float | None]]): The nutrient bounds.
+        exclude_allergens (List[str]): Allergens to avoid.
+        exclude_tags (List[str]): Tags to avoid.
+        customer_id (UUID | None): Customer whose allergens to avoid.
+        meal_type (MealType | None): Only foods for this meal.
+        sort (FoodSort | None): Metric to order by.
+        descending (bool): Largest values first.
+        limit (int): Maximum number of foods to return.
+        service (FoodService): The food service dependency.
+
+    Returns:
+        List[FoodResponse]: The matching foods.
+    """
+    return await service.find(
+        ranges, exclude_allergens, exclude_tags, customer_id=customer_id,
+        meal_type=meal_type, sort=sort.value if sort else None,
+        descending=descending, limit=limit)
+
+
+@router.get("/search", response_model=List[FoodResponse])
+async def search_foods(
+    q: str = Query(..., min_length=1, description="Name or beginning of a name."),
+    fuzzy: bool = Query(True, description="Also match names with typos."),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of foods to return."),
+    service: FoodService = Depends(get_food_service)
+):
+    """
+    Foods by name, for autocompletion.
+
+    Names or name words starting with ``q`` come first, then, with
+    ``fuzzy``, the names closest to it.
+
+    Args:
+        q (str): The text typed.
+        fuzzy (bool): Also match names with typos.
+        limit (int): Maximum number of foods to return.
+        service (FoodService): The food service dependency.
+
+    Returns:
+        List[FoodResponse]: The matching foods.
+    """
+    return service.search(q, fuzzy=fuzzy, limit=limit)
+
+
+@router.get("/allergens", response_model=AllergenList)
+async def get_allergens():
+    """
+    The allergens the catalog tracks, and the other names understood.
+    """
+    return AllergenList(allergens=list(ALLERGENS), aliases=ALLERGEN_ALIASES)
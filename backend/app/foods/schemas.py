@@ -0,0 +1,42 @@
+from enum import Enum
+from typing import Dict, List
+
+from sqlmodel import SQLModel
+
+from app.enums import MealType
+
+
+class Food(SQLModel):
+    """
+    A catalog item, nutrients are per serving.
+    """
+    name: str
+    calories: float
+    protein: float  # in g
+    carbs: float  # in g
+    fat: float  # in g
+    fiber: float = 0.0  # in g
+    meal_types: List[MealType] = []
+    allergens: List[str] = []
+    tags: List[str] = []
+
+
+class FoodResponse(Food):
+    id: int
+
+
+class FoodSort(str, Enum):
+    CALORIES = "calories"
+    PROTEIN = "protein"
+    CARBS = "carbs"
+    FAT = "fat"
+    FIBER = "fiber"
+    PROTEIN_PER_100KCAL = "protein_per_100kcal"
+    CARBS_PER_100KCAL = "carbs_per_100kcal"
+    FAT_PER_100KCAL = "fat_per_100kcal"
+    FIBER_PER_100KCAL = "fiber_per_100kcal"
+
+
+class AllergenList(SQLModel):
+    allergens: List[str]
+    aliases: Dict[str, str]
@@ -0,0 +1,97 @@
+from typing import Dict, List, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.enums import MealType
+from app.foods.catalog import FoodCatalog
+from app.foods.schemas import FoodResponse
+from app.meal_plans.profiles import allergens_of
+from app.models import CustomerMaster
+
+
+class FoodService:
+    """
+    Service class answering food catalog lookups.
+
+    The catalog lives in memory, the database is only read for the
+    allergies of a customer.
+
+    Attributes:
+        catalog (FoodCatalog): The indexed foods.
+        session (AsyncSession): The SQLAlchemy async session for database operations.
+    """
+
+    def __init__(self, catalog: FoodCatalog, session: AsyncSession):
+        self.catalog = catalog
+        self.session = session
+
+    async def customer_allergens(self, customer_id: UUID) -> List[str]:
+        """
+        The allergens declared by a customer.
+
+        Raises:
+            HTTPException: If the customer doesn't exist.
+        """
+        # The id tells a missing customer from a NULL allergies document.
+        statement = select(CustomerMaster.id, CustomerMaster.allergies).where(
+            CustomerMaster.id == customer_id)
+        row = (await self.session.exec(statement)).first()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Customer not found"
+            )
+        return allergens_of(row.allergies)
+
+    def search(self, text: str, fuzzy: bool = True,
+               limit: int = 20) -> List[FoodResponse]:
+        """
+        Foods by name, prefix matches first then similar names.
+        """
+        return [FoodResponse(**self.catalog.food(id))
+                for id in self.catalog.search(text, limit=limit, fuzzy=fuzzy)]
+
+    async def find(self, ranges: Dict[str, Tuple[float | None, float | None]],
+                   exclude_allergens: List[str], exclude_tags: List[str],
+                   customer_id: UUID | None = None,
+                   meal_type: MealType | None = None, sort: str | None = None,
+                   descending: bool = False, limit: int = 50) -> List[FoodResponse]:
+        """
+        Foods within nutrient ranges and free of some allergens.
+
+        Args:
+            ranges (Dict[str, Tuple[float | None, float | None]]): Inclusive
+                bounds keyed by metric, None leaves a side open.
+            exclude_allergens (List[str]): Allergens to avoid.
+            exclude_tags (List[str]): Tags to avoid, e.g. ``meat``.
+            customer_id (UUID | None, optional): Also avoid this customer's
+                allergens.
+            meal_type (MealType | None, optional): Only foods for this meal.
+            sort (str | None, optional): Metric to order by.
+            descending (bool, optional): Largest values first.
+            limit (int, optional): Maximum number of foods.
+
+        Returns:
+            List[FoodResponse]: The matching foods.
+
+        Raises:
+            HTTPException: If a range is inverted, or the customer doesn't
+                exist.
+        """
+        for metric, (minimum, maximum) in ranges.items():
+            if minimum is not None and maximum is not None and minimum > maximum:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"min_{metric} cannot be greater than max_{metric}"
+                )
+        allergens = list(exclude_allergens)
+        if customer_id is not None:
+            allergens.extend(await self.customer_allergens(customer_id))
+
+        allowed = self.catalog.allowed(allergens, exclude_tags)
+        ids = self.catalog.query(ranges, allowed=allowed, meal=meal_type,
+                                 sort=sort, descending=descending, limit=limit)
+        return [FoodResponse(**self.catalog.food(id)) for id in ids]
@@ -0,0 +1,196 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.config import settings
+from app.metrics import QUERY_COUNT_BUCKETS, registry
+
+logger = logging.getLogger(__name__)
+
+OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+# Statements kept per request when they are logged, see RequestStats.log.
+LOG_LIMIT = 500
+
+REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "Request latency by route.",
+    ["method", "route", "status"])
+REQUEST_QUERIES = registry.histogram(
+    "http_request_db_queries", "Database statements run per request.",
+    ["method", "route"], buckets=QUERY_COUNT_BUCKETS)
+REQUEST_DB_TIME = registry.histogram(
+    "http_request_db_seconds", "Time spent in the database per request.",
+    ["method", "route"])
+QUERY_DURATION = registry.histogram(
+    "db_query_duration_seconds", "Database statement latency by operation.",
+    ["operation"])
+POOL_CHECKOUT = registry.histogram(
+    "db_pool_checkout_seconds", "Time waited for a pooled connection.")
+BUDGET_EXCEEDED = registry.counter(
+    "db_query_budget_exceeded_total",
+    "Requests over the query budget, usually an N+1 pattern.",
+    ["method", "route", "reason"])
+
+
+class RequestStats:
+    """
+    The database activity of one request.
+
+    Attributes:
+        queries (int): Statements run.
+        seconds (float): Time spent running them.
+        statements (Dict[str, int]): Runs of each distinct statement, the
+            same SQL repeated is the signature of an N+1.
+        log (List[Tuple[str, float]] | None): Every statement and its
+            duration in order, only kept once a list is set, e.g. by the
+            profiler.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+        self.statements: Dict[str, int] = {}
+        self.log: List[Tuple[str, float]] | None = None
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.queries += 1
+        self.seconds += seconds
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+        if self.log is not None and len(self.log) < LOG_LIMIT:
+            self.log.append((statement, seconds))
+
+    def most_repeated(self) -> tuple[str, int]:
+        if not self.statements:
+            return "", 0
+        return max(self.statements.items(), key=lambda item: item[1])
+
+
+# Set by the middleware for the duration of each request. The engine's
+# events run in the request's context, SQLAlchemy's greenlets inherit it.
+current_request: ContextVar[RequestStats | None] = ContextVar(
+    "current_request", default=None)
+
+
+def operation(statement: str) -> str:
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return keyword if keyword in OPERATIONS else "OTHER"
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context,
+                          executemany) -> None:
+    if context is not None:
+        context.query_started = time.perf_counter()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context,
+                         executemany) -> None:
+    started = getattr(context, "query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    QUERY_DURATION.observe(elapsed, operation(statement))
+
+    stats = current_request.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    The async engines' default pool, timing how long checkouts wait for
+    a connection, including opening a new one.
+    """
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT.observe(time.perf_counter() - started)
+
+
+def instrument(engine: Engine) -> None:
+    """
+    Time every statement of an engine and expose its pool's state.
+
+    Args:
+        engine (Engine): The synchronous engine, ``AsyncEngine.sync_engine``.
+    """
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+
+    pool = engine.pool
+    if hasattr(pool, "checkedout"):
+        registry.gauge("db_pool_checked_out",
+                       "Connections currently checked out of the pool.",
+                       pool.checkedout)
+        registry.gauge("db_pool_size", "Connections the pool keeps open.",
+                       pool.size)
+
+
+def check_budget(method: str, route: str, stats: RequestStats) -> None:
+    """
+    Flag requests running too many statements, or the same one too often.
+
+    Either is logged with the most repeated statement and counted in
+    ``db_query_budget_exceeded_total``. Typical causes are a query per
+    item of a loop or a ``selectin`` cascade loading unneeded children.
+    """
+    statement, repeats = stats.most_repeated()
+    reasons = []
+    if stats.queries > settings.METRICS_QUERY_BUDGET:
+        reasons.append("total")
+    if repeats > settings.METRICS_REPEATED_QUERY_BUDGET:
+        reasons.append("repeated")
+
+    for reason in reasons:
+        BUDGET_EXCEEDED.inc(method, route, reason)
+    if reasons:
+        logger.warning(
+            "%s %s ran %d queries in %.1f ms, possible N+1. Most repeated "
+            "(%d times): %s", method, route, stats.queries,
+            stats.seconds * 1000, repeats, " ".join(statement.split())[:300])
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording each request's latency and database usage.
+
+    Requests are labelled with their route template, e.g.
+    ``/customers/{customer_id}``, so the number of series stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        status = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_request.reset(token)
+
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            REQUEST_DURATION.observe(elapsed, scope["method"], route, str(status))
+            REQUEST_QUERIES.observe(stats.queries, scope["method"], route)
+            REQUEST_DB_TIME.observe(stats.seconds, scope["method"], route)
+            check_budget(scope["method"], route, stats)
@@ -1,23 +1,71 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
+from app.analysis.worker import analysis_worker, get_analysis_worker
+from app.cache import cache
+from app.config import settings
+from app.conditions.routes import router as condition_router
 from app.customers.routes import router as customer_router
+from app.foods.routes import router as food_router
+from app.instrumentation import MetricsMiddleware
+from app.meal_plans.batch import shutdown_executor
+from app.meal_plans.routes import router as meal_plan_router
+from app.measurements.routes import cohort_router
+from app.measurements.routes import router as measurement_router
+from app.metrics import registry
+from app.profiling.recorder import ProfilingMiddleware, profile_buffer
+from app.profiling.routes import router as profile_router
+from app.summaries.routes import router as summary_router
 
 origins = [
     "http://localhost:3001"
 ]
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The AI analysis runs next to the API, its sweep picks up the
+    # measurements left unanalysed by the previous process.
+    worker = get_analysis_worker()
+    if worker is not None:
+        await worker.start()
+    yield
+    if worker is not None:
+        await worker.stop()
+    shutdown_executor()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=['*'],
-    allow_headers=["*"]
+    allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"]
 )
+# The last middleware added is the outermost, the profiler runs inside
+# the metrics middleware and shares its statistics.
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, buffer=profile_buffer,
+                       interval=settings.PROFILING_INTERVAL,
+                       sample_rate=settings.PROFILING_SAMPLE_RATE,
+                       slow_threshold=settings.PROFILING_SLOW_THRESHOLD)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 app.include_router(customer_router)
+app.include_router(measurement_router)
+app.include_router(cohort_router)
+app.include_router(summary_router)
+app.include_router(condition_router)
+app.include_router(meal_plan_router)
+app.include_router(food_router)
+app.include_router(profile_router)
 
 
 @app.get("/")
@@ -27,6 +75,25 @@ def root():
     }
 
 
+@app.get("/cache/stats")
+async def cache_stats():
+    return cache.stats()
+
+
+@app.get("/analysis/stats")
+async def analysis_stats():
+    return analysis_worker.stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                            detail="Metrics are disabled")
+    return PlainTextResponse(registry.render(),
+                             media_type="text/plain; version=0.0.4")
+
+
 @app.get("/{name}")
 def read_name(name: str):
     return {
@@ -0,0 +1,50 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List
+
+from app.enums import MealType
+from app.foods.catalog import FoodCatalog, get_catalog
+from app.meal_plans.engine import MealPlanner
+from app.meal_plans.schemas import PlanningProfile
+
+# The planner of each worker process, built once by ``init_worker``.
+_planner: MealPlanner | None = None
+_executor: ProcessPoolExecutor | None = None
+
+
+def init_worker(catalog: FoodCatalog) -> None:
+    global _planner
+    _planner = MealPlanner(catalog)
+
+
+def plan_chunk(profiles: List[Dict[str, Any]], meals: List[MealType],
+               days: int) -> List[Dict[str, Any]]:
+    """
+    Plan a chunk of customers inside a worker process.
+
+    Profiles and plans cross the process boundary as plain dicts, which
+    pickle much faster than the models.
+    """
+    return [_planner.plan(PlanningProfile(**profile), meals, days).model_dump()
+            for profile in profiles]
+
+
+def get_executor(processes: int | None = None) -> ProcessPoolExecutor:
+    """
+    The shared process pool, started on first use.
+
+    Args:
+        processes (int | None, optional): Pool size, the CPU count when None.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=processes,
+                                        initializer=init_worker,
+                                        initargs=(get_catalog(),))
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
@@ -0,0 +1,161 @@
+from datetime import date
+from typing import Any, Dict, List
+
+from app.enums import Gender
+from app.meal_plans.schemas import NutritionTargets, PlanningProfile
+
+ACTIVITY_FACTORS = {
+    "sedentary": 1.2,
+    "light": 1.375,
+    "moderate": 1.55,
+    "active": 1.725,
+    "very_active": 1.9,
+}
+
+# Calories added to the maintenance energy for each goal.
+GOAL_ADJUSTMENTS = {
+    "lose": -500,
+    "maintain": 0,
+    "gain": 300,
+}
+
+# Food tags each diet leaves out.
+DIET_EXCLUSIONS = {
+    "vegetarian": ["meat", "fish"],
+    "eggetarian": ["meat", "fish"],
+    "pescatarian": ["meat"],
+    "vegan": ["meat", "fish", "dairy", "egg"],
+}
+
+# Daily limits a disease or injury can set through ``impact_on_diet``.
+NUTRIENT_LIMITS = {
+    "max_calories": ("calories", min),
+    "max_carbs": ("carbs", min),
+    "max_fat": ("fat", min),
+    "min_protein": ("protein", max),
+}
+
+
+def age_on(date_of_birth: date, today: date) -> int:
+    return today.year - date_of_birth.year - (
+        (today.month, today.day) < (date_of_birth.month, date_of_birth.day))
+
+
+def default_goal(bmi: float | None) -> str:
+    if bmi is None:
+        return "maintain"
+    if bmi >= 25:
+        return "lose"
+    if bmi < 18.5:
+        return "gain"
+    return "maintain"
+
+
+def nutrition_targets(weight: float, height: float, age: int, gender: Gender,
+                      activity: str = "light", goal: str = "maintain"
+                      ) -> NutritionTargets:
+    """
+    Daily targets from the Mifflin-St Jeor energy estimate.
+
+    Protein is 1.6 g per Kg, fat 30% of the energy and carbs the rest.
+
+    Args:
+        weight (float): Weight in Kg.
+        height (float): Height in CM.
+        age (int): Age in years.
+        gender (Gender): Sets the constant of the estimate.
+        activity (str, optional): Key of ACTIVITY_FACTORS.
+        goal (str, optional): Key of GOAL_ADJUSTMENTS.
+
+    Returns:
+        NutritionTargets: The daily targets.
+    """
+    offset = {Gender.MALE: 5, Gender.FEMALE: -161}.get(gender, -78)
+    bmr = 10 * weight + 6.25 * height - 5 * age + offset
+    calories = max(1200.0, bmr * ACTIVITY_FACTORS.get(activity, 1.375)
+                   + GOAL_ADJUSTMENTS.get(goal, 0))
+
+    protein = 1.6 * weight
+    fat = calories * 0.30 / 9
+    carbs = max(0.0, (calories - protein * 4 - fat * 9) / 4)
+    return NutritionTargets(calories=round(calories), protein=round(protein),
+                            carbs=round(carbs), fat=round(fat))
+
+
+def allergens_of(allergies: Dict[str, Any] | None) -> List[str]:
+    """
+    Allergen names from the free form ``allergies`` document.
+
+    Both ``{"peanuts": true}`` and ``{"allergens": ["peanuts"]}`` are
+    understood, falsy flags are ignored.
+    """
+    names = []
+    for key, value in (allergies or {}).items():
+        if isinstance(value, list):
+            names.extend(str(item) for item in value)
+        elif value:
+            names.append(key)
+    return names
+
+
+def build_profile(customer: Dict[str, Any], summary: Dict[str, Any] | None,
+                  impacts: List[Dict[str, Any]],
+                  targets: NutritionTargets | None = None,
+                  exclude_allergens: List[str] | None = None,
+                  today: date | None = None) -> PlanningProfile:
+    """
+    Planning profile of a customer.
+
+    Preferences may set ``diet`` (a DIET_EXCLUSIONS key), ``activity_level``,
+    ``goal`` and ``dislikes`` (food names). Each active condition's
+    ``impact_on_diet`` may set ``avoid`` (food tags or allergens) and the
+    NUTRIENT_LIMITS.
+
+    Args:
+        customer (Dict[str, Any]): Customer columns.
+        summary (Dict[str, Any] | None): The customer's summary row, for
+            the latest weight and height.
+        impacts (List[Dict[str, Any]]): ``impact_on_diet`` of the active
+            injuries and diseases.
+        targets (NutritionTargets | None, optional): Explicit targets,
+            skipping the estimate.
+        exclude_allergens (List[str] | None, optional): Extra allergens.
+        today (date | None, optional): Day the age is computed on.
+
+    Returns:
+        PlanningProfile: The profile.
+
+    Raises:
+        ValueError: If targets are needed but the customer was never measured.
+    """
+    preferences = customer.get("preferences") or {}
+
+    if targets is None:
+        if not summary or summary.get("weight") is None \
+                or summary.get("height") is None:
+            raise ValueError("Customer has no body measurement to derive "
+                             "nutrition targets from")
+        targets = nutrition_targets(
+            summary["weight"], summary["height"],
+            age_on(customer["date_of_birth"], today or date.today()),
+            customer["gender"],
+            activity=preferences.get("activity_level", "light"),
+            goal=preferences.get("goal", default_goal(summary.get("bmi"))))
+
+    limited = targets.model_dump()
+    avoid: List[str] = []
+    for impact in impacts:
+        avoid.extend(impact.get("avoid") or [])
+        for key, (nutrient, pick) in NUTRIENT_LIMITS.items():
+            if impact.get(key) is not None:
+                limited[nutrient] = pick(limited[nutrient], float(impact[key]))
+
+    return PlanningProfile(
+        customer_id=customer.get("id"),
+        targets=NutritionTargets(**limited),
+        excluded_allergens=[*allergens_of(customer.get("allergies")),
+                            *(exclude_allergens or []), *avoid],
+        excluded_tags=[*DIET_EXCLUSIONS.get(preferences.get("diet"), []),
+                       *avoid],
+        excluded_foods=list(preferences.get("dislikes") or []),
+    )
@@ -0,0 +1,77 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.database import get_session
+from app.meal_plans.schemas import (BatchMealPlanRequest, BatchMealPlanResponse,
+                                    MealPlan, MealPlanRequest)
+from app.meal_plans.service import MealPlanService
+from app.models import CustomerMaster
+
+
+router = APIRouter(
+    prefix="/meal-plans",
+    tags=['meal plans']
+)
+
+
+# Dependency to get the MealPlanService
+async def get_meal_plan_service(session: AsyncSession = Depends(get_session)) -> MealPlanService:
+    """
+    Dependency that provides a MealPlanService instance.
+
+    Args:
+        session (AsyncSession): The database session dependency.
+
+    Returns:
+        MealPlanService: An instance of the MealPlanService.
+    """
+    return MealPlanService(CustomerMaster, session)
+
+
+@router.post("/batch", response_model=BatchMealPlanResponse)
+async def plan_meals_batch(
+    request: BatchMealPlanRequest,
+    service: MealPlanService = Depends(get_meal_plan_service)
+):
+    """
+    Generate meal plans for many customers at once.
+
+    Customers that can't be planned for are reported in ``errors``.
+
+    Args:
+        request (BatchMealPlanRequest): The customers and the plan shape.
+        service (MealPlanService): The meal plan service dependency.
+
+    Returns:
+        BatchMealPlanResponse: The plans and the skipped customers.
+    """
+    return await service.plan_batch(request)
+
+
+@router.post("/{customer_id}", response_model=MealPlan)
+async def plan_meals(
+    customer_id: UUID,
+    request: MealPlanRequest,
+    service: MealPlanService = Depends(get_meal_plan_service)
+):
+    """
+    Generate a meal plan for a customer.
+
+    Targets are derived from the latest measurement, preferences and
+    active conditions unless given. Allergens are always excluded.
+
+    Args:
+        customer_id (UUID): The customer.
+        request (MealPlanRequest): Days, meals and optional targets.
+        service (MealPlanService): The meal plan service dependency.
+
+    Returns:
+        MealPlan: The plan.
+
+    Raises:
+        HTTPException: If the customer doesn't exist, or has neither a
+                      measurement nor explicit targets.
+    """
+    return await service.plan(customer_id, request)
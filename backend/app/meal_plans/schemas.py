@@ -0,0 +1,74 @@
+from typing import List
+from uuid import UUID
+
+from sqlmodel import Field, SQLModel
+
+from app.enums import MealType
+
+DEFAULT_MEALS = [MealType.BREAKFAST, MealType.MORNING_SNACK, MealType.LUNCH,
+                 MealType.AFTERNOON_SNACK, MealType.DINNER]
+
+
+class NutritionTargets(SQLModel):
+    calories: float
+    protein: float  # in g
+    carbs: float  # in g
+    fat: float  # in g
+
+
+class PlanningProfile(SQLModel):
+    """
+    Everything the planner needs to know about a customer.
+
+    Built from the customer's measurements, preferences, allergies and
+    active diseases, or sent as is.
+    """
+    customer_id: UUID | None = None
+    targets: NutritionTargets
+    excluded_allergens: List[str] = []
+    excluded_tags: List[str] = []
+    excluded_foods: List[str] = []
+
+
+class MealPlanRequest(SQLModel):
+    days: int = Field(7, ge=1, le=28)
+    meals: List[MealType] = DEFAULT_MEALS
+    targets: NutritionTargets | None = None
+    exclude_allergens: List[str] = []
+
+
+class BatchMealPlanRequest(MealPlanRequest):
+    customer_ids: List[UUID] = Field(..., min_length=1, max_length=10_000)
+
+
+class PlannedFood(SQLModel):
+    name: str
+    servings: float
+
+
+class PlannedMeal(SQLModel):
+    meal_type: MealType
+    foods: List[PlannedFood]
+    totals: NutritionTargets
+
+
+class DayPlan(SQLModel):
+    day: int
+    meals: List[PlannedMeal]
+    totals: NutritionTargets
+
+
+class MealPlan(SQLModel):
+    customer_id: UUID | None = None
+    targets: NutritionTargets
+    days: List[DayPlan]
+
+
+class BatchMealPlanError(SQLModel):
+    customer_id: UUID
+    detail: str
+
+
+class BatchMealPlanResponse(SQLModel):
+    plans: List[MealPlan] = []
+    errors: List[BatchMealPlanError] = []
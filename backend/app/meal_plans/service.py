@@ -0,0 +1,140 @@
+import asyncio
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, List, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlmodel import select
+
+from app.config import settings
+from app.foods.catalog import get_catalog
+from app.meal_plans import batch
+from app.meal_plans.engine import MealPlanner
+from app.meal_plans.profiles import build_profile
+from app.meal_plans.schemas import (BatchMealPlanError, BatchMealPlanRequest,
+                                    BatchMealPlanResponse, MealPlan,
+                                    MealPlanRequest, PlanningProfile)
+from app.models import CustomerSummary, DiseaseMaster, InjuryMaster
+from app.service import BaseService
+
+PROFILE_COLUMNS = ("id", "date_of_birth", "gender", "preferences", "allergies")
+
+planner = MealPlanner(get_catalog())
+
+
+class MealPlanService(BaseService["CustomerMaster"]):
+    """
+    Service class generating meal plans for customers.
+
+    Profiles are read with one query per table whatever the number of
+    customers: the customer columns, the summary row for the latest weight
+    and height, and the diet impact of the active conditions.
+
+    Attributes:
+        Inherits all attributes from BaseService.
+    """
+
+    async def profiles(self, customer_ids: Sequence[UUID],
+                       request: MealPlanRequest
+                       ) -> tuple[List[PlanningProfile], List[BatchMealPlanError]]:
+        """
+        Build the planning profiles of some customers.
+
+        Args:
+            customer_ids (Sequence[UUID]): The customers.
+            request (MealPlanRequest): Explicit targets and exclusions.
+
+        Returns:
+            tuple[List[PlanningProfile], List[BatchMealPlanError]]: The
+                profiles, and the customers no profile could be built for.
+        """
+        table = self.model_class.__table__  # type: ignore
+        statement = select(*(table.c[name] for name in PROFILE_COLUMNS)).where(
+            table.c.id.in_(customer_ids))
+        customers = {row["id"]: row for row in
+                     (await self.session.execute(statement)).mappings().all()}
+
+        summary = CustomerSummary.__table__
+        statement = select(summary.c.customer_id, summary.c.weight,
+                           summary.c.height, summary.c.bmi).where(
+            summary.c.customer_id.in_(customer_ids))
+        summaries = {row["customer_id"]: row for row in
+                     (await self.session.execute(statement)).mappings().all()}
+
+        impacts: Dict[UUID, List[Dict[str, Any]]] = defaultdict(list)
+        today = date.today()
+        for model in (InjuryMaster, DiseaseMaster):
+            statement = select(model.customer_id, model.impact_on_diet).where(
+                model.customer_id.in_(customer_ids),
+                model.is_active_expression(today))
+            for customer_id, impact in (await self.session.exec(statement)).all():
+                if impact:
+                    impacts[customer_id].append(impact)
+
+        profiles, errors = [], []
+        for customer_id in customer_ids:
+            if customer_id not in customers:
+                errors.append(BatchMealPlanError(
+                    customer_id=customer_id, detail="Customer not found"))
+                continue
+            try:
+                profiles.append(build_profile(
+                    dict(customers[customer_id]), summaries.get(customer_id),
+                    impacts[customer_id], targets=request.targets,
+                    exclude_allergens=request.exclude_allergens, today=today))
+            except ValueError as error:
+                errors.append(BatchMealPlanError(customer_id=customer_id,
+                                                 detail=str(error)))
+
+        return profiles, errors
+
+    async def plan(self, customer_id: UUID, request: MealPlanRequest) -> MealPlan:
+        """
+        Plan the meals of one customer.
+
+        Raises:
+            HTTPException: If the customer doesn't exist, or has neither a
+                measurement nor explicit targets.
+        """
+        profiles, errors = await self.profiles([customer_id], request)
+        if errors:
+            raise HTTPException(
+                status_code=(status.HTTP_404_NOT_FOUND
+                             if errors[0].detail == "Customer not found"
+                             else status.HTTP_400_BAD_REQUEST),
+                detail=errors[0].detail
+            )
+        return planner.plan(profiles[0], request.meals, request.days)
+
+    async def plan_batch(self, request: BatchMealPlanRequest,
+                         chunk_size: int = 200) -> BatchMealPlanResponse:
+        """
+        Plan the meals of many customers across worker processes.
+
+        Profiles are built here, the plans are computed in chunks on the
+        process pool so the event loop stays free.
+
+        Args:
+            request (BatchMealPlanRequest): The customers and plan shape.
+            chunk_size (int, optional): Customers per process task.
+
+        Returns:
+            BatchMealPlanResponse: The plans and the customers skipped.
+        """
+        customer_ids = list(dict.fromkeys(request.customer_ids))
+        profiles, errors = await self.profiles(customer_ids, request)
+
+        loop = asyncio.get_running_loop()
+        executor = batch.get_executor(settings.MEAL_PLAN_PROCESSES)
+        chunks = [[profile.model_dump() for profile in profiles[start:start + chunk_size]]
+                  for start in range(0, len(profiles), chunk_size)]
+
+        results = await asyncio.gather(*(
+            loop.run_in_executor(executor, batch.plan_chunk, chunk,
+                                 request.meals, request.days)
+            for chunk in chunks))
+
+        return BatchMealPlanResponse(
+            plans=[plan for chunk in results for plan in chunk],
+            errors=errors)
@@ -0,0 +1,172 @@
+from typing import Dict, Sequence
+
+import numpy as np
+
+# Upper bounds of the BMI categories, see BodyMeasurementBase.bmi_category.
+BMI_THRESHOLDS = np.array([18.5, 25.0, 30.0])
+BMI_CATEGORIES = np.array(
+    ["Under Weight", "Normal Weight", "Over Weight", "Obese"])
+
+# Measurement columns loaded for the analytics, in this order.
+ANALYTICS_COLUMNS = (
+    "height", "weight", "body_fat_percentage",
+    "waist_circumference", "hip_circumference", "chest_circumference",
+    "arm_circumference", "thigh_circumference",
+)
+
+# The columns body_composition reads.
+ANALYSIS_INPUTS = ("height", "weight", "body_fat_percentage",
+                   "waist_circumference", "hip_circumference")
+
+
+def to_columns(rows: Sequence[Sequence[float | None]],
+               names: Sequence[str] = ANALYTICS_COLUMNS) -> Dict[str, np.ndarray]:
+    """
+    Turn query rows into one float array per column.
+
+    Missing values become NaN, so they drop out of the NaN-aware
+    aggregates instead of failing the whole computation.
+
+    Args:
+        rows (Sequence[Sequence[float | None]]): Rows of ``names`` values.
+        names (Sequence[str], optional): Column names, in row order.
+
+    Returns:
+        Dict[str, np.ndarray]: Arrays keyed by column name.
+    """
+    matrix = np.array(rows, dtype=np.float64).reshape(len(rows), len(names))
+    return {name: matrix[:, index] for index, name in enumerate(names)}
+
+
+def bmi(height: np.ndarray, weight: np.ndarray) -> np.ndarray:
+    """
+    BMI of many measurements at once, rounded like ``BodyMeasurementBase.bmi``.
+
+    Args:
+        height (np.ndarray): Heights in CM.
+        weight (np.ndarray): Weights in Kg.
+
+    Returns:
+        np.ndarray: BMI values.
+    """
+    height_m = height / 100
+    return np.round(weight / (height_m * height_m), 2)
+
+
+def bmi_category(values: np.ndarray) -> np.ndarray:
+    """
+    Category labels matching ``BodyMeasurementBase.bmi_category``.
+
+    Args:
+        values (np.ndarray): BMI values.
+
+    Returns:
+        np.ndarray: One label per value.
+    """
+    return BMI_CATEGORIES[np.searchsorted(BMI_THRESHOLDS, values, side="right")]
+
+
+def waist_to_hip_ratio(waist: np.ndarray, hip: np.ndarray) -> np.ndarray:
+    """
+    Waist-to-hip ratio, NaN where either circumference is missing.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(hip > 0, waist / hip, np.nan)
+
+
+def lean_mass(weight: np.ndarray, body_fat_percentage: np.ndarray) -> np.ndarray:
+    """
+    Lean body mass in Kg, NaN where the body fat isn't known.
+    """
+    return weight * (1 - body_fat_percentage / 100)
+
+
+def rolling_mean(values: np.ndarray, window: int,
+                 groups: np.ndarray | None = None) -> np.ndarray:
+    """
+    Trailing mean over the last ``window`` values.
+
+    The first values of a series average over what is available. With
+    ``groups`` the input must be sorted by group, and each group (e.g. a
+    customer's measurements by date) gets its own independent window.
+
+    Args:
+        values (np.ndarray): The series, in time order.
+        window (int): Number of values averaged.
+        groups (np.ndarray | None, optional): Group key of every value.
+
+    Returns:
+        np.ndarray: The rolling means, NaN values are skipped.
+    """
+    size = len(values)
+    present = ~np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(present, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(present)))
+
+    positions = np.arange(size)
+    starts = np.maximum(positions - window + 1, 0)
+
+    if groups is not None and size:
+        # Don't let a window reach back into the previous group.
+        boundaries = np.concatenate(([True], groups[1:] != groups[:-1]))
+        group_starts = np.maximum.accumulate(np.where(boundaries, positions, 0))
+        starts = np.maximum(starts, group_starts)
+
+    totals = sums[positions + 1] - sums[starts]
+    observed = counts[positions + 1] - counts[starts]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(observed > 0, totals / observed, np.nan)
+
+
+def body_composition(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Derived metrics of many measurements in one pass.
+
+    Args:
+        columns (Dict[str, np.ndarray]): Arrays from ``to_columns``.
+
+    Returns:
+        Dict[str, np.ndarray]: ``bmi``, ``bmi_category``,
+            ``waist_to_hip_ratio`` and ``lean_mass`` arrays.
+    """
+    values = bmi(columns["height"], columns["weight"])
+    return {
+        "bmi": values,
+        "bmi_category": bmi_category(values),
+        "waist_to_hip_ratio": waist_to_hip_ratio(
+            columns["waist_circumference"], columns["hip_circumference"]),
+        "lean_mass": lean_mass(
+            columns["weight"], columns["body_fat_percentage"]),
+    }
+
+
+def cohort_summary(columns: Dict[str, np.ndarray]) -> Dict[str, object]:
+    """
+    Aggregate figures of a cohort for dashboards.
+
+    Args:
+        columns (Dict[str, np.ndarray]): Arrays from ``to_columns``.
+
+    Returns:
+        Dict[str, object]: Counts per BMI category and the distribution of
+            the derived metrics.
+    """
+    metrics = body_composition(columns)
+    labels, counts = np.unique(metrics["bmi_category"], return_counts=True)
+
+    def distribution(values: np.ndarray) -> Dict[str, float | None]:
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return {"mean": None, "p25": None, "median": None, "p75": None}
+        p25, median, p75 = np.percentile(values, [25, 50, 75])
+        return {"mean": float(values.mean()), "p25": float(p25),
+                "median": float(median), "p75": float(p75)}
+
+    return {
+        "measurements": int(len(metrics["bmi"])),
+        "bmi_categories": {str(label): int(count)
+                           for label, count in zip(labels, counts)},
+        "bmi": distribution(metrics["bmi"]),
+        "waist_to_hip_ratio": distribution(metrics["waist_to_hip_ratio"]),
+        "lean_mass": distribution(metrics["lean_mass"]),
+    }
@@ -0,0 +1,54 @@
+from typing import List, Sequence, Tuple
+
+
+def lttb(points: Sequence[Tuple[float, float]], threshold: int) -> List[int]:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last point, and from every bucket in between the
+    point forming the largest triangle with the previously kept point and
+    the average of the next bucket. The visual shape of a chart survives
+    with far fewer points.
+
+    Args:
+        points (Sequence[Tuple[float, float]]): ``(x, y)`` pairs sorted by x.
+        threshold (int): Number of points to keep.
+
+    Returns:
+        List[int]: Indexes of the kept points, in order.
+    """
+    size = len(points)
+    if threshold >= size or threshold < 3:
+        return list(range(size))
+
+    kept = [0]
+    bucket_size = (size - 2) / (threshold - 2)
+    previous = 0
+
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+
+        # Average of the next bucket, the last point for the final one.
+        next_start = end
+        next_end = min(int((bucket + 2) * bucket_size) + 1, size)
+        next_points = points[next_start:next_end] or points[-1:]
+        average_x = sum(x for x, _ in next_points) / len(next_points)
+        average_y = sum(y for _, y in next_points) / len(next_points)
+
+        previous_x, previous_y = points[previous]
+        largest_area = -1.0
+        previous_candidate = start
+        for index in range(start, end):
+            x, y = points[index]
+            area = abs((previous_x - average_x) * (y - previous_y)
+                       - (previous_x - x) * (average_y - previous_y))
+            if area > largest_area:
+                largest_area = area
+                previous_candidate = index
+
+        kept.append(previous_candidate)
+        previous = previous_candidate
+
+    kept.append(size - 1)
+    return kept
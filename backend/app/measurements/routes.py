@@ -0,0 +1,253 @@
+from datetime import date
+from typing import List
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.analysis.service import AnalysisService
+from app.analysis.worker import AnalysisWorker, get_analysis_worker
+from app.cache import CacheBackend, get_cache
+from app.database import get_session
+from app.measurements.schemas import (BodyMeasurementCreate, CohortSummary,
+                                      BodyMeasurementResponse, SeriesBucket,
+                                      SeriesMetric, SeriesPoint)
+from app.measurements.service import MeasurementService
+from app.models import BodyMeasurementAIAnalysisMaster, BodyMeasurementMaster
+
+
+router = APIRouter(
+    prefix="/customers/{customer_id}/measurements",
+    tags=['measurements']
+)
+
+cohort_router = APIRouter(
+    prefix="/measurements",
+    tags=['measurements']
+)
+
+
+# Dependency to get the MeasurementService
+async def get_measurement_service(session: AsyncSession = Depends(get_session),
+                                  cache: CacheBackend = Depends(get_cache),
+                                  analysis: AnalysisWorker | None = Depends(get_analysis_worker)
+                                  ) -> MeasurementService:
+    """
+    Dependency that provides a MeasurementService instance.
+
+    Args:
+        session (AsyncSession): The database session dependency.
+        cache (CacheBackend): The customer profile cache.
+        analysis (AnalysisWorker | None): The AI analysis queue, None when
+            disabled.
+
+    Returns:
+        MeasurementService: An instance of the MeasurementService.
+    """
+    return MeasurementService(BodyMeasurementMaster, session, cache=cache,
+                              analysis=analysis)
+
+
+def check_date_range(from_date: date | None, to_date: date | None) -> None:
+    if from_date and to_date and from_date > to_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="from_date cannot be after to_date"
+        )
+
+
+@router.get("/", response_model=List[BodyMeasurementResponse])
+async def get_measurements(
+    customer_id: UUID,
+    from_date: date | None = Query(None, description="First day included."),
+    to_date: date | None = Query(None, description="Last day included."),
+    limit: int = Query(100, ge=1, le=1000,
+                       description="Maximum number of measurements to return."),
+    service: MeasurementService = Depends(get_measurement_service)
+):
+    """
+    Fetch a customer's measurements within a date range, oldest first.
+
+    Args:
+        customer_id (UUID): The customer measured.
+        from_date (date | None): First day included.
+        to_date (date | None): Last day included.
+        limit (int): Maximum number of measurements to return.
+        service (MeasurementService): The measurement service dependency.
+
+    Returns:
+        List[BodyMeasurementResponse]: The measurements.
+
+    Raises:
+        HTTPException: If from_date is after to_date.
+    """
+    check_date_range(from_date, to_date)
+    return await service.get_history(customer_id, from_date, to_date, limit)
+
+
+@router.get("/series", response_model=List[SeriesPoint])
+async def get_measurement_series(
+    customer_id: UUID,
+    metric: SeriesMetric = Query(SeriesMetric.WEIGHT,
+                                 description="Measured value to chart."),
+    bucket: SeriesBucket = Query(SeriesBucket.LTTB,
+                                 description="Weekly or monthly averages, or LTTB downsampling."),
+    points: int = Query(300, ge=3, le=5000,
+                        description="Points kept by LTTB."),
+    trend_window: int | None = Query(
+        None, ge=2, le=100,
+        description="Add the trailing mean over this many buckets or measurements."),
+    from_date: date | None = Query(None, description="First day included."),
+    to_date: date | None = Query(None, description="Last day included."),
+    service: MeasurementService = Depends(get_measurement_service)
+):
+    """
+    Fetch a downsampled measurement series for charts.
+
+    Multi-year histories come back as a few hundred points, aggregated in
+    the database for weekly and monthly buckets.
+
+    Args:
+        customer_id (UUID): The customer measured.
+        metric (SeriesMetric): The measured value to chart.
+        bucket (SeriesBucket): ``week``, ``month`` or ``lttb``.
+        points (int): Points kept by LTTB.
+        trend_window (int | None): Values in the trailing mean, e.g. 4
+            weekly buckets for a monthly trend.
+        from_date (date | None): First day included.
+        to_date (date | None): Last day included.
+        service (MeasurementService): The measurement service dependency.
+
+    Returns:
+        List[SeriesPoint]: The series, oldest first.
+
+    Raises:
+        HTTPException: If from_date is after to_date.
+    """
+    check_date_range(from_date, to_date)
+    return await service.get_series(customer_id, metric, bucket,
+                                    from_date, to_date, points, trend_window)
+
+
+@router.post("/", response_model=BodyMeasurementResponse,
+             status_code=status.HTTP_201_CREATED)
+async def create_measurement(
+    customer_id: UUID,
+    measurement: BodyMeasurementCreate,
+    service: MeasurementService = Depends(get_measurement_service)
+):
+    """
+    Record a new measurement for a customer.
+
+    Args:
+        customer_id (UUID): The customer measured.
+        measurement (BodyMeasurementCreate): The measurement data.
+        service (MeasurementService): The measurement service dependency.
+
+    Returns:
+        BodyMeasurementResponse: The stored measurement.
+    """
+    return await service.create_for_customer(
+        customer_id, measurement.model_dump(exclude={"customer_id"}))
+
+
+@router.get("/{measurement_id}", response_model=BodyMeasurementResponse)
+async def get_measurement(
+    customer_id: UUID,
+    measurement_id: UUID,
+    service: MeasurementService = Depends(get_measurement_service)
+):
+    """
+    Fetch one measurement of a customer.
+
+    Raises:
+        HTTPException: If the customer has no such measurement.
+    """
+    return await service.get_for_customer(customer_id, measurement_id)
+
+
+@router.delete("/{measurement_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_measurement(
+    customer_id: UUID,
+    measurement_id: UUID,
+    service: MeasurementService = Depends(get_measurement_service)
+):
+    """
+    Delete one measurement of a customer.
+
+    Raises:
+        HTTPException: If the customer has no such measurement.
+    """
+    await service.delete_for_customer(customer_id, measurement_id)
+    return None
+
+
+@router.get("/{measurement_id}/analysis",
+            response_model=BodyMeasurementAIAnalysisMaster)
+async def get_measurement_analysis(
+    customer_id: UUID,
+    measurement_id: UUID,
+    service: MeasurementService = Depends(get_measurement_service)
+):
+    """
+    Fetch the AI analysis of a measurement.
+
+    Analyses are produced in the background a few moments after the
+    measurement is recorded.
+
+    Raises:
+        HTTPException: If the customer has no such measurement, or it
+                      hasn't been analysed yet.
+    """
+    await service.get_for_customer(customer_id, measurement_id)
+    return await AnalysisService(BodyMeasurementAIAnalysisMaster,
+                                 service.session).get_for_measurement(measurement_id)
+
+
+@router.post("/{measurement_id}/analysis",
+             status_code=status.HTTP_202_ACCEPTED)
+async def request_measurement_analysis(
+    customer_id: UUID,
+    measurement_id: UUID,
+    service: MeasurementService = Depends(get_measurement_service)
+):
+    """
+    Queue a measurement for AI analysis, e.g. after a failed attempt.
+
+    Queuing an already analysed measurement does nothing.
+
+    Raises:
+        HTTPException: If the customer has no such measurement, or the
+                      analysis is disabled.
+    """
+    await service.get_for_customer(customer_id, measurement_id)
+    if service.analysis is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="AI analysis is disabled"
+        )
+    return {"queued": service.analysis.enqueue(measurement_id)}
+
+
+@cohort_router.get("/cohort", response_model=CohortSummary)
+async def get_cohort_summary(
+    from_date: date | None = Query(None, description="First day included."),
+    to_date: date | None = Query(None, description="Last day included."),
+    service: MeasurementService = Depends(get_measurement_service)
+):
+    """
+    Body composition of all customers, for dashboards.
+
+    Args:
+        from_date (date | None): First day included.
+        to_date (date | None): Last day included.
+        service (MeasurementService): The measurement service dependency.
+
+    Returns:
+        CohortSummary: BMI category counts and metric distributions.
+
+    Raises:
+        HTTPException: If from_date is after to_date.
+    """
+    check_date_range(from_date, to_date)
+    return await service.get_cohort_summary(from_date, to_date)
@@ -0,0 +1,74 @@
+from datetime import date, datetime
+from enum import Enum
+from typing import Dict
+from uuid import UUID
+
+from sqlmodel import SQLModel
+
+from app.schemas import BodyMeasurementBase, BodyMeasurementFields
+
+
+class BodyMeasurementCreate(BodyMeasurementBase):
+    """
+    A new measurement, the customer comes from the URL.
+    """
+    customer_id: UUID | None = None
+
+
+class BodyMeasurementResponse(BodyMeasurementFields):
+    id: UUID
+    created_at: datetime
+    updated_at: datetime
+    bmi: float
+    bmi_category: str
+
+
+class SeriesMetric(str, Enum):
+    WEIGHT = "weight"
+    BMI = "bmi"
+    BODY_FAT_PERCENTAGE = "body_fat_percentage"
+    WAIST_CIRCUMFERENCE = "waist_circumference"
+    HIP_CIRCUMFERENCE = "hip_circumference"
+    CHEST_CIRCUMFERENCE = "chest_circumference"
+    ARM_CIRCUMFERENCE = "arm_circumference"
+    THIGH_CIRCUMFERENCE = "thigh_circumference"
+
+
+class SeriesBucket(str, Enum):
+    WEEK = "week"
+    MONTH = "month"
+    LTTB = "lttb"
+
+
+class SeriesPoint(SQLModel):
+    """
+    A point of a downsampled measurement series.
+
+    For weekly and monthly buckets ``measured_on`` is the start of the
+    bucket and ``value`` the average, for LTTB it is an actual measurement.
+    ``trend`` is the trailing mean, when one was requested.
+    """
+    measured_on: date
+    value: float
+    min: float
+    max: float
+    count: int = 1
+    trend: float | None = None
+
+
+class Distribution(SQLModel):
+    mean: float | None = None
+    p25: float | None = None
+    median: float | None = None
+    p75: float | None = None
+
+
+class CohortSummary(SQLModel):
+    """
+    Body composition of every measurement taken in a date range.
+    """
+    measurements: int
+    bmi_categories: Dict[str, int]
+    bmi: Distribution
+    waist_to_hip_ratio: Distribution
+    lean_mass: Distribution
@@ -0,0 +1,297 @@
+from datetime import date
+from typing import Any, Dict, List, Sequence, Type
+from uuid import UUID
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy import Date, cast, delete, func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.analysis.worker import AnalysisWorker
+from app.cache import CacheBackend
+from app.customers.service import CustomerService
+from app.measurements.analytics import (ANALYTICS_COLUMNS, cohort_summary,
+                                        rolling_mean, to_columns)
+from app.measurements.downsampling import lttb
+from app.measurements.schemas import (CohortSummary, SeriesBucket,
+                                      SeriesMetric, SeriesPoint)
+from app.models import (BodyMeasurementAIAnalysisMaster, BodyMeasurementMaster,
+                        CustomerMaster, CustomerSummary)
+from app.service import BaseService
+from app.summaries.service import SummaryService
+
+
+class MeasurementService(BaseService["BodyMeasurementMaster"]):
+    """
+    Service class for body measurement queries.
+
+    Every query is bounded by customer and ``measured_on`` range, which the
+    ``(customer_id, measured_on)`` index answers without touching other
+    customers' rows.
+
+    Attributes:
+        Inherits all attributes from BaseService.
+        cache (CacheBackend | None): The customer profile cache, cleared when
+            a customer's measurements change.
+        analysis (AnalysisWorker | None): Background AI analysis, new
+            measurements are queued on it.
+    """
+
+    def __init__(self, model_class: Type["BodyMeasurementMaster"],
+                 session: AsyncSession, cache: CacheBackend | None = None,
+                 analysis: AnalysisWorker | None = None):
+        """
+        Initializing the measurement service.
+
+        Args:
+            model_class (Type[BodyMeasurementMaster]): The measurement model.
+            session (AsyncSession): The SQLAlchemy async session for database operations.
+            cache (CacheBackend | None, optional): The customer profile cache.
+            analysis (AnalysisWorker | None, optional): The AI analysis queue.
+        """
+        super().__init__(model_class, session)
+        self.cache = cache
+        self.analysis = analysis
+
+    async def invalidate_customer(self, customer_id: UUID) -> None:
+        """
+        Drop the cached profile embedding the customer's measurements.
+        """
+        await CustomerService(CustomerMaster, self.session,
+                              cache=self.cache).invalidate(customer_id)
+
+    def metric_expression(self, metric: SeriesMetric) -> Any:
+        """
+        SQL expression computing a metric from a measurement row.
+        """
+        if metric == SeriesMetric.BMI:
+            height_m = self.model_class.height / 100.0
+            return self.model_class.weight / (height_m * height_m)
+        return getattr(self.model_class, metric.value)
+
+    def bucket_expression(self, bucket: SeriesBucket) -> Any:
+        """
+        SQL expression truncating ``measured_on`` to the start of its bucket.
+
+        Weeks start on Monday on both PostgreSQL and SQLite.
+        """
+        measured_on = self.model_class.measured_on
+
+        if self.session.bind.dialect.name == "sqlite":
+            if bucket == SeriesBucket.WEEK:
+                return func.date(measured_on, "-6 days", "weekday 1")
+            return func.date(measured_on, "start of month")
+
+        return cast(func.date_trunc(bucket.value, measured_on), Date)
+
+    async def create_for_customer(self, customer_id: UUID,
+                                  data: Dict[str, Any]) -> "BodyMeasurementMaster":
+        """
+        Record a new measurement for a customer.
+
+        Args:
+            customer_id (UUID): The customer measured.
+            data (Dict[str, Any]): The measurement fields.
+
+        Returns:
+            BodyMeasurementMaster: The stored measurement.
+        """
+        # The measurement and its summary are committed together, a failed
+        # upsert leaves neither behind.
+        measurement = await self.create({**data, "customer_id": customer_id},
+                                        commit=False)
+        await SummaryService(CustomerSummary, self.session
+                             ).record_measurement(measurement)
+        await self.session.commit()
+        await self.invalidate_customer(customer_id)
+
+        # Analysed in the background, the request doesn't wait for it.
+        if self.analysis is not None:
+            self.analysis.enqueue(measurement.id)
+        return measurement
+
+    async def get_for_customer(self, customer_id: UUID, measurement_id: UUID
+                               ) -> "BodyMeasurementMaster":
+        """
+        Retrieve one of a customer's measurements.
+
+        Raises:
+            HTTPException: If the customer has no such measurement.
+        """
+        measurement = await self.get_by_id(measurement_id)
+        if measurement.customer_id != customer_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"BodyMeasurementMaster with id {measurement_id} not found"
+            )
+        return measurement
+
+    async def delete_for_customer(self, customer_id: UUID,
+                                  measurement_id: UUID) -> bool:
+        """
+        Delete one of a customer's measurements.
+
+        Raises:
+            HTTPException: If the customer has no such measurement.
+        """
+        owned = select(self.model_class.id).where(
+            self.model_class.id == measurement_id,
+            self.model_class.customer_id == customer_id
+        )
+
+        # The AI analysis goes with its measurement, in the same transaction.
+        await self.session.execute(
+            delete(BodyMeasurementAIAnalysisMaster).where(
+                BodyMeasurementAIAnalysisMaster.bodymeasurement_id.in_(owned)))
+
+        statement = delete(self.model_class).where(
+            self.model_class.id == measurement_id,
+            self.model_class.customer_id == customer_id
+        ).returning(self.model_class.id)
+
+        result = await self.session.execute(statement)
+        deleted = result.scalar_one_or_none()
+        await self.session.commit()
+
+        if deleted is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"BodyMeasurementMaster with id {measurement_id} not found"
+            )
+
+        await SummaryService(CustomerSummary, self.session
+                             ).refresh_measurements(customer_id)
+        await self.invalidate_customer(customer_id)
+        return True
+
+    async def get_history(self, customer_id: UUID,
+                          from_date: date | None = None,
+                          to_date: date | None = None,
+                          limit: int = 100) -> Sequence["BodyMeasurementMaster"]:
+        """
+        Retrieve a customer's measurements within a date range.
+
+        Args:
+            customer_id (UUID): The customer measured.
+            from_date (date | None, optional): First day included.
+            to_date (date | None, optional): Last day included.
+            limit (int, optional): Maximum number of measurements. Defaults to 100.
+
+        Returns:
+            Sequence[BodyMeasurementMaster]: Measurements, oldest first.
+        """
+        statement = select(self.model_class).where(
+            *self._range_filters(customer_id, from_date, to_date)
+        ).order_by(self.model_class.measured_on, self.model_class.id).limit(limit)
+
+        result = await self.session.exec(statement)
+        return result.all()
+
+    async def get_series(self, customer_id: UUID, metric: SeriesMetric,
+                         bucket: SeriesBucket, from_date: date | None = None,
+                         to_date: date | None = None,
+                         points: int = 300,
+                         trend_window: int | None = None) -> List[SeriesPoint]:
+        """
+        Downsample a customer's measurements for charts.
+
+        Weekly and monthly buckets are aggregated with a ``GROUP BY`` in the
+        database. LTTB reads only the date and metric columns and keeps
+        ``points`` representative measurements.
+
+        With a ``trend_window`` every point also gets the trailing mean of
+        the last ``trend_window`` buckets, or measurements for LTTB. The
+        LTTB trend is computed over every measurement before downsampling,
+        so it doesn't depend on which points were kept.
+
+        Args:
+            customer_id (UUID): The customer measured.
+            metric (SeriesMetric): The measured value to chart.
+            bucket (SeriesBucket): ``week``, ``month`` or ``lttb``.
+            from_date (date | None, optional): First day included.
+            to_date (date | None, optional): Last day included.
+            points (int, optional): Points kept by LTTB. Defaults to 300.
+            trend_window (int | None, optional): Values in the trailing
+                mean, no trend when None.
+
+        Returns:
+            List[SeriesPoint]: The series, oldest first.
+        """
+        value = self.metric_expression(metric)
+        filters = [*self._range_filters(customer_id, from_date, to_date),
+                   value.is_not(None)]
+
+        if bucket == SeriesBucket.LTTB:
+            statement = select(self.model_class.measured_on, value).where(
+                *filters).order_by(self.model_class.measured_on)
+            rows = (await self.session.exec(statement)).all()
+
+            kept = lttb([(row[0].toordinal(), row[1]) for row in rows], points)
+            trend = self._trend([row[1] for row in rows], trend_window)
+            return [SeriesPoint(measured_on=rows[index][0],
+                                value=rows[index][1],
+                                min=rows[index][1],
+                                max=rows[index][1],
+                                trend=trend[index])
+                    for index in kept]
+
+        start = self.bucket_expression(bucket).label("bucket_start")
+        statement = select(
+            start, func.avg(value), func.min(value), func.max(value),
+            func.count()
+        ).where(*filters).group_by(start).order_by(start)
+
+        rows = (await self.session.exec(statement)).all()
+        trend = self._trend([row[1] for row in rows], trend_window)
+        return [SeriesPoint(measured_on=row[0], value=row[1], min=row[2],
+                            max=row[3], count=row[4], trend=trend[index])
+                for index, row in enumerate(rows)]
+
+    @staticmethod
+    def _trend(values: List[float], window: int | None) -> List[float | None]:
+        """
+        Trailing means of a series, all None without a window.
+        """
+        if window is None:
+            return [None] * len(values)
+        means = rolling_mean(np.asarray(values, dtype=float), window)
+        return [None if np.isnan(mean) else round(float(mean), 2)
+                for mean in means]
+
+    async def get_cohort_summary(self, from_date: date | None = None,
+                                 to_date: date | None = None) -> CohortSummary:
+        """
+        Summarize the body composition of all measurements in a date range.
+
+        Only the numeric columns are selected, they are loaded into NumPy
+        arrays and every derived metric is computed in bulk instead of
+        building a model instance per row.
+
+        Args:
+            from_date (date | None, optional): First day included.
+            to_date (date | None, optional): Last day included.
+
+        Returns:
+            CohortSummary: Category counts and metric distributions.
+        """
+        statement = select(*(getattr(self.model_class, name)
+                             for name in ANALYTICS_COLUMNS))
+        if from_date is not None:
+            statement = statement.where(
+                self.model_class.measured_on >= from_date)
+        if to_date is not None:
+            statement = statement.where(
+                self.model_class.measured_on <= to_date)
+
+        rows = (await self.session.exec(statement)).all()
+        return CohortSummary(**cohort_summary(to_columns(rows)))
+
+    def _range_filters(self, customer_id: UUID, from_date: date | None,
+                       to_date: date | None) -> List[Any]:
+        filters = [self.model_class.customer_id == customer_id]
+        if from_date is not None:
+            filters.append(self.model_class.measured_on >= from_date)
+        if to_date is not None:
+            filters.append(self.model_class.measured_on <= to_date)
+        return filters
@@ -0,0 +1,177 @@
+import bisect
+import math
+import threading
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Prometheus' default latency buckets, in seconds.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75,
+                   1.0, 2.5, 5.0, 7.5, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+
+LabelValues = Tuple[str, ...]
+
+
+def format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def escape(value: str) -> str:
+    return (value.replace("\\", "\\\\").replace('"', '\\"')
+            .replace("\n", "\\n"))
+
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{escape(str(value))}"'
+                          for name, value in zip(names, values)) + "}"
+
+
+class Metric:
+    """
+    Base class of the metrics, one time series per combination of label
+    values.
+
+    Attributes:
+        name (str): The metric name, e.g. ``http_request_duration_seconds``.
+        documentation (str): The ``# HELP`` text.
+        labels (Tuple[str, ...]): The label names.
+    """
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str,
+                 labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.lock = threading.Lock()
+
+    def samples(self) -> Iterable[Tuple[str, LabelValues, Tuple[str, ...], float]]:
+        """
+        ``(suffix, label values, extra label names and values, value)``.
+        """
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}",
+                 f"# TYPE {self.name} {self.kind}"]
+        for suffix, values, extra, value in self.samples():
+            names = self.labels + extra[::2]
+            lines.append(f"{self.name}{suffix}"
+                         f"{format_labels(names, values + extra[1::2])} "
+                         f"{format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    """
+    A value that only goes up, e.g. a number of events. Its name ends
+    with ``_total``.
+    """
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str,
+                 labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def samples(self):
+        with self.lock:
+            items = sorted(self.values.items())
+        for values, value in items:
+            yield "", values, (), value
+
+
+class Gauge(Metric):
+    """
+    A value read when the metrics are scraped, e.g. connections in use.
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str,
+                 function: Callable[[], float]):
+        super().__init__(name, documentation)
+        self.function = function
+
+    def samples(self):
+        yield "", (), (), float(self.function())
+
+
+class Histogram(Metric):
+    """
+    Distribution of observations, e.g. latencies, in cumulative buckets.
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str,
+                 labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+        # Per label values: count per bucket (the last is +Inf) and sum.
+        self.values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self.lock:
+            counts, total = self.values.setdefault(
+                labels, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            total[0] += value
+
+    def samples(self):
+        with self.lock:
+            items = sorted((labels, (list(counts), total[0]))
+                           for labels, (counts, total) in self.values.items())
+        for values, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield "_bucket", values, ("le", format_value(bound)), cumulative
+            yield "_sum", values, (), total
+            yield "_count", values, (), cumulative
+
+
+class MetricsRegistry:
+    """
+    The metrics of the process, rendered in the Prometheus text format.
+
+    Each worker process has its own registry, Prometheus scrapes and sums
+    them like any multi-process target.
+    """
+
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str,
+                labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str,
+              function: Callable[[], float]) -> Gauge:
+        return self.register(Gauge(name, documentation, function))
+
+    def histogram(self, name: str, documentation: str,
+                  labels: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
@@ -2,10 +2,12 @@ from typing import List
 from uuid import UUID, uuid4
 from datetime import datetime
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
 from app.schemas import (BodyMeasurementAIAnalysisBase,
                          BodyMeasurementBase, CustomerBase,
+                         CustomerSummaryBase,
                          DiseaseBase, InjuryBase,)
 
 
@@ -20,11 +22,48 @@ class BaseModelMixin(SQLModel):
     updated_at: datetime = Field(default_factory=datetime.now, nullable=False)
 
 
+def gin_index(table: str, column: str) -> Index:
+    """
+    GIN index of a JSON document column, serving containment and key
+    lookups. Only PostgreSQL has them, other databases skip it.
+    """
+    return Index(f"ix_{table}_{column}", column,
+                 postgresql_using="gin").ddl_if(dialect="postgresql")
+
+
+def search_index(table: str, name: str, expression: str) -> Index:
+    """
+    GIN index behind the customer search, PostgreSQL only.
+    """
+    return Index(f"ix_{table}_{name}", text(expression),
+                 postgresql_using="gin").ddl_if(dialect="postgresql")
+
+
 class CustomerMaster(BaseModelMixin, CustomerBase, table=True):
     """
     Customer SQL Table.
     """
 
+    __table_args__ = (
+        Index("ix_customermaster_created_at_id", "created_at", "id"),
+        # Age ranges scan it, age and gender demographics only read it.
+        Index("ix_customermaster_date_of_birth_gender", "date_of_birth", "gender"),
+        # Only customers with a mobile number take space in the index.
+        Index("ix_customermaster_mobile_number", "mobile_number",
+              unique=True,
+              postgresql_where=text("mobile_number IS NOT NULL"),
+              sqlite_where=text("mobile_number IS NOT NULL")),
+        gin_index("customermaster", "preferences"),
+        gin_index("customermaster", "allergies"),
+        # Substring and typo tolerant search (pg_trgm), and word prefixes.
+        search_index("customermaster", "name_trgm", "lower(name) gin_trgm_ops"),
+        search_index("customermaster", "email_trgm", "lower(email) gin_trgm_ops"),
+        search_index("customermaster", "mobile_number_trgm",
+                     "mobile_number gin_trgm_ops"),
+        search_index("customermaster", "name_tsv",
+                     "to_tsvector('simple'::regconfig, name)"),
+    )
+
     body_measurements: List["BodyMeasurementMaster"] = Relationship(
         back_populates="customer",
         sa_relationship_kwargs={'lazy': 'selectin'}
@@ -42,29 +81,56 @@ class CustomerMaster(BaseModelMixin, CustomerBase, table=True):
 
 
 class BodyMeasurementMaster(BaseModelMixin, BodyMeasurementBase, table=True):
-    customer: CustomerMaster = Relationship(back_populates="body_measurements", sa_relationship_kwargs={
-        'lazy': 'selectin'
-    })
+    __table_args__ = (
+        Index("ix_bodymeasurementmaster_created_at_id", "created_at", "id"),
+        # Serves both the customer foreign key and time-bounded lookups.
+        Index("ix_bodymeasurementmaster_customer_id_measured_on",
+              "customer_id", "measured_on"),
+    )
 
-    ai_report: "BodyMeasurementAIAnalysisMaster" = Relationship(back_populates='body_measurements', sa_relationship_kwargs={
-        'lazy': 'selectin'
-    })
+    # Back references and the AI report are only loaded when asked for,
+    # so loading a customer's measurements doesn't cascade any further.
+    customer: CustomerMaster = Relationship(back_populates="body_measurements")
+
+    ai_report: "BodyMeasurementAIAnalysisMaster" = Relationship(back_populates='body_measurements')
 
 
 class BodyMeasurementAIAnalysisMaster(BaseModelMixin, BodyMeasurementAIAnalysisBase, table=True):
+    __table_args__ = (
+        Index("ix_bodymeasurementaianalysismaster_created_at_id", "created_at", "id"),
+    )
+
     body_measurements: BodyMeasurementMaster = Relationship(
-        back_populates="ai_report", sa_relationship_kwargs={
-            'lazy': 'selectin'
-        })
+        back_populates="ai_report")
 
 
 class InjuryMaster(BaseModelMixin, InjuryBase, table=True):
-    customer: CustomerMaster = Relationship(back_populates="injuries", sa_relationship_kwargs={
-        'lazy': 'selectin'
-    })
+    __table_args__ = (
+        Index("ix_injurymaster_created_at_id", "created_at", "id"),
+        gin_index("injurymaster", "impact_on_diet"),
+    )
+
+    customer: CustomerMaster = Relationship(back_populates="injuries")
 
 
 class DiseaseMaster(BaseModelMixin, DiseaseBase, table=True):
-    customer: CustomerMaster = Relationship(back_populates='diseases', sa_relationship_kwargs={
-        'lazy': 'selectin'
-    })
+    __table_args__ = (
+        Index("ix_diseasemaster_created_at_id", "created_at", "id"),
+        gin_index("diseasemaster", "medications"),
+        gin_index("diseasemaster", "impact_on_diet"),
+    )
+
+    customer: CustomerMaster = Relationship(back_populates='diseases')
+
+
+class CustomerSummary(CustomerSummaryBase, table=True):
+    # Every sortable column is indexed with the key breaking its ties, so
+    # keyset pages are range scans in either direction.
+    __table_args__ = (
+        Index("ix_customersummary_bmi_customer_id", "bmi", "customer_id"),
+        Index("ix_customersummary_weight_customer_id", "weight", "customer_id"),
+        Index("ix_customersummary_latest_measured_on_customer_id",
+              "latest_measured_on", "customer_id"),
+        Index("ix_customersummary_active_conditions_customer_id",
+              "active_conditions", "customer_id"),
+    )
@@ -0,0 +1,86 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    """
+    Build an opaque keyset cursor from the last row of a page.
+
+    Args:
+        created_at (datetime): Creation timestamp of the last row.
+        id (UUID): Id of the last row, used to break timestamp ties.
+
+    Returns:
+        str: URL safe token to pass back as ``?cursor=``.
+    """
+    payload = json.dumps([created_at.isoformat(), str(id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Read back a cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor (str): The token sent by the client.
+
+    Returns:
+        Tuple[datetime, UUID]: The ``(created_at, id)`` position to
+            continue after.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    try:
+        # Restore the padding stripped by encode_cursor.
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), UUID(id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def encode_key_cursor(key: Any, id: UUID) -> str:
+    """
+    Build a keyset cursor for a listing sorted by another column.
+
+    Args:
+        key (Any): Sort value of the last row, a number or a date.
+        id (UUID): Id of the last row, used to break ties.
+
+    Returns:
+        str: URL safe token to pass back as ``?cursor=``.
+    """
+    if hasattr(key, "isoformat"):
+        key = key.isoformat()
+    payload = json.dumps([key, str(id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_key_cursor(cursor: str) -> Tuple[Any, UUID]:
+    """
+    Read back a cursor produced by ``encode_key_cursor``.
+
+    Dates come back as ISO strings, the caller converts them.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key, id = json.loads(base64.urlsafe_b64decode(padded))
+        return key, UUID(id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
@@ -0,0 +1,144 @@
+import random
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from itertools import count
+from typing import Any, Deque, Dict, List
+
+from app.config import settings
+from app.instrumentation import RequestStats, current_request
+from app.profiling.sampler import Capture, StackSampler
+from app.profiling.schemas import FunctionTime, Profile, ProfiledStatement
+
+# Functions listed in a profile's top_functions.
+TOP_FUNCTIONS = 25
+
+
+class ProfileBuffer:
+    """
+    The last captured profiles, oldest dropped first.
+
+    Attributes:
+        profiles (Deque[Profile]): The profiles, oldest first.
+    """
+
+    def __init__(self, size: int):
+        self.profiles: Deque[Profile] = deque(maxlen=size)
+        self.ids = count(1)
+
+    def add(self, profile: Dict[str, Any]) -> Profile:
+        stored = Profile(id=next(self.ids), **profile)
+        self.profiles.append(stored)
+        return stored
+
+    def get(self, id: int) -> Profile | None:
+        return next((profile for profile in self.profiles
+                     if profile.id == id), None)
+
+    def clear(self) -> None:
+        self.profiles.clear()
+
+
+def top_functions(capture: Capture) -> List[FunctionTime]:
+    """
+    The functions at the top of the most samples, i.e. burning CPU.
+    """
+    leaves: Dict[str, int] = {}
+    for stack, samples in capture.stacks.items():
+        leaf = stack.rsplit(";", 1)[-1]
+        leaves[leaf] = leaves.get(leaf, 0) + samples
+    ranked = sorted(leaves.items(), key=lambda item: -item[1])[:TOP_FUNCTIONS]
+    return [FunctionTime(function=function, samples=samples,
+                         share=round(samples / capture.samples, 4))
+            for function, samples in ranked]
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling requests with a ``StackSampler``.
+
+    Every request is sampled while the profiler is enabled, since the
+    sampler's cost doesn't grow with the number of requests. The profile
+    and SQL statements of requests over ``slow_threshold`` are kept, as
+    are those of a random ``sample_rate`` fraction of the others.
+
+    Attributes:
+        sampler (StackSampler): The sampler.
+        buffer (ProfileBuffer): Where kept profiles go.
+        sample_rate (float): Fraction of the requests kept regardless of
+            their latency.
+        slow_threshold (float): Seconds above which a request is kept.
+    """
+
+    def __init__(self, app, buffer: ProfileBuffer, interval: float,
+                 sample_rate: float, slow_threshold: float):
+        self.app = app
+        self.sampler = StackSampler(interval)
+        self.buffer = buffer
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Reuse the metrics middleware's statistics when it runs.
+        stats = current_request.get()
+        token = None
+        if stats is None:
+            stats = RequestStats()
+            token = current_request.set(stats)
+        stats.log = []
+
+        status = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        frame = sys._getframe()
+        capture = self.sampler.register(frame)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - started
+            self.sampler.unregister(frame)
+            if token is not None:
+                current_request.reset(token)
+
+            if duration >= self.slow_threshold:
+                self.keep("slow", scope, status, duration, capture, stats)
+            elif random.random() < self.sample_rate:
+                self.keep("sampled", scope, status, duration, capture, stats)
+
+    def keep(self, reason: str, scope: Dict[str, Any], status: int,
+             duration: float, capture: Capture, stats: RequestStats) -> None:
+        self.buffer.add({
+            "captured_at": datetime.now(),
+            "reason": reason,
+            "method": scope["method"],
+            "route": getattr(scope.get("route"), "path", None) or "unmatched",
+            "status": status,
+            "duration_ms": round(duration * 1000, 3),
+            "db_ms": round(stats.seconds * 1000, 3),
+            "queries": stats.queries,
+            "samples": capture.samples,
+            "interval_ms": self.sampler.interval * 1000,
+            "top_functions": top_functions(capture) if capture.samples else [],
+            "stacks": capture.stacks,
+            "statements": [ProfiledStatement(statement=" ".join(statement.split()),
+                                             duration_ms=round(seconds * 1000, 3))
+                           for statement, seconds in stats.log or []],
+        })
+
+
+profile_buffer = ProfileBuffer(settings.PROFILING_BUFFER_SIZE)
+
+
+def get_profile_buffer() -> ProfileBuffer:
+    return profile_buffer
@@ -0,0 +1,119 @@
+import json
+import secrets
+from typing import List
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from fastapi.responses import PlainTextResponse
+
+from app.config import settings
+from app.profiling.recorder import ProfileBuffer, get_profile_buffer
+from app.profiling.schemas import Profile, ProfileSummary
+
+
+def require_admin(x_admin_token: str | None = Header(None)) -> None:
+    """
+    Check the ``X-Admin-Token`` header against ``ADMIN_TOKEN``.
+
+    Without an ``ADMIN_TOKEN`` the admin endpoints are closed, profiles
+    hold request timings and SQL that mustn't be public.
+
+    Raises:
+        HTTPException: If no token is configured, or the one sent is
+            missing or wrong.
+    """
+    if settings.ADMIN_TOKEN is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin endpoints are disabled, set ADMIN_TOKEN to enable them"
+        )
+    if x_admin_token is None or not secrets.compare_digest(
+            x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin token"
+        )
+
+
+router = APIRouter(
+    prefix="/admin/profiles",
+    tags=['admin'],
+    dependencies=[Depends(require_admin)]
+)
+
+
+@router.get("", response_model=List[ProfileSummary])
+async def list_profiles(buffer: ProfileBuffer = Depends(get_profile_buffer)):
+    """
+    The captured profiles, newest first, without their samples.
+
+    Args:
+        buffer (ProfileBuffer): The profile ring buffer.
+
+    Returns:
+        List[ProfileSummary]: One summary per captured request.
+    """
+    return [ProfileSummary(**profile.model_dump(include=set(ProfileSummary.model_fields)))
+            for profile in reversed(buffer.profiles)]
+
+
+@router.get("/download")
+async def download_profiles(buffer: ProfileBuffer = Depends(get_profile_buffer)):
+    """
+    Every captured profile, with samples and SQL, as a JSON file.
+
+    Args:
+        buffer (ProfileBuffer): The profile ring buffer.
+
+    Returns:
+        Response: A ``profiles.json`` attachment.
+    """
+    content = json.dumps([profile.model_dump(mode="json")
+                          for profile in buffer.profiles])
+    return Response(content=content, media_type="application/json",
+                    headers={"Content-Disposition":
+                             'attachment; filename="profiles.json"'})
+
+
+@router.delete("", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_profiles(buffer: ProfileBuffer = Depends(get_profile_buffer)):
+    """
+    Drop every captured profile.
+    """
+    buffer.clear()
+
+
+def find_profile(profile_id: int, buffer: ProfileBuffer) -> Profile:
+    profile = buffer.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return profile
+
+
+@router.get("/{profile_id}", response_model=Profile)
+async def get_profile(profile_id: int,
+                      buffer: ProfileBuffer = Depends(get_profile_buffer)):
+    """
+    One captured profile.
+
+    Raises:
+        HTTPException: If the profile doesn't exist or was dropped.
+    """
+    return find_profile(profile_id, buffer)
+
+
+@router.get("/{profile_id}/folded", response_class=PlainTextResponse)
+async def get_folded_stacks(profile_id: int,
+                            buffer: ProfileBuffer = Depends(get_profile_buffer)):
+    """
+    A profile's stacks in the folded format, for speedscope or
+    flamegraph.pl.
+
+    Raises:
+        HTTPException: If the profile doesn't exist or was dropped.
+    """
+    profile = find_profile(profile_id, buffer)
+    return "\n".join(f"{stack} {samples}"
+                     for stack, samples in profile.stacks.items()) + "\n"
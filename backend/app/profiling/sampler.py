@@ -0,0 +1,102 @@
+import os
+import sys
+import threading
+import time
+from types import FrameType
+from typing import Dict, List
+
+# Frames under these folders are shown relative to them.
+ROOTS = sorted({os.path.dirname(os.path.dirname(os.__file__)),
+                os.path.dirname(os.path.dirname(os.path.dirname(__file__)))},
+               key=len, reverse=True)
+
+
+def frame_label(frame: FrameType) -> str:
+    path = frame.f_code.co_filename
+    for root in ROOTS:
+        if path.startswith(root):
+            path = path[len(root):].lstrip(os.sep)
+            break
+    return f"{path}:{frame.f_code.co_name}"
+
+
+class Capture:
+    """
+    The stack samples of one request.
+
+    Attributes:
+        stacks (Dict[str, int]): Samples per stack, in the folded format of
+            flame graph tools: frames from the outermost, ``;`` separated.
+        samples (int): Samples taken while the request was running.
+    """
+
+    def __init__(self):
+        self.stacks: Dict[str, int] = {}
+        self.samples = 0
+
+    def add(self, frames: List[FrameType]) -> None:
+        stack = ";".join(frame_label(frame) for frame in reversed(frames))
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+        self.samples += 1
+
+
+class StackSampler:
+    """
+    Statistical profiler of the requests running on the event loop.
+
+    A daemon thread wakes up every ``interval`` seconds and reads the event
+    loop thread's current stack. When it runs through the frame of a
+    registered request, that frame and the ones above it are counted for
+    the request.
+    The cost is one stack walk per tick however many requests are in
+    flight, and nothing while none is registered.
+
+    Only CPU time is seen: a request waiting on the database isn't on the
+    stack, its statements are timed separately. Sync endpoints run in a
+    thread pool and aren't sampled.
+
+    Attributes:
+        interval (float): Seconds between samples.
+        active (Dict[int, Capture]): Captures by id of the request's frame.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.active: Dict[int, Capture] = {}
+        self.thread_id: int | None = None
+        self.thread: threading.Thread | None = None
+        self.lock = threading.Lock()
+
+    def register(self, frame: FrameType) -> Capture:
+        """
+        Start sampling the request running ``frame``, from the loop thread.
+        """
+        capture = Capture()
+        with self.lock:
+            self.active[id(frame)] = capture
+            if self.thread is None:
+                self.thread_id = threading.get_ident()
+                self.thread = threading.Thread(target=self.run, daemon=True,
+                                               name="stack-sampler")
+                self.thread.start()
+        return capture
+
+    def unregister(self, frame: FrameType) -> None:
+        with self.lock:
+            self.active.pop(id(frame), None)
+
+    def run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            if not self.active:
+                continue
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            with self.lock:
+                while frame is not None:
+                    frames.append(frame)
+                    capture = self.active.get(id(frame))
+                    if capture is not None:
+                        capture.add(frames)
+                        break
+                    frame = frame.f_back
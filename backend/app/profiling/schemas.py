@@ -0,0 +1,45 @@
+from datetime import datetime
+from typing import Dict, List
+
+from sqlmodel import SQLModel
+
+
+class ProfiledStatement(SQLModel):
+    statement: str
+    duration_ms: float
+
+
+class FunctionTime(SQLModel):
+    """
+    Samples a function was on top of the stack for, its own CPU time.
+    """
+    function: str
+    samples: int
+    share: float
+
+
+class ProfileSummary(SQLModel):
+    id: int
+    captured_at: datetime
+    reason: str  # "slow" or "sampled"
+    method: str
+    # The route template, the raw path may hold emails or phone numbers.
+    route: str
+    status: int
+    duration_ms: float
+    db_ms: float
+    queries: int
+    samples: int
+
+
+class Profile(ProfileSummary):
+    """
+    A captured request: where its CPU time went and the SQL it ran.
+
+    ``stacks`` is in the folded format flame graph tools read, e.g.
+    speedscope or flamegraph.pl, one sample every ``interval_ms``.
+    """
+    interval_ms: float
+    top_functions: List[FunctionTime]
+    stacks: Dict[str, int]
+    statements: List[ProfiledStatement]
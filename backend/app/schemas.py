@@ -1,12 +1,13 @@
 
-from datetime import date
+from datetime import date, datetime
 from typing import Any, Dict
 from uuid import UUID
 from pydantic import EmailStr, field_validator
-from sqlalchemy import JSON, VARCHAR, Column
+from sqlalchemy import JSON, VARCHAR, Column, Date, func, literal, or_
 from sqlmodel import Field, SQLModel
 
 from app.enums import Gender
+from app.expressions import JSONDocument, days_between
 
 
 class CustomerBase(SQLModel):
@@ -14,6 +15,7 @@ class CustomerBase(SQLModel):
     Represents a Client Receving Nutritionist Guidance.
     """
     name: str
+    # Indexed together with gender, see CustomerMaster.
     date_of_birth: date
     gender: Gender
     email: EmailStr | None = Field(
@@ -25,8 +27,8 @@ class CustomerBase(SQLModel):
     mobile_number: str | None = None
     alternate_mobile_number: str | None = None
 
-    preferences: Dict[str, Any] = Field(default={}, sa_column=Column(JSON))
-    allergies: Dict[str, Any] = Field(default={}, sa_column=Column(JSON))
+    preferences: Dict[str, Any] = Field(default={}, sa_column=Column(JSONDocument))
+    allergies: Dict[str, Any] = Field(default={}, sa_column=Column(JSONDocument))
 
     @property
     def age(self) -> int:
@@ -37,9 +39,10 @@ class CustomerBase(SQLModel):
         ), 2)
 
     @field_validator('mobile_number')
-    def mobile_validator(cls, v: str) -> str:
-        if not v.isdigit() or len(v) != 10:
-            raise ValueError("Mobile number must be exactly 10 digits.")
+    def mobile_validator(cls, v: str | None) -> str | None:
+        if type(v) == str:
+            if not v.isdigit() or len(v) != 10:
+                raise ValueError("Mobile number must be exactly 10 digits.")
         return v
 
     @field_validator('alternate_mobile_number')
@@ -50,11 +53,13 @@ class CustomerBase(SQLModel):
             return v
 
 
-class BodyMeasurementBase(SQLModel):
+class BodyMeasurementFields(SQLModel):
     """
-    Tracks client body measurements.
+    The columns of a body measurement, without the derived properties, for
+    schemas that carry them as fields.
     """
 
+    # Indexed together with measured_on, see BodyMeasurementMaster.
     customer_id: UUID = Field(foreign_key="customermaster.id")
     measured_on: date = Field(default_factory=date.today)
 
@@ -69,6 +74,12 @@ class BodyMeasurementBase(SQLModel):
     arm_circumference: float | None = None
     thigh_circumference: float | None = None
 
+
+class BodyMeasurementBase(BodyMeasurementFields):
+    """
+    Tracks client body measurements.
+    """
+
     @property
     def bmi(self) -> float:
         """
@@ -97,21 +108,33 @@ class BodyMeasurementBase(SQLModel):
 
 
 class BodyMeasurementAIAnalysisBase(SQLModel):
-    bodymeasurement_id: UUID = Field(foreign_key="bodymeasurementmaster.id")
+    # One analysis per measurement, the jobs rely on it to stay idempotent.
+    bodymeasurement_id: UUID = Field(foreign_key="bodymeasurementmaster.id",
+                                     index=True, unique=True)
     notes: str | None = None
     ai_analysis: Dict[str, Any] = Field(default={}, sa_column=Column(JSON))
 
 
-class HealthConditionBase(SQLModel):
-    customer_id: UUID = Field(foreign_key="customermaster.id")
+class HealthConditionFields(SQLModel):
+    """
+    The columns shared by injuries and diseases, without the derived
+    properties, for schemas that carry them as fields.
+    """
+    customer_id: UUID = Field(foreign_key="customermaster.id", index=True)
     name: str
     description: str | None = None
-    from_date: date = Field(default_factory=date.today)
-    to_date: date | None = None
+    from_date: date = Field(default_factory=date.today, index=True)
+    to_date: date | None = Field(default=None, index=True)
 
     # Ai Integration Fields.
     severity: str | None = None
 
+
+class HealthConditionBase(HealthConditionFields):
+    """
+    Shared fields of injuries and diseases, with their derived properties.
+    """
+
     @property
     def is_active(self) -> bool:
         """Check if condition is currently active"""
@@ -127,6 +150,20 @@ class HealthConditionBase(SQLModel):
 
         return (self.to_date - self.from_date).days
 
+    @classmethod
+    def is_active_expression(cls, today: date | None = None) -> Any:
+        """SQL equivalent of ``is_active``, served by the to_date index."""
+        today = today or date.today()
+        return or_(cls.to_date.is_(None), cls.to_date >= today)
+
+    @classmethod
+    def duration_days_expression(cls, today: date | None = None) -> Any:
+        """SQL equivalent of ``duration_days``."""
+        # Without a to_date the condition is active, so it lasts until today.
+        today = today or date.today()
+        return days_between(func.coalesce(cls.to_date, literal(today, Date)),
+                            cls.from_date)
+
 
 class InjuryBase(HealthConditionBase):
     """
@@ -135,7 +172,7 @@ class InjuryBase(HealthConditionBase):
 
     injury_type: str | None = None
     affected_body_part: str | None = None
-    impact_on_diet: Dict[str, Any] = Field(default={}, sa_column=Column(JSON))
+    impact_on_diet: Dict[str, Any] = Field(default={}, sa_column=Column(JSONDocument))
 
 
 class DiseaseBase(HealthConditionBase):
@@ -144,5 +181,29 @@ class DiseaseBase(HealthConditionBase):
     """
 
     diagnosis_date: date | None = None
-    medications: Dict[str, Any] = Field(default={}, sa_column=Column(JSON))
-    impact_on_diet: Dict[str, Any] = Field(default={}, sa_column=Column(JSON))
+    medications: Dict[str, Any] = Field(default={}, sa_column=Column(JSONDocument))
+    impact_on_diet: Dict[str, Any] = Field(default={}, sa_column=Column(JSONDocument))
+
+
+class CustomerSummaryBase(SQLModel):
+    """
+    A customer's latest measurement and active condition count, kept up to
+    date by the services so dashboards never read the child tables.
+    """
+    customer_id: UUID = Field(foreign_key="customermaster.id",
+                              primary_key=True, ondelete="CASCADE")
+
+    # Copied from the most recent body measurement.
+    latest_measurement_id: UUID | None = None
+    latest_measured_on: date | None = None
+    height: float | None = None
+    weight: float | None = None
+    bmi: float | None = None
+    body_fat_percentage: float | None = None
+
+    # Injuries and diseases active today, the count goes stale once the
+    # earliest of their to_date has passed.
+    active_conditions: int = 0
+    next_condition_end: date | None = Field(default=None, index=True)
+
+    updated_at: datetime = Field(default_factory=datetime.now)
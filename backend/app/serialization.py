@@ -0,0 +1,60 @@
+from typing import Any, Dict, List, Type
+
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+# Headers of the route's response that describe its (empty) body.
+BODY_HEADERS = (b"content-length", b"content-type")
+
+
+class RowSerializer:
+    """
+    Encode rows shaped like a response model without validating them.
+
+    With a ``response_model``, FastAPI validates every returned item into
+    a model instance, dumps it back to JSON compatible values and only then
+    encodes it. Rows projected from the model's own columns, like those of
+    ``BaseService.get_all_projected``, already have the right shape and
+    types, so they are handed to orjson as they are, which encodes UUIDs,
+    dates and enums natively. The route keeps its ``response_model`` for
+    the OpenAPI schema.
+
+    Attributes:
+        defaults (Dict[str, Any]): The optional fields and their defaults,
+            written for the fields a row doesn't have, e.g. relationships
+            that weren't included.
+    """
+
+    def __init__(self, response_model: Type[BaseModel]):
+        self.defaults: Dict[str, Any] = {
+            name: field.get_default(call_default_factory=True)
+            for name, field in response_model.model_fields.items()
+            if not field.is_required()
+        }
+
+    def complete(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        defaults = self.defaults
+        return [{**defaults, **row} for row in rows]
+
+
+def orjson_response(content: Any, response: Response | None = None,
+                    status_code: int = 200) -> ORJSONResponse:
+    """
+    Encode already serializable content, bypassing response model validation.
+
+    Args:
+        content (Any): Rows or documents orjson can encode.
+        response (Response | None): The response injected in the route,
+            whose headers (ETag, cursors, cookies) are carried over.
+        status_code (int): The response status.
+
+    Returns:
+        ORJSONResponse: The encoded response.
+    """
+    result = ORJSONResponse(content, status_code=status_code)
+    if response is not None:
+        result.raw_headers.extend(
+            (key, value) for key, value in response.raw_headers
+            if key not in BODY_HEADERS)
+    return result
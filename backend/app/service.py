@@ -1,14 +1,28 @@
-from typing import Any, Dict, Generic, Sequence, Type, TypeVar
+import re
+from collections import defaultdict
+from typing import Any, Dict, Generic, List, Sequence, Type, TypeVar
 from uuid import UUID
 from datetime import datetime
 
 from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import Column, delete, insert, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import Select, SelectOfScalar
+
+from app.pagination import decode_cursor, encode_cursor
 
 T = TypeVar('T')
 
+# Column named by a unique violation, as reported by PostgreSQL and SQLite.
+UNIQUE_VIOLATION_PATTERNS = (
+    re.compile(r"Key \((?P<column>[^)]+)\)=\(.*\) already exists"),
+    re.compile(r"UNIQUE constraint failed: \w+\.(?P<column>\w+)"),
+)
+
 class BaseService(Generic[T]):
     """
     Base service class providing common CRUD operations for all models.
@@ -19,8 +33,16 @@ class BaseService(Generic[T]):
     Attributes:
         model_class (Type[T]): The SQLModel class this service operates on.
         session (AsyncSession): The SQLAlchemy async session for database operations.
+        includes (Dict[str, str]): Relationships that can be embedded on
+            request, keyed by the public name used in ``?include=`` and
+            mapped to the relationship attribute on the model.
+        unique_conflicts (Dict[str, str]): 409 messages for unique columns,
+            keyed by column name and formatted with the conflicting ``value``.
     """
 
+    includes: Dict[str, str] = {}
+    unique_conflicts: Dict[str, str] = {}
+
     def __init__(self, model_class: Type[T], session: AsyncSession):
         """
         Initializing the base service with model class and database session.
@@ -32,39 +54,156 @@ class BaseService(Generic[T]):
         self.model_class = model_class
         self.session = session
 
-    async def create(self, data: Dict[str, Any]) -> T:
+    def integrity_error(self, error: IntegrityError,
+                        data: Dict[str, Any]) -> HTTPException:
+        """
+        Translate a database integrity error into an HTTP error.
+
+        Unique violations on a column listed in ``unique_conflicts`` become
+        a 409 with that message, anything else is a 400.
+
+        Args:
+            error (IntegrityError): The error raised by the database.
+            data (Dict[str, Any]): The values that were being written.
+
+        Returns:
+            HTTPException: The exception to raise.
+        """
+        # asyncpg keeps the "Key (column)=(value)" part on the driver error.
+        cause = getattr(error.orig, "__cause__", None)
+        message = f"{error.orig} {getattr(cause, 'detail', None) or ''}"
+
+        for pattern in UNIQUE_VIOLATION_PATTERNS:
+            match = pattern.search(message)
+            if match and match.group("column") in self.unique_conflicts:
+                column = match.group("column")
+                return HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=self.unique_conflicts[column].format(
+                        value=data.get(column))
+                )
+
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Database integrity error: {str(error)}"
+        )
+
+    def column_values(self, instance: T) -> Dict[str, Any]:
+        """
+        Column values of a model instance, ready for a Core insert.
+
+        Args:
+            instance (T): The model instance, with its defaults applied.
+
+        Returns:
+            Dict[str, Any]: Values keyed by column name.
+        """
+        table = self.model_class.__table__  # type: ignore
+        return {column.key: getattr(instance, column.key)
+                for column in table.c}
+
+    async def create(self, data: Dict[str, Any], commit: bool = True) -> T:
         """
         Create a new record in the database.
 
+        The row is written with a single ``INSERT ... RETURNING``, the
+        database constraints decide whether it conflicts with an existing
+        record.
+
         Args:
             data (Dict[str, Any]): Dictionary containing the model fields
                 and values.
+            commit (bool, optional): Commit the insert. Callers writing more
+                rows in the same transaction pass False and commit
+                themselves. Defaults to True.
 
         Raises:
             HTTPException: If There's a database integrity error during
-                creation.
+                creation, 409 for a known unique column.
         """
+        # Create a new instance of the model to apply the field defaults
+        instance = self.model_class(**data)
+        table = self.model_class.__table__  # type: ignore
+
         try:
-            # Create a new instance of the model with the provided data
-            instance = self.model_class(**data)
+            statement = insert(table).values(
+                self.column_values(instance)).returning(*table.c)
 
-            # Add the instance to the session and commit the transaction
-            self.session.add(instance)
-            await self.session.commit()
+            result = await self.session.execute(statement)
+            row = result.mappings().one()
+            if commit:
+                await self.session.commit()
+        except IntegrityError as e:
+            # Roll back the transaction if there's an integrity error
+            await self.session.rollback()
+            raise self.integrity_error(e, data)
+
+        # Pick up any values the database generated
+        for key, value in row.items():
+            setattr(instance, key, value)
+
+        return instance
+
+    async def bulk_create(self, rows: List[Dict[str, Any]]) -> List[UUID | None]:
+        """
+        Insert many records in one batched statement.
+
+        The rows are sent as multi-row ``INSERT ... ON CONFLICT DO NOTHING``
+        statements, so a row clashing with a unique constraint is skipped
+        instead of failing the whole batch.
 
-            # Refresh the instance to get any database-generated values
-            await self.session.refresh(instance)
+        Args:
+            rows (List[Dict[str, Any]]): Dictionaries containing the model
+                fields and values.
+
+        Returns:
+            List[UUID | None]: The id of each inserted row, in input order,
+                None for the rows skipped because of a conflict.
+
+        Raises:
+            HTTPException: If there's a database integrity error other than
+                a unique conflict.
+        """
+        if not rows:
+            return []
+
+        table = self.model_class.__table__  # type: ignore
+        fields = self.model_class.model_fields  # type: ignore
+
+        # Apply the field defaults directly, building a model instance per
+        # row costs more than the insert itself.
+        values = []
+        for row in rows:
+            value = {}
+            for column in table.c:
+                if column.key in row:
+                    value[column.key] = row[column.key]
+                elif fields[column.key].default_factory is not None:
+                    value[column.key] = fields[column.key].default_factory()
+                else:
+                    value[column.key] = fields[column.key].get_default()
+            values.append(value)
+
+        # ON CONFLICT is dialect specific, plain inserts elsewhere.
+        dialect = self.session.bind.dialect.name
+        if dialect == "postgresql":
+            statement = postgresql.insert(table).on_conflict_do_nothing()
+        elif dialect == "sqlite":
+            statement = sqlite.insert(table).on_conflict_do_nothing()
+        else:
+            statement = insert(table)
 
-            return instance
+        try:
+            result = await self.session.execute(
+                statement.returning(table.c.id), values)
+            inserted = set(result.scalars().all())
+            await self.session.commit()
         except IntegrityError as e:
-            # Roll back the transaction if there's an integrity error
             await self.session.rollback()
+            raise self.integrity_error(e, {})
 
-            # Raise an HTTP exception with appropriate status code and message
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Database integrity error: {str(e)}"
-            )
+        return [value["id"] if value["id"] in inserted else None
+                for value in values]
 
     async def get_by_id(self, id: UUID) -> T | None:
         """
@@ -102,74 +241,313 @@ class BaseService(Generic[T]):
 
         return instance
 
-    async def get_all(self, skip: int = 0, limit: int = 100) -> Sequence[T]:
+    def paginate(self, statement: Select | SelectOfScalar, skip: int = 0,
+                 limit: int = 100, cursor: str | None = None
+                 ) -> Select | SelectOfScalar:
+        """
+        Apply a stable ``(created_at, id)`` ordering and pagination.
+
+        With a cursor the page starts right after the encoded row, which an
+        index on ``(created_at, id)`` answers in O(limit) however deep the
+        client pages. Without one it falls back to ``offset(skip)``.
+
+        Args:
+            statement (Select | SelectOfScalar): The select statement to
+                paginate.
+            skip (int, optional): Number of records to skip, ignored when a
+                cursor is given. Defaults to 0.
+            limit (int, optional): Maximum number of records to return. Defaults to 100.
+            cursor (str | None, optional): Token returned by ``next_cursor``.
+
+        Returns:
+            Select | SelectOfScalar: The ordered and limited statement.
+        """
+        created_at = self.model_class.created_at  # type: ignore
+        id = self.model_class.id  # type: ignore
+
+        statement = statement.order_by(created_at, id)
+
+        if cursor:
+            last_created_at, last_id = decode_cursor(cursor)
+            statement = statement.where(
+                tuple_(created_at, id) > tuple_(last_created_at, last_id))
+        else:
+            statement = statement.offset(skip)
+
+        return statement.limit(limit)
+
+    def next_cursor(self, items: Sequence[Any], limit: int) -> str | None:
+        """
+        Cursor pointing after the last item of a page.
+
+        Args:
+            items (Sequence[Any]): The page, model instances or projected
+                mappings.
+            limit (int): The page size that was requested.
+
+        Returns:
+            str | None: The token for the next page, None when the page
+                wasn't full and there is nothing left to fetch.
+        """
+        if not items or len(items) < limit:
+            return None
+
+        last = items[-1]
+        if isinstance(last, dict):
+            return encode_cursor(last["created_at"], last["id"])
+        return encode_cursor(last.created_at, last.id)
+
+    async def get_all(self, skip: int = 0, limit: int = 100,
+                      cursor: str | None = None) -> Sequence[T]:
         """
         Retrieve all records with pagination.
 
         Args:
             skip (int, optional): Number of records to skip. Defaults to 0.
             limit (int, optional): Maximum number of records to return. Defaults to 100.
+            cursor (str | None, optional): Keyset cursor from ``next_cursor``,
+                replaces ``skip`` when given.
 
         Returns:
             Sequence[T]: A Sequence of model instances.
         """
         # Create a select statement with pagination
-        statement = select(self.model_class).offset(skip).limit(limit)
+        statement = self.paginate(select(self.model_class),
+                                  skip=skip, limit=limit, cursor=cursor)
 
         # Execute the statement and return all results
         result = await self.session.exec(statement)
         return result.all()
 
-    async def update(self, id: UUID, data: Dict[str, Any]) -> T | None:
+    def resolve_includes(self, include: str | None) -> List[str]:
+        """
+        Translate a comma separated ``include`` parameter into relationship
+        attribute names.
+
+        Args:
+            include (str | None): Public relationship names, e.g.
+                ``"measurements,diseases"``.
+
+        Returns:
+            List[str]: The model relationship attributes to load.
+
+        Raises:
+            HTTPException: If an unknown relationship is requested.
+        """
+        if not include:
+            return []
+
+        attributes = []
+        for name in (part.strip() for part in include.split(",")):
+            if not name:
+                continue
+            if name not in self.includes:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=(f"Unknown include '{name}', expected one of: "
+                            f"{', '.join(sorted(self.includes))}")
+                )
+            if self.includes[name] not in attributes:
+                attributes.append(self.includes[name])
+
+        return attributes
+
+    def projected_columns(self, response_model: Type[BaseModel]) -> List[Column]:
+        """
+        Table columns declared by a response model, plus the keyset
+        pagination columns.
+
+        Args:
+            response_model (Type[BaseModel]): The schema the rows will be
+                serialized with.
+
+        Returns:
+            List[Column]: The columns of the model table that the response
+                model has a field for.
+        """
+        table = self.model_class.__table__  # type: ignore
+        columns = [table.c[name] for name in response_model.model_fields
+                   if name in table.c]
+
+        # The keyset columns are always needed to build the next cursor.
+        for key in ("created_at", "id"):
+            if table.c[key] not in columns:
+                columns.append(table.c[key])
+
+        return columns
+
+    async def load_includes(self, rows: List[Dict[str, Any]],
+                            include: List[str]) -> List[Dict[str, Any]]:
+        """
+        Attach the requested one-to-many relationships to projected rows.
+
+        Each relationship costs a single ``IN`` query over the ids of the
+        page. Children are loaded as plain column mappings, like the rows,
+        so no ORM entities are built and nested relationships are never
+        followed.
+
+        Args:
+            rows (List[Dict[str, Any]]): Projected rows, each with an ``id``.
+            include (List[str]): Relationship attributes to load.
+
+        Returns:
+            List[Dict[str, Any]]: The same rows with the relationships set.
+        """
+        if not rows or not include:
+            return rows
+
+        ids = [row["id"] for row in rows]
+        for attribute in include:
+            relationship = getattr(self.model_class, attribute).property
+            related_class = relationship.mapper.class_
+            ((_, foreign_key),) = relationship.local_remote_pairs
+
+            statement = (select(*related_class.__table__.columns)
+                         .where(foreign_key.in_(ids)))
+            result = await self.session.exec(statement)
+
+            # Group the children under their parent id.
+            children = defaultdict(list)
+            for child in result.mappings():
+                children[child[foreign_key.key]].append(dict(child))
+
+            for row in rows:
+                row[attribute] = children.get(row["id"], [])
+
+        return rows
+
+    async def get_all_projected(self, response_model: Type[BaseModel],
+                                skip: int = 0, limit: int = 100,
+                                include: List[str] | None = None,
+                                cursor: str | None = None
+                                ) -> List[Dict[str, Any]]:
+        """
+        Retrieve records with pagination, loading only the columns the
+        response model declares.
+
+        Args:
+            response_model (Type[BaseModel]): The schema the rows will be
+                serialized with.
+            skip (int, optional): Number of records to skip. Defaults to 0.
+            limit (int, optional): Maximum number of records to return. Defaults to 100.
+            include (List[str] | None, optional): Relationship attributes to
+                eager load, see ``resolve_includes``.
+            cursor (str | None, optional): Keyset cursor from ``next_cursor``,
+                replaces ``skip`` when given.
+
+        Returns:
+            List[Dict[str, Any]]: One mapping per record.
+        """
+        # Select only the needed columns, no ORM entities are built.
+        statement = self.paginate(
+            select(*self.projected_columns(response_model)),
+            skip=skip, limit=limit, cursor=cursor)
+
+        result = await self.session.exec(statement)
+        rows = [dict(row) for row in result.mappings()]
+
+        return await self.load_includes(rows, include or [])
+
+    async def update(self, id: UUID, data: Dict[str, Any],
+                     expected_updated_at: datetime | None = None
+                     ) -> Dict[str, Any]:
         """
         Update an existing record.
 
+        Only the given fields are written, with a single
+        ``UPDATE ... RETURNING`` statement. Passing the ``updated_at`` the
+        client last read turns it into an optimistic concurrency check, a
+        concurrent edit is reported instead of being silently overwritten.
+
         Args:
             id (UUID): The unique identifier of the record to update.
             data (Dict[str, Any]): Dictionary containing the fields to update.
+            expected_updated_at (datetime | None, optional): The
+                ``updated_at`` the update is based on.
 
         Returns:
-            T: The updated model instance.
+            Dict[str, Any]: The updated record's columns.
 
         Raises:
-            HTTPException: If the record with the given ID doesn't exist.
+            HTTPException: If the record with the given ID doesn't exist, if
+                it was modified since ``expected_updated_at`` or if the new
+                values conflict with another record.
         """
-        # Get the existing instance or raise a 404 if not found
-        instance = await self.get_by_id(id)
+        table = self.model_class.__table__  # type: ignore
+
+        # Keep the columns that can be written, never the keys.
+        values = {key: value for key, value in data.items()
+                  if key in table.c and key not in ("id", "created_at")}
 
         # Update the updated_at timestamp to track modification time
-        data["updated_at"] = datetime.now()
+        values["updated_at"] = datetime.now()
 
-        # Update each field in the instance with the provided data
-        for key, value in data.items():
-            if hasattr(instance, key):
-                setattr(instance, key, value)
+        statement = update(table).where(table.c.id == id)
+        if expected_updated_at is not None:
+            statement = statement.where(
+                table.c.updated_at == expected_updated_at)
 
-        # Save the changes to the database
-        self.session.add(instance)
-        await self.session.commit()
-        await self.session.refresh(instance)
+        try:
+            result = await self.session.execute(
+                statement.values(values).returning(*table.c))
+            row = result.mappings().one_or_none()
+            await self.session.commit()
+        except IntegrityError as e:
+            await self.session.rollback()
+            raise self.integrity_error(e, data)
 
-        return instance
+        if row is None:
+            # Nothing matched, either the record is gone or it changed.
+            await self.get_by_id(id)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=(f"{self.model_class.__name__} with id {id} was "
+                        f"modified by someone else, reload it and retry")
+            )
 
-    async def delete(self, id: UUID) -> bool:
+        return dict(row)
+
+    async def delete(self, id: UUID,
+                     expected_updated_at: datetime | None = None) -> bool:
         """
         Delete a record from the database.
 
         Args:
             id (UUID): The unique identifier of the record to delete.
+            expected_updated_at (datetime | None, optional): Only delete the
+                record if it wasn't modified since.
 
         Returns:
             bool: True if deletion was successful.
 
         Raises:
-            HTTPException: If the record with the given ID doesn't exist.
+            HTTPException: If the record with the given ID doesn't exist, or
+                was modified since ``expected_updated_at``.
         """
-        # Get the existing instance or raise a 404 if not found
-        instance = await self.get_by_id(id)
+        table = self.model_class.__table__  # type: ignore
+
+        statement = delete(table).where(table.c.id == id)
+        if expected_updated_at is not None:
+            statement = statement.where(
+                table.c.updated_at == expected_updated_at)
 
-        # Delete the instance and commit the transaction
-        await self.session.delete(instance)
-        await self.session.commit()
+        # Delete the row and commit the transaction
+        try:
+            result = await self.session.execute(
+                statement.returning(table.c.id))
+            deleted = result.scalar_one_or_none()
+            await self.session.commit()
+        except IntegrityError as e:
+            await self.session.rollback()
+            raise self.integrity_error(e, {})
+
+        if deleted is None:
+            # Raise a 404 if the record is gone, it changed otherwise.
+            await self.get_by_id(id)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=(f"{self.model_class.__name__} with id {id} was "
+                        f"modified by someone else, reload it and retry")
+            )
 
-        return True
\ No newline at end of file
+        return True
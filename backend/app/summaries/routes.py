@@ -0,0 +1,102 @@
+from typing import List
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.database import get_session
+from app.models import CustomerSummary
+from app.summaries.schemas import (CustomerSummaryResponse,
+                                   SummaryRebuildResponse, SummarySort)
+from app.summaries.service import SummaryService
+
+
+router = APIRouter(
+    prefix="/customer-summaries",
+    tags=['customer summaries']
+)
+
+
+# Dependency to get the SummaryService
+async def get_summary_service(session: AsyncSession = Depends(get_session)) -> SummaryService:
+    """
+    Dependency that provides a SummaryService instance.
+
+    Args:
+        session (AsyncSession): The database session dependency.
+
+    Returns:
+        SummaryService: An instance of the SummaryService.
+    """
+    return SummaryService(CustomerSummary, session)
+
+
+@router.get("/", response_model=List[CustomerSummaryResponse])
+async def list_customer_summaries(
+    response: Response,
+    sort: SummarySort = Query(SummarySort.BMI, description="Column to sort by."),
+    descending: bool = Query(False, description="Largest values first."),
+    limit: int = Query(100, ge=1, le=100, description="Maximum number of customers to return."),
+    cursor: str | None = Query(
+        None, description="Cursor from the X-Next-Cursor header of the previous page."),
+    service: SummaryService = Depends(get_summary_service)
+):
+    """
+    List customers by their latest metrics, without reading the child tables.
+
+    Customers without a value for the sort column are left out. When the
+    page is full the ``X-Next-Cursor`` header carries the next page's cursor.
+
+    Args:
+        response (Response): The outgoing response, used to set the cursor header.
+        sort (SummarySort): Column to sort by.
+        descending (bool): Largest values first.
+        limit (int): Maximum number of customers to return.
+        cursor (str | None): Keyset cursor of the page to fetch.
+        service (SummaryService): The summary service dependency.
+
+    Returns:
+        List[CustomerSummaryResponse]: The page of summaries.
+    """
+    rows, next_cursor = await service.list_summaries(
+        sort, descending=descending, limit=limit, cursor=cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows
+
+
+@router.post("/rebuild", response_model=SummaryRebuildResponse)
+async def rebuild_customer_summaries(
+    service: SummaryService = Depends(get_summary_service)
+):
+    """
+    Recompute every summary from the child tables, to backfill or repair.
+
+    Args:
+        service (SummaryService): The summary service dependency.
+
+    Returns:
+        SummaryRebuildResponse: Number of summaries written.
+    """
+    return SummaryRebuildResponse(customers=await service.rebuild())
+
+
+@router.get("/{customer_id}", response_model=CustomerSummaryResponse)
+async def get_customer_summary(
+    customer_id: UUID,
+    service: SummaryService = Depends(get_summary_service)
+):
+    """
+    Fetch a customer's summary.
+
+    Args:
+        customer_id (UUID): The customer.
+        service (SummaryService): The summary service dependency.
+
+    Returns:
+        CustomerSummaryResponse: The customer's latest metrics.
+
+    Raises:
+        HTTPException: If the customer has no summary.
+    """
+    return await service.get_summary(customer_id)
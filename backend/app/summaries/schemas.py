@@ -0,0 +1,20 @@
+from enum import Enum
+
+from sqlmodel import SQLModel
+
+from app.schemas import CustomerSummaryBase
+
+
+class SummarySort(str, Enum):
+    BMI = "bmi"
+    WEIGHT = "weight"
+    LATEST_MEASURED_ON = "latest_measured_on"
+    ACTIVE_CONDITIONS = "active_conditions"
+
+
+class CustomerSummaryResponse(CustomerSummaryBase):
+    name: str
+
+
+class SummaryRebuildResponse(SQLModel):
+    customers: int = 0
@@ -0,0 +1,362 @@
+from datetime import date, datetime
+from typing import Any, Dict, List, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func, or_, tuple_, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import select
+
+from app.models import (BodyMeasurementMaster, CustomerMaster, DiseaseMaster,
+                        InjuryMaster)
+from app.pagination import decode_key_cursor, encode_key_cursor
+from app.service import BaseService
+from app.summaries.schemas import SummarySort
+
+MEASUREMENT_FIELDS = ("height", "weight", "body_fat_percentage")
+
+
+class SummaryService(BaseService["CustomerSummary"]):
+    """
+    Service class maintaining the per-customer summary table.
+
+    The measurement and condition services call into it after every write,
+    each call touches the one summary row of the customer, so the summary
+    is never rebuilt from the child tables on read.
+
+    Attributes:
+        Inherits all attributes from BaseService.
+    """
+
+    def upsert_statement(self, values: Dict[str, Any] | List[Dict[str, Any]],
+                         columns: Sequence[str], where: Any = None) -> Any:
+        """
+        ``INSERT ... ON CONFLICT (customer_id) DO UPDATE`` of some columns.
+
+        Args:
+            values (Dict[str, Any] | List[Dict[str, Any]]): Summary rows.
+            columns (Sequence[str]): Columns overwritten on conflict.
+            where (Any, optional): Condition the existing row must meet to
+                be overwritten, ``excluded`` holds the new values.
+
+        Returns:
+            Any: The statement, ready to execute.
+        """
+        table = self.model_class.__table__  # type: ignore
+        if self.session.bind.dialect.name == "postgresql":
+            statement = postgresql.insert(table).values(values)
+        else:
+            statement = sqlite.insert(table).values(values)
+
+        set_ = {column: statement.excluded[column] for column in columns}
+        set_["updated_at"] = statement.excluded.updated_at
+        return statement.on_conflict_do_update(
+            index_elements=[table.c.customer_id], set_=set_,
+            where=where(statement.excluded) if where else None)
+
+    def measurement_values(self, measurement: BodyMeasurementMaster | None
+                           ) -> Dict[str, Any]:
+        """
+        Summary columns copied from a customer's latest measurement.
+        """
+        if measurement is None:
+            values = dict.fromkeys(
+                ("latest_measurement_id", "latest_measured_on", "bmi",
+                 *MEASUREMENT_FIELDS))
+        else:
+            values = {
+                "latest_measurement_id": measurement.id,
+                "latest_measured_on": measurement.measured_on,
+                "bmi": measurement.bmi,
+                **{field: getattr(measurement, field)
+                   for field in MEASUREMENT_FIELDS},
+            }
+        values["updated_at"] = datetime.now()
+        return values
+
+    async def record_measurement(self, measurement: BodyMeasurementMaster) -> None:
+        """
+        Fold a newly written measurement into its customer's summary.
+
+        The row is only overwritten when the measurement is at least as
+        recent as the one it holds, which keeps concurrent inserts and
+        back-dated entries from regressing the summary. The customer's
+        active conditions are counted for the insert of their first
+        summary, an existing row keeps its count.
+
+        The upsert isn't committed, the caller commits it together with the
+        measurement.
+
+        Args:
+            measurement (BodyMeasurementMaster): The stored measurement.
+        """
+        table = self.model_class.__table__  # type: ignore
+        values = self.measurement_values(measurement)
+        columns = list(values)
+
+        conditions = (await self.session.exec(self.active_conditions_statement(
+            date.today(), [measurement.customer_id]))).first()
+        values.update(customer_id=measurement.customer_id,
+                      active_conditions=conditions[1] if conditions else 0,
+                      next_condition_end=conditions[2] if conditions else None)
+
+        statement = self.upsert_statement(
+            values, columns,
+            where=lambda excluded: or_(
+                table.c.latest_measured_on.is_(None),
+                excluded.latest_measured_on >= table.c.latest_measured_on))
+
+        await self.session.execute(statement)
+
+    async def refresh_measurements(self, customer_id: UUID) -> None:
+        """
+        Recompute the latest measurement of a customer, after a deletion.
+
+        A single lookup on the ``(customer_id, measured_on)`` index.
+
+        Args:
+            customer_id (UUID): The customer whose measurements changed.
+        """
+        statement = select(BodyMeasurementMaster).where(
+            BodyMeasurementMaster.customer_id == customer_id
+        ).order_by(BodyMeasurementMaster.measured_on.desc(),
+                   BodyMeasurementMaster.created_at.desc()).limit(1)
+        latest = (await self.session.exec(statement)).first()
+
+        values = {"customer_id": customer_id,
+                  **self.measurement_values(latest)}
+        await self.session.execute(self.upsert_statement(
+            values, [key for key in values if key != "customer_id"]))
+        await self.session.commit()
+
+    def active_conditions_statement(self, today: date,
+                                    customer_ids: Sequence[UUID] | None = None
+                                    ) -> Any:
+        """
+        Active injuries and diseases per customer, with the day the first
+        of them ends.
+
+        Args:
+            today (date): The day the conditions must be active on.
+            customer_ids (Sequence[UUID] | None, optional): Only count these
+                customers, through the ``customer_id`` indexes.
+
+        Returns:
+            Any: Select of ``(customer_id, active_conditions,
+                next_condition_end)``.
+        """
+        branches = []
+        for model in (InjuryMaster, DiseaseMaster):
+            branch = select(model.customer_id.label("customer_id"),
+                            model.to_date.label("to_date")).where(
+                model.is_active_expression(today))
+            if customer_ids is not None:
+                branch = branch.where(model.customer_id.in_(customer_ids))
+            branches.append(branch)
+        conditions = union_all(*branches).subquery()
+
+        return select(
+            conditions.c.customer_id,
+            func.count().label("active_conditions"),
+            func.min(conditions.c.to_date).label("next_condition_end"),
+        ).group_by(conditions.c.customer_id)
+
+    async def refresh_conditions(self, customer_ids: Sequence[UUID]) -> None:
+        """
+        Recount the active conditions of some customers.
+
+        Called after an injury or disease is written, and for the rows
+        whose count went stale because a condition ended.
+
+        Args:
+            customer_ids (Sequence[UUID]): The customers to recount.
+        """
+        if not customer_ids:
+            return
+
+        statement = self.active_conditions_statement(date.today(), customer_ids)
+        counts = {row[0]: row for row in (await self.session.exec(statement)).all()}
+
+        now = datetime.now()
+        values = [{
+            "customer_id": customer_id,
+            "active_conditions": counts[customer_id][1] if customer_id in counts else 0,
+            "next_condition_end": counts[customer_id][2] if customer_id in counts else None,
+            "updated_at": now,
+        } for customer_id in customer_ids]
+
+        await self.session.execute(self.upsert_statement(
+            values, ["active_conditions", "next_condition_end"]))
+        await self.session.commit()
+
+    async def refresh_expired(self) -> None:
+        """
+        Recount the customers one of whose conditions ended since the last
+        write, so ``active_conditions`` is correct for today.
+        """
+        statement = select(self.model_class.customer_id).where(
+            self.model_class.next_condition_end < date.today())
+        await self.refresh_conditions((await self.session.exec(statement)).all())
+
+    async def rebuild(self, partition_size: int = 1000) -> int:
+        """
+        Recompute every summary from the child tables.
+
+        Backfills existing data and repairs rows written outside the
+        services. Customers are streamed ``partition_size`` at a time and
+        each partition is upserted in one statement.
+
+        Args:
+            partition_size (int, optional): Customers per round trip.
+                Defaults to 1000.
+
+        Returns:
+            int: Number of summaries written.
+        """
+        measurement = BodyMeasurementMaster
+
+        # Rank each customer's measurements, newest first.
+        ranked = select(
+            measurement.customer_id, measurement.id, measurement.measured_on,
+            *[getattr(measurement, field) for field in MEASUREMENT_FIELDS],
+            func.row_number().over(
+                partition_by=measurement.customer_id,
+                order_by=(measurement.measured_on.desc(),
+                          measurement.created_at.desc())
+            ).label("position")
+        ).subquery()
+        conditions = self.active_conditions_statement(date.today()).subquery()
+
+        statement = select(
+            CustomerMaster.id, ranked.c.id, ranked.c.measured_on,
+            *[ranked.c[field] for field in MEASUREMENT_FIELDS],
+            conditions.c.active_conditions, conditions.c.next_condition_end,
+        ).outerjoin(ranked, and_(ranked.c.customer_id == CustomerMaster.id,
+                                 ranked.c.position == 1)
+                    ).outerjoin(conditions,
+                                conditions.c.customer_id == CustomerMaster.id)
+
+        columns = [key for key in self.model_class.model_fields
+                   if key not in ("customer_id", "updated_at")]
+        written = 0
+
+        result = await self.session.stream(
+            statement.execution_options(yield_per=partition_size))
+        async for partition in result.partitions():
+            now = datetime.now()
+            values = []
+            for row in partition:
+                height, weight = row[3], row[4]
+                values.append({
+                    "customer_id": row[0],
+                    "latest_measurement_id": row[1],
+                    "latest_measured_on": row[2],
+                    "height": height,
+                    "weight": weight,
+                    "body_fat_percentage": row[5],
+                    "bmi": (round(weight / ((height / 100) ** 2), 2)
+                            if height and weight is not None else None),
+                    "active_conditions": row[6] or 0,
+                    "next_condition_end": row[7],
+                    "updated_at": now,
+                })
+
+            await self.session.execute(self.upsert_statement(values, columns))
+            written += len(values)
+
+        await self.session.commit()
+        return written
+
+    def listing_statement(self) -> Any:
+        """
+        Summary columns with the customer's name, the only column read from
+        the customer table.
+        """
+        table = self.model_class.__table__  # type: ignore
+        return select(*table.c, CustomerMaster.name).join(
+            CustomerMaster, CustomerMaster.id == table.c.customer_id)
+
+    async def get_summary(self, customer_id: UUID) -> Dict[str, Any]:
+        """
+        Retrieve a customer's summary.
+
+        Args:
+            customer_id (UUID): The customer.
+
+        Returns:
+            Dict[str, Any]: The summary columns and the customer's name.
+
+        Raises:
+            HTTPException: If the customer has no summary yet.
+        """
+        table = self.model_class.__table__  # type: ignore
+        statement = self.listing_statement().where(
+            table.c.customer_id == customer_id)
+        row = (await self.session.execute(statement)).mappings().first()
+
+        if row and row["next_condition_end"] and row["next_condition_end"] < date.today():
+            await self.refresh_conditions([customer_id])
+            row = (await self.session.execute(statement)).mappings().first()
+
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Summary of customer {customer_id} not found"
+            )
+        return dict(row)
+
+    async def list_summaries(self, sort: SummarySort, descending: bool = False,
+                             limit: int = 100, cursor: str | None = None
+                             ) -> tuple[List[Dict[str, Any]], str | None]:
+        """
+        List summaries sorted by a metric, with keyset pagination.
+
+        Pages are range scans on the ``(metric, customer_id)`` index,
+        customers without a value for the metric are left out.
+
+        Args:
+            sort (SummarySort): The column to sort by.
+            descending (bool, optional): Largest values first. Defaults to False.
+            limit (int, optional): Maximum number of summaries. Defaults to 100.
+            cursor (str | None, optional): Cursor of the previous page.
+
+        Returns:
+            tuple[List[Dict[str, Any]], str | None]: The page and the cursor
+                of the next one, None on the last page.
+        """
+        await self.refresh_expired()
+
+        table = self.model_class.__table__  # type: ignore
+        key = table.c[sort.value]
+        customer_id = table.c.customer_id
+
+        statement = self.listing_statement().where(key.is_not(None))
+
+        if cursor:
+            last_key, last_id = decode_key_cursor(cursor)
+            if sort == SummarySort.LATEST_MEASURED_ON:
+                try:
+                    last_key = date.fromisoformat(last_key)
+                except (TypeError, ValueError):
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Invalid pagination cursor"
+                    )
+            position = tuple_(key, customer_id)
+            last = tuple_(last_key, last_id)
+            statement = statement.where(
+                position < last if descending else position > last)
+
+        if descending:
+            statement = statement.order_by(key.desc(), customer_id.desc())
+        else:
+            statement = statement.order_by(key, customer_id)
+
+        rows = [dict(row) for row in (await self.session.execute(
+            statement.limit(limit))).mappings().all()]
+
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = encode_key_cursor(rows[-1][sort.value],
+                                            rows[-1]["customer_id"])
+        return rows, next_cursor
@@ -0,0 +1,120 @@
+"""
+Compare the vectorized body composition analytics with the model properties.
+
+Generates synthetic measurements, then computes BMI and the BMI category
+once through ``BodyMeasurementBase.bmi``/``bmi_category`` on model
+instances and once through ``app.measurements.analytics`` on columnar
+arrays. Both paths must agree, the timings are printed per row count.
+
+The rolling weight trend of ``rolling_mean`` (the ``trend`` of measurement
+series) is checked and timed the same way, against a per-customer loop,
+with ``--window`` measurements per mean.
+
+Usage (from the ``backend/`` folder, no database needed):
+
+    python -m benchmarks.bmi_analytics --rows 10000 100000 500000 --window 4
+"""
+import argparse
+import time
+from typing import List, Tuple
+from uuid import uuid4
+
+import numpy as np
+
+from app.measurements.analytics import (ANALYTICS_COLUMNS, body_composition,
+                                        rolling_mean)
+from app.schemas import BodyMeasurementBase
+
+
+def synthetic_rows(count: int, seed: int = 0) -> np.ndarray:
+    """
+    Plausible measurements, one row per measurement in ANALYTICS_COLUMNS order.
+    """
+    rng = np.random.default_rng(seed)
+    rows = np.column_stack([
+        rng.normal(168, 10, count),   # height
+        rng.normal(72, 14, count),    # weight
+        rng.normal(27, 7, count),     # body_fat_percentage
+        rng.normal(88, 12, count),    # waist_circumference
+        rng.normal(102, 9, count),    # hip_circumference
+        rng.normal(98, 9, count),     # chest_circumference
+        rng.normal(31, 4, count),     # arm_circumference
+        rng.normal(56, 6, count),     # thigh_circumference
+    ])
+    # Optional fields are missing for a share of the measurements.
+    rows[rng.random(count) < 0.3, 2:] = np.nan
+    return rows
+
+
+def per_object(rows: np.ndarray) -> List[Tuple[float, str]]:
+    customer_id = uuid4()
+    instances = [
+        BodyMeasurementBase(customer_id=customer_id, height=row[0],
+                            weight=row[1])
+        for row in rows.tolist()
+    ]
+    return [(instance.bmi, instance.bmi_category) for instance in instances]
+
+
+def vectorized(rows: np.ndarray) -> dict:
+    columns = {name: rows[:, index]
+               for index, name in enumerate(ANALYTICS_COLUMNS)}
+    return body_composition(columns)
+
+
+def looped_rolling_mean(values: np.ndarray, groups: np.ndarray,
+                        window: int) -> List[float]:
+    means = []
+    for position, value in enumerate(values.tolist()):
+        start = max(position - window + 1, 0)
+        while groups[start] != groups[position]:
+            start += 1
+        present = [v for v in values[start:position + 1].tolist() if v == v]
+        means.append(sum(present) / len(present) if present else float("nan"))
+    return means
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+",
+                        default=[10_000, 100_000])
+    parser.add_argument("--window", type=int, default=4,
+                        help="Measurements per rolling mean.")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'properties':>12} {'vectorized':>12} {'speedup':>9}")
+    for count in args.rows:
+        rows = synthetic_rows(count)
+        expected, object_seconds = timed(per_object, rows)
+        metrics, vector_seconds = timed(vectorized, rows)
+
+        bmis, categories = zip(*expected)
+        assert np.allclose(metrics["bmi"], bmis)
+        assert list(metrics["bmi_category"]) == list(categories)
+
+        print(f"{count:>10} {object_seconds:>11.3f}s {vector_seconds:>11.3f}s"
+              f" {object_seconds / vector_seconds:>8.0f}x")
+
+    print(f"\n{'rows':>10} {'loop trend':>12} {'rolling':>12} {'speedup':>9}")
+    for count in args.rows:
+        # About 50 measurements per customer, sorted by customer.
+        weights = synthetic_rows(count)[:, 1]
+        weights[::17] = np.nan
+        groups = np.arange(count) // 50
+        expected, loop_seconds = timed(looped_rolling_mean, weights, groups,
+                                       args.window)
+        means, vector_seconds = timed(rolling_mean, weights, args.window, groups)
+        assert np.allclose(means, expected, equal_nan=True)
+
+        print(f"{count:>10} {loop_seconds:>11.3f}s {vector_seconds:>11.3f}s"
+              f" {loop_seconds / vector_seconds:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Check that the SQL condition expressions agree with the model properties.
+
+Generates random injuries and diseases, with the edge cases weighted in
+(open ended, ending today or yesterday, ending before they start), and
+compares ``is_active_expression``/``duration_days_expression`` evaluated
+by the database with ``is_active``/``duration_days`` evaluated in Python.
+Random combinations of ``ConditionService.filters`` are then checked
+against the same properties. Everything runs in a transaction that is
+rolled back. Exits non-zero if anything disagrees.
+
+Usage (from the ``backend/`` folder, against a migrated database):
+
+    python -m benchmarks.condition_equivalence --examples 2000 --seed 1
+"""
+import argparse
+import asyncio
+import random
+import sys
+from datetime import date, timedelta
+
+from sqlmodel import select
+
+from app.conditions.service import ConditionService
+from app.database import async_session_factory, engine
+from app.enums import Gender
+from app.models import CustomerMaster, DiseaseMaster, InjuryMaster
+
+
+def random_date(rng: random.Random, today: date) -> date:
+    # Mostly near today, where the boundaries are.
+    if rng.random() < 0.5:
+        return today + timedelta(days=rng.randint(-2, 2))
+    return today + timedelta(days=rng.randint(-5000, 5000))
+
+
+def random_condition(rng: random.Random, model, customer_id, today: date):
+    from_date = random_date(rng, today)
+    to_date = None if rng.random() < 0.3 else random_date(rng, today)
+    return model(customer_id=customer_id, name="generated",
+                 from_date=from_date, to_date=to_date)
+
+
+def random_filters(rng: random.Random, today: date) -> dict:
+    filters = {}
+    if rng.random() < 0.6:
+        filters["active"] = rng.random() < 0.5
+    if rng.random() < 0.6:
+        filters["min_duration"] = rng.choice([0, 1, 2, 30, 365, 3000])
+    if rng.random() < 0.4:
+        filters["max_duration"] = rng.choice([0, 1, 30, 365, 3000])
+    if rng.random() < 0.3:
+        filters["started_from"] = random_date(rng, today)
+    if rng.random() < 0.3:
+        filters["started_to"] = random_date(rng, today)
+    return filters
+
+
+def matches(condition, filters: dict) -> bool:
+    """
+    Whether a condition passes ``filters``, according to the properties.
+    """
+    duration = condition.duration_days
+    if "active" in filters and condition.is_active != filters["active"]:
+        return False
+    if "min_duration" in filters and (
+            duration is None or duration < filters["min_duration"]):
+        return False
+    if "max_duration" in filters and (
+            duration is None or duration > filters["max_duration"]):
+        return False
+    if "started_from" in filters and condition.from_date < filters["started_from"]:
+        return False
+    if "started_to" in filters and condition.from_date > filters["started_to"]:
+        return False
+    return True
+
+
+async def check(examples: int, seed: int, combinations: int) -> int:
+    rng = random.Random(seed)
+    today = date.today()
+    mismatches = 0
+
+    async with async_session_factory() as session:
+        customer = CustomerMaster(name="Equivalence check",
+                                  date_of_birth=date(1990, 1, 1),
+                                  gender=list(Gender)[0])
+        session.add(customer)
+        await session.flush()
+
+        for model in (InjuryMaster, DiseaseMaster):
+            conditions = [random_condition(rng, model, customer.id, today)
+                          for _ in range(examples)]
+            session.add_all(conditions)
+            await session.flush()
+
+            statement = select(
+                model.id, model.is_active_expression(today),
+                model.duration_days_expression(today)
+            ).where(model.customer_id == customer.id)
+            computed = {row[0]: (bool(row[1]), row[2])
+                        for row in (await session.exec(statement)).all()}
+
+            for condition in conditions:
+                expected = (condition.is_active, condition.duration_days)
+                if computed[condition.id] != expected:
+                    mismatches += 1
+                    print(f"{model.__name__} from {condition.from_date} "
+                          f"to {condition.to_date}: SQL {computed[condition.id]}"
+                          f", Python {expected}")
+
+            service = ConditionService(model, session)
+            for _ in range(combinations):
+                filters = random_filters(rng, today)
+                statement = select(model.id).where(
+                    model.customer_id == customer.id,
+                    *service.filters(today, **filters))
+                selected = set((await session.exec(statement)).all())
+                expected_ids = {condition.id for condition in conditions
+                                if matches(condition, filters)}
+                if selected != expected_ids:
+                    mismatches += 1
+                    print(f"{model.__name__} filters {filters}: SQL selects "
+                          f"{len(selected)}, Python {len(expected_ids)}, "
+                          f"{len(selected ^ expected_ids)} differ")
+
+        await session.rollback()
+
+    print(f"{2 * examples} conditions and {2 * combinations} filter "
+          f"combinations checked, {mismatches} mismatches")
+    return mismatches
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--examples", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--combinations", type=int, default=200,
+                        help="Random filter combinations checked per model.")
+    args = parser.parse_args()
+
+    try:
+        mismatches = await check(args.examples, args.seed, args.combinations)
+    finally:
+        await engine.dispose()
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,433 @@
+"""
+Reproducible load benchmark of the customer API hot paths.
+
+``run`` seeds a synthetic dataset (customers, each with measurements,
+injuries and diseases), then drives the ``/customers`` endpoints in-process
+with a fixed number of concurrent clients: list, get by id, email and
+mobile, age range, create, update and delete. Latency percentiles (p50,
+p95, p99) and throughput per endpoint are written to a JSON file.
+
+``compare`` reads two such files and flags the endpoints whose latency
+grew, or throughput dropped, by more than the threshold. It exits with
+status 1 when there is a regression, so it can gate CI.
+
+The seed is deterministic and reused by later runs, only the missing
+customers are added. PostgreSQL must be migrated first (``alembic upgrade
+head``); ``--sqlite`` runs against a throwaway SQLite file instead.
+
+Usage (from the ``backend/`` folder):
+
+    python -m benchmarks.customer_api run --customers 10000 --concurrency 16 \\
+        --output base.json
+    python -m benchmarks.customer_api compare base.json head.json --threshold 0.1
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+# Request method, path and JSON body.
+Call = Tuple[str, str, Dict[str, Any] | None]
+
+FIRST = ["Ann", "Joanna", "Ravi", "Priya", "Mohammed", "Lena", "Carlos",
+         "Mei", "Olga", "Kwame", "Sofia", "Arjun", "Fatima", "Tom", "Yuki"]
+LAST = ["Smith", "Patel", "Garcia", "Nguyen", "Kowalski", "Okafor", "Rossi",
+        "Tanaka", "Müller", "Haddad", "Silva", "Sharma", "Brown", "Ivanova"]
+INJURIES = [("Sprained ankle", "sprain", "ankle"),
+            ("Torn ligament", "tear", "knee"),
+            ("Lower back strain", "strain", "back")]
+DISEASES = [("Type 2 diabetes", {"metformin": "500mg"}),
+            ("Hypertension", {"amlodipine": "5mg"}),
+            ("Hypothyroidism", {"levothyroxine": "50mcg"})]
+# Seeded customers are told apart from the ones the benchmark creates.
+SEED_DOMAIN = "seed.benchmark.io"
+CREATED_DOMAIN = "new.benchmark.io"
+
+# Relative changes reported, latencies up and throughput down are worse.
+LATENCY_METRICS = ["p50_ms", "p95_ms", "p99_ms"]
+THROUGHPUT_METRIC = "throughput_rps"
+# Settings a result depends on, comparing runs that differ is meaningless.
+COMPARABLE = ["database", "customers", "measurements", "injuries",
+              "diseases", "concurrency", "requests"]
+
+
+def seed_customer(index: int, rng: random.Random) -> Dict[str, Any]:
+    first, last = rng.choice(FIRST), rng.choice(LAST)
+    return {
+        "name": f"{first} {last}",
+        "date_of_birth": date(rng.randint(1950, 2006), rng.randint(1, 12),
+                              rng.randint(1, 28)),
+        "gender": rng.choice(["male", "female"]),
+        "email": f"customer{index}@{SEED_DOMAIN}",
+        "alternate_email": None,
+        "mobile_number": f"9{index:09d}",
+        "alternate_mobile_number": None,
+        "preferences": {"diet": rng.choice(["vegetarian", "vegan", "omnivore"])},
+        "allergies": {"peanuts": True} if rng.random() < 0.1 else {},
+    }
+
+
+async def seed(args: argparse.Namespace) -> None:
+    """
+    Add the seeded customers, and their child rows, missing from the database.
+    """
+    from sqlalchemy import func
+    from sqlmodel import select
+
+    from app.customers.service import CustomerService
+    from app.database import async_session_factory
+    from app.models import (BodyMeasurementMaster, CustomerMaster,
+                            DiseaseMaster, InjuryMaster)
+    from app.service import BaseService
+
+    async with async_session_factory() as session:
+        existing = (await session.exec(
+            select(func.count()).select_from(CustomerMaster).where(
+                CustomerMaster.email.like(f"%@{SEED_DOMAIN}")))).one()
+        customers = CustomerService(CustomerMaster, session)
+        measurements = BaseService(BodyMeasurementMaster, session)
+        injuries = BaseService(InjuryMaster, session)
+        diseases = BaseService(DiseaseMaster, session)
+
+        today = date.today()
+        for start in range(existing, args.customers, args.batch_size):
+            # Seeded per batch, a resumed seed produces the same rows.
+            rng = random.Random(start)
+            indexes = range(start, min(start + args.batch_size, args.customers))
+            ids = await customers.bulk_create(
+                [seed_customer(index, rng) for index in indexes])
+
+            rows = []
+            for customer_id in filter(None, ids):
+                height = rng.gauss(170, 10)
+                weight = rng.gauss(72, 14)
+                for week in range(args.measurements):
+                    rows.append({
+                        "customer_id": customer_id,
+                        "measured_on": today - timedelta(weeks=week),
+                        "height": round(height, 1),
+                        "weight": round(weight + rng.gauss(0, 1.5), 1),
+                        "body_fat_percentage": round(rng.gauss(27, 6), 1),
+                    })
+            await measurements.bulk_create(rows)
+
+            rows = []
+            for customer_id in filter(None, ids):
+                for _ in range(args.injuries):
+                    name, injury_type, body_part = rng.choice(INJURIES)
+                    started = today - timedelta(days=rng.randint(0, 365))
+                    rows.append({
+                        "customer_id": customer_id, "name": name,
+                        "from_date": started,
+                        "to_date": rng.choice([None, started + timedelta(days=60)]),
+                        "injury_type": injury_type,
+                        "affected_body_part": body_part,
+                        "impact_on_diet": {"protein": "increase"},
+                    })
+            await injuries.bulk_create(rows)
+
+            rows = []
+            for customer_id in filter(None, ids):
+                for _ in range(args.diseases):
+                    name, medications = rng.choice(DISEASES)
+                    started = today - timedelta(days=rng.randint(0, 3650))
+                    rows.append({
+                        "customer_id": customer_id, "name": name,
+                        "from_date": started, "diagnosis_date": started,
+                        "medications": medications,
+                        "impact_on_diet": {"sugar": "limit"},
+                    })
+            await diseases.bulk_create(rows)
+
+
+def read_calls(args: argparse.Namespace, customers: List[Dict[str, Any]]
+               ) -> Dict[str, Callable[[random.Random], Call]]:
+    """
+    Request builders of the read endpoints, picking seeded customers at random.
+    """
+    def pick(rng: random.Random) -> Dict[str, Any]:
+        return rng.choice(customers)
+
+    def age_range(rng: random.Random) -> Call:
+        low = rng.randint(20, 70)
+        return "GET", f"/customers/age-range/?min_age={low}&max_age={low + 2}", None
+
+    return {
+        "list": lambda rng: ("GET", f"/customers/?limit={args.page_size}", None),
+        "get_by_id": lambda rng: ("GET", f"/customers/{pick(rng)['id']}", None),
+        "get_by_email": lambda rng: ("GET", f"/customers/email/{pick(rng)['email']}", None),
+        "get_by_mobile": lambda rng: (
+            "GET", f"/customers/mobile/{pick(rng)['mobile_number']}", None),
+        "age_range": age_range,
+    }
+
+
+async def drive(client, calls: Iterator[Call], concurrency: int,
+                on_response: Callable[[Any], None] | None = None
+                ) -> Dict[str, Any]:
+    """
+    Issue the calls from ``concurrency`` clients and time each of them.
+
+    Args:
+        client (AsyncClient): The client bound to the app.
+        calls (Iterator[Call]): The requests to send, shared by the clients.
+        concurrency (int): Number of clients sending at the same time.
+        on_response (Callable | None): Called with every successful response.
+
+    Returns:
+        Dict[str, Any]: Request and error counts, latency percentiles and
+            throughput.
+    """
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        for method, path, body in calls:
+            started = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+            elif on_response is not None:
+                on_response(response)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    milliseconds = np.array(latencies) * 1000
+    p50, p95, p99 = (np.percentile(milliseconds, [50, 95, 99])
+                     if len(milliseconds) else (0.0, 0.0, 0.0))
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "mean_ms": round(float(milliseconds.mean()), 3) if len(milliseconds) else 0.0,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> None:
+    if args.sqlite:
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{args.sqlite}"
+        os.environ.setdefault("ALEMBIC_DATABASE_URL", f"sqlite:///{args.sqlite}")
+
+    # Imported here so --sqlite is applied before the settings are read,
+    # and so compare runs without a configured database.
+    from httpx import ASGITransport, AsyncClient
+    from sqlmodel import SQLModel, select
+
+    from app import models
+    from app.database import async_session_factory, engine
+    from app.main import app
+
+    try:
+        if engine.dialect.name == "sqlite":
+            # Migrations target PostgreSQL, the schema is created directly.
+            async with engine.begin() as connection:
+                await connection.run_sync(SQLModel.metadata.create_all)
+
+        started = time.perf_counter()
+        await seed(args)
+        print(f"seeded in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+        Customer = models.CustomerMaster
+        async with async_session_factory() as session:
+            customers = [dict(row._mapping) for row in (await session.exec(
+                select(Customer.id, Customer.email, Customer.mobile_number)
+                .where(Customer.email.like(f"%@{SEED_DOMAIN}"))
+                .limit(args.customers))).all()]
+
+        rng = random.Random(args.seed)
+        # Unique per run, customers created by an interrupted run don't clash.
+        run_id = f"{rng.randrange(16 ** 6):06x}"
+        results: Dict[str, Dict[str, Any]] = {}
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport,
+                               base_url="http://benchmark") as client:
+            reads = read_calls(args, customers)
+
+            # Warm the pool and the caches before anything is measured.
+            for build in reads.values():
+                await drive(client, (build(rng) for _ in range(args.warmup)),
+                            args.concurrency)
+
+            for name, build in reads.items():
+                results[name] = await drive(
+                    client, (build(rng) for _ in range(args.requests)),
+                    args.concurrency)
+                print(f"{name:<14} {results[name]}", file=sys.stderr)
+
+            created: List[str] = []
+            results["create"] = await drive(client, (
+                ("POST", "/customers/", {
+                    "name": f"{rng.choice(FIRST)} {rng.choice(LAST)}",
+                    "date_of_birth": str(date(rng.randint(1950, 2006), 6, 15)),
+                    "gender": rng.choice(["male", "female"]),
+                    "email": f"{run_id}.{index}@{CREATED_DOMAIN}",
+                    "alternate_email": None,
+                    "mobile_number": f"8{int(run_id, 16) % 10_000:04d}{index:05d}",
+                    "alternate_mobile_number": None,
+                    "preferences": {},
+                    "allergies": {},
+                })
+                for index in range(args.requests)),
+                args.concurrency,
+                on_response=lambda response: created.append(response.json()["id"]))
+            results["update"] = await drive(client, (
+                ("PUT", f"/customers/{customer_id}",
+                 {"name": f"{rng.choice(FIRST)} {rng.choice(LAST)}"})
+                for customer_id in created), args.concurrency)
+            results["delete"] = await drive(client, (
+                ("DELETE", f"/customers/{customer_id}", None)
+                for customer_id in created), args.concurrency)
+            for name in ["create", "update", "delete"]:
+                print(f"{name:<14} {results[name]}", file=sys.stderr)
+    finally:
+        await engine.dispose()
+
+    report = {
+        "meta": {
+            "captured_at": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "database": engine.dialect.name,
+            "customers": args.customers,
+            "measurements": args.measurements,
+            "injuries": args.injuries,
+            "diseases": args.diseases,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+        },
+        "scenarios": results,
+    }
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"results written to {args.output}", file=sys.stderr)
+
+
+def compare(base: Dict[str, Any], head: Dict[str, Any], threshold: float,
+            min_delta_ms: float) -> List[str]:
+    """
+    Regressions of ``head`` against ``base``, printing every change.
+
+    A latency regression must both exceed ``threshold`` relatively and
+    ``min_delta_ms`` absolutely, so sub-millisecond noise isn't flagged.
+
+    Args:
+        base (Dict[str, Any]): The reference results.
+        head (Dict[str, Any]): The results to check.
+        threshold (float): Relative change tolerated, e.g. 0.1 for 10%.
+        min_delta_ms (float): Latency change always tolerated, in ms.
+
+    Returns:
+        List[str]: One line per regressed metric.
+    """
+    for key in COMPARABLE:
+        if base["meta"].get(key) != head["meta"].get(key):
+            print(f"warning: {key} differs ({base['meta'].get(key)} vs "
+                  f"{head['meta'].get(key)}), the runs aren't comparable",
+                  file=sys.stderr)
+
+    regressions = []
+    print(f"{'scenario':<14} {'metric':<15} {'base':>10} {'head':>10} {'change':>8}")
+    for scenario, before in base["scenarios"].items():
+        after = head["scenarios"].get(scenario)
+        if after is None:
+            print(f"{scenario:<14} missing from head")
+            continue
+
+        for metric in LATENCY_METRICS + [THROUGHPUT_METRIC]:
+            old, new = before[metric], after[metric]
+            change = (new - old) / old if old else 0.0
+            if metric == THROUGHPUT_METRIC:
+                regressed = change < -threshold
+            else:
+                regressed = change > threshold and new - old > min_delta_ms
+
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{scenario:<14} {metric:<15} {old:>10.2f} {new:>10.2f} "
+                  f"{change:>+8.1%}{flag}")
+            if regressed:
+                regressions.append(f"{scenario} {metric} {old} -> {new} ({change:+.1%})")
+
+        if after["errors"] > before["errors"]:
+            regressions.append(f"{scenario} errors {before['errors']} -> {after['errors']}")
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Seed, drive the API and record results.")
+    run_parser.add_argument("--customers", type=int, default=10_000)
+    run_parser.add_argument("--measurements", type=int, default=5,
+                            help="Body measurements per customer.")
+    run_parser.add_argument("--injuries", type=int, default=1,
+                            help="Injuries per customer.")
+    run_parser.add_argument("--diseases", type=int, default=1,
+                            help="Diseases per customer.")
+    run_parser.add_argument("--concurrency", type=int, default=8,
+                            help="Clients sending requests at the same time.")
+    run_parser.add_argument("--requests", type=int, default=500,
+                            help="Requests measured per scenario.")
+    run_parser.add_argument("--warmup", type=int, default=50,
+                            help="Unmeasured requests per read scenario.")
+    run_parser.add_argument("--page-size", type=int, default=100)
+    run_parser.add_argument("--batch-size", type=int, default=2000,
+                            help="Customers inserted per seed batch.")
+    run_parser.add_argument("--seed", type=int, default=0,
+                            help="Seed of the request mix.")
+    run_parser.add_argument("--sqlite", metavar="PATH",
+                            help="Run against this SQLite file instead of DATABASE_URL.")
+    run_parser.add_argument("--output", default="benchmark.json")
+
+    compare_parser = commands.add_parser("compare", help="Flag regressions between two runs.")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("head")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="Relative change tolerated, 0.1 is 10%%.")
+    compare_parser.add_argument("--min-delta-ms", type=float, default=1.0,
+                                help="Latency change always tolerated.")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        asyncio.run(run(args))
+        return
+
+    with open(args.base) as base, open(args.head) as head:
+        regressions = compare(json.load(base), json.load(head),
+                              args.threshold, args.min_delta_ms)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s):")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print("\nno regressions")
+
+
+if __name__ == "__main__":
+    main()
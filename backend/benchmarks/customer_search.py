@@ -0,0 +1,87 @@
+"""
+Time the typeahead customer search on a large customer table.
+
+Seeds synthetic customers into the configured database unless it already
+holds enough, then times ``CustomerService.search`` for partial names,
+names with typos, email fragments and phone digits. On PostgreSQL this
+exercises the trigram and full text indexes (migrate first), elsewhere
+the in-process n-gram index. The typeahead budget is 20 ms at p95.
+
+Usage (from the ``backend/`` folder):
+
+    python -m benchmarks.customer_search --customers 1000000
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import date
+
+from sqlalchemy import func
+from sqlmodel import select
+
+from app.customers.service import CustomerService
+from app.database import async_session_factory, engine
+from app.models import CustomerMaster
+
+FIRST = ["Ann", "Joanna", "Ravi", "Priya", "Mohammed", "Lena", "Carlos",
+         "Mei", "Olga", "Kwame", "Sofia", "Arjun", "Fatima", "Tom", "Yuki"]
+LAST = ["Smith", "Patel", "Garcia", "Nguyen", "Kowalski", "Okafor", "Rossi",
+        "Tanaka", "Müller", "Haddad", "Silva", "Sharma", "Brown", "Ivanova"]
+QUERIES = ["jo", "ann", "priy", "ravi sha", "smtih", "garcai", "@mail9",
+           "okafor.1", "98765", "4321"]
+
+
+async def seed(count: int, batch_size: int = 5000) -> None:
+    rng = random.Random(0)
+    async with async_session_factory() as session:
+        existing = (await session.exec(
+            select(func.count()).select_from(CustomerMaster))).one()
+        service = CustomerService(CustomerMaster, session)
+        for start in range(existing, count, batch_size):
+            rows = []
+            for index in range(start, min(start + batch_size, count)):
+                first, last = rng.choice(FIRST), rng.choice(LAST)
+                rows.append({
+                    "name": f"{first} {last}",
+                    "date_of_birth": date(rng.randint(1950, 2005), 1, 1),
+                    "gender": rng.choice(["male", "female"]),
+                    "email": f"{first.lower()}.{last.lower()}.{index}@mail{index % 10}.com",
+                    "alternate_email": None,
+                    "mobile_number": f"{index:010d}",
+                    "alternate_mobile_number": None,
+                    "preferences": {},
+                    "allergies": {},
+                })
+            await service.bulk_create(rows)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--customers", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    try:
+        await seed(args.customers)
+        async with async_session_factory() as session:
+            service = CustomerService(CustomerMaster, session)
+            await service.search("warm up")
+
+            for query in QUERIES:
+                timings, hits = [], 0
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    hits = len(await service.search(query, limit=10))
+                    timings.append((time.perf_counter() - start) * 1000)
+                timings.sort()
+                print(f"{query!r:<12} {hits:>2} hits   "
+                      f"p50 {statistics.median(timings):7.2f} ms   "
+                      f"p95 {timings[int(len(timings) * 0.95) - 1]:7.2f} ms")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
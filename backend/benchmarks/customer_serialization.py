@@ -0,0 +1,148 @@
+"""
+Per-item cost of serializing a ``GET /customers/`` page.
+
+Builds synthetic projected rows, as ``get_all_projected`` returns them,
+and serializes pages of them two ways:
+
+* ``response model``: FastAPI validating the page into the response model,
+  with the children as SQLModel table instances, then encoding it. This is
+  how pages were served before;
+* ``orjson rows``: ``RowSerializer`` and ``orjson_response``, the rows and
+  their children encoded as they are.
+
+Both must produce the same JSON document. Times are per customer.
+
+Usage (from the ``backend/`` folder, no database needed):
+
+    python -m benchmarks.customer_serialization --children 0 5 20
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.customers.schemas import CustomerListResponse
+from app.models import BodyMeasurementMaster, DiseaseMaster, InjuryMaster
+from app.serialization import RowSerializer, orjson_response
+
+
+# CustomerListResponse as it was, nesting the table models.
+class TableModelListResponse(CustomerListResponse):
+    body_measurements: List[BodyMeasurementMaster] | None = None
+    injuries: List[InjuryMaster] | None = None
+    diseases: List[DiseaseMaster] | None = None
+
+
+def synthetic_page(size: int, children: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Projected customer rows, each with ``children`` of every relationship.
+    """
+    rng = random.Random(seed)
+    now = datetime.now()
+    rows = []
+    for index in range(size):
+        customer_id = uuid4()
+        stamps = {"created_at": now, "updated_at": now}
+        rows.append({
+            "id": customer_id, "name": f"Customer {index}",
+            "date_of_birth": date(1990, 1, 1) + timedelta(days=index),
+            "gender": rng.choice(["male", "female"]),
+            "email": f"customer{index}@example.com", "alternate_email": None,
+            "mobile_number": f"9{index:09d}", "alternate_mobile_number": None,
+            "preferences": {"diet": "vegetarian"}, "allergies": {},
+            **stamps,
+            "body_measurements": [
+                {"id": uuid4(), "customer_id": customer_id,
+                 "measured_on": date.today() - timedelta(weeks=week),
+                 "height": 170.0, "weight": round(rng.gauss(72, 8), 1),
+                 "body_fat_percentage": 25.5, "waist_circumference": None,
+                 "hip_circumference": None, "chest_circumference": None,
+                 "arm_circumference": None, "thigh_circumference": None,
+                 **stamps}
+                for week in range(children)],
+            "injuries": [
+                {"id": uuid4(), "customer_id": customer_id, "name": "Sprain",
+                 "description": None, "from_date": date(2024, 1, 1),
+                 "to_date": None, "severity": "mild", "injury_type": "sprain",
+                 "affected_body_part": "ankle", "impact_on_diet": {}, **stamps}
+                for _ in range(children)],
+            "diseases": [
+                {"id": uuid4(), "customer_id": customer_id, "name": "Diabetes",
+                 "description": None, "from_date": date(2020, 1, 1),
+                 "to_date": None, "severity": None,
+                 "diagnosis_date": date(2020, 1, 1),
+                 "medications": {"metformin": "500mg"}, "impact_on_diet": {},
+                 **stamps}
+                for _ in range(children)],
+        })
+    return rows
+
+
+def as_table_models(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    The rows with ORM instances as children, as the entity loads returned.
+    """
+    relationships = {"body_measurements": BodyMeasurementMaster,
+                     "injuries": InjuryMaster, "diseases": DiseaseMaster}
+    return [{**row, **{name: [model(**child) for child in row[name]]
+                       for name, model in relationships.items()}}
+            for row in rows]
+
+
+def response_model_path(model) -> Callable[[List[Dict[str, Any]]], bytes]:
+    field = create_model_field("Response", List[model], mode="serialization")
+
+    def serialize(rows: List[Dict[str, Any]]) -> bytes:
+        content = asyncio.run(serialize_response(field=field, response_content=rows))
+        return JSONResponse(content).body
+    return serialize
+
+
+def orjson_path() -> Callable[[List[Dict[str, Any]]], bytes]:
+    serializer = RowSerializer(CustomerListResponse)
+    return lambda rows: orjson_response(serializer.complete(rows)).body
+
+
+def per_item_us(serialize: Callable, rows: List[Dict[str, Any]],
+                repeat: int) -> float:
+    serialize(rows)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        serialize(rows)
+        best = min(best, time.perf_counter() - start)
+    return best / len(rows) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--children", type=int, nargs="+", default=[0, 5, 20],
+                        help="Rows of each relationship per customer.")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'children':>8} {'response model':>16} {'orjson rows':>13} {'speedup':>8}")
+    for children in args.children:
+        rows = synthetic_page(args.page_size, children)
+        legacy_rows = as_table_models(rows)
+        legacy = response_model_path(TableModelListResponse)
+        fast = orjson_path()
+        assert json.loads(fast(rows)) == json.loads(legacy(legacy_rows))
+
+        legacy_us = per_item_us(legacy, legacy_rows, args.repeat)
+        fast_us = per_item_us(fast, rows, args.repeat)
+        print(f"{children:>8} {legacy_us:>13.1f} us {fast_us:>10.1f} us "
+              f"{legacy_us / fast_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
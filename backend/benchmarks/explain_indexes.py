@@ -0,0 +1,87 @@
+"""
+Check that every CustomerService lookup is answered by an index.
+
+Runs the service queries against the configured database, captures the
+SQL they emit and prints the ``EXPLAIN`` plan of each one. Sequential
+scans are disabled for the session first, so a plan that still scans the
+table means no usable index exists. Exits non-zero on the first
+statement that isn't index backed.
+
+Usage (from the ``backend/`` folder, against a migrated database):
+
+    python -m benchmarks.explain_indexes
+"""
+import asyncio
+import sys
+from typing import Any, List, Tuple
+from uuid import uuid4
+
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app.customers.service import CustomerService
+from app.database import async_session_factory, engine
+from app.models import CustomerMaster
+
+SCAN_MARKERS = {
+    "postgresql": "Seq Scan",
+    "sqlite": "SCAN ",
+}
+
+
+async def capture_statements() -> List[Tuple[str, Any]]:
+    """
+    Run the customer lookups and collect the statements they execute.
+    """
+    statements: List[Tuple[str, Any]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters,
+                              context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute",
+                 before_cursor_execute)
+    try:
+        async with async_session_factory() as session:
+            service = CustomerService(CustomerMaster, session)
+            try:
+                await service.get_by_id(uuid4())
+            except HTTPException:
+                pass  # A random id is expected to be missing.
+            await service.get_by_email("explain@example.com")
+            await service.get_by_mobile("0000000000")
+            await service.get_customers_by_age_range(20, 30)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute",
+                     before_cursor_execute)
+
+    return statements
+
+
+async def main() -> int:
+    statements = await capture_statements()
+    backend = engine.dialect.name
+    marker = SCAN_MARKERS.get(backend, "Seq Scan")
+
+    failures = 0
+    async with engine.connect() as connection:
+        if backend == "postgresql":
+            await connection.exec_driver_sql("SET enable_seqscan = off")
+        explain = "EXPLAIN QUERY PLAN " if backend == "sqlite" else "EXPLAIN "
+
+        for statement, parameters in statements:
+            result = await connection.exec_driver_sql(explain + statement,
+                                                      parameters)
+            plan = "\n".join(str(row[-1]) for row in result)
+            uses_index = marker not in plan
+            failures += not uses_index
+
+            print("OK  " if uses_index else "SCAN", statement.splitlines()[-1])
+            print("    " + plan.replace("\n", "\n    "))
+
+    await engine.dispose()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,90 @@
+"""
+Time food catalog lookups on a large synthetic catalog.
+
+Builds a catalog of random foods, then times the name prefix search, the
+fuzzy search and nutrient range queries behind ``/foods``, against a plain
+scan over the Food models for reference. No database needed.
+
+Usage (from the ``backend/`` folder):
+
+    python -m benchmarks.food_catalog --foods 100000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app.enums import MealType
+from app.foods.catalog import ALLERGENS, FoodCatalog
+from app.foods.schemas import Food
+
+WORDS = ["chicken", "rice", "lentil", "paneer", "oat", "salad", "curry",
+         "yogurt", "almond", "tofu", "egg", "bread", "soup", "banana",
+         "quinoa", "salmon", "spinach", "potato", "bean", "cheese", "wrap",
+         "porridge", "smoothie", "roast", "grilled", "baked", "spicy", "sweet"]
+TAGS = ["vegan", "meat", "fish", "dairy", "egg", "sugar", "fried", "fruit"]
+
+
+def synthetic_foods(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    meals = list(MealType)
+    foods = []
+    for index in range(count):
+        protein, carbs, fat = (rng.uniform(0, 50), rng.uniform(0, 90),
+                               rng.uniform(0, 40))
+        foods.append(Food(
+            name=" ".join(rng.sample(WORDS, rng.randint(1, 3))) + f" {index}",
+            calories=protein * 4 + carbs * 4 + fat * 9,
+            protein=protein, carbs=carbs, fat=fat, fiber=rng.uniform(0, 12),
+            meal_types=rng.sample(meals, rng.randint(1, 4)),
+            allergens=rng.sample(ALLERGENS, rng.randint(0, 2)),
+            tags=rng.sample(TAGS, rng.randint(0, 2))))
+    return foods
+
+
+def timed(function, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--foods", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    foods = synthetic_foods(args.foods)
+    start = time.perf_counter()
+    catalog = FoodCatalog(foods)
+    print(f"{len(catalog)} foods indexed in {time.perf_counter() - start:.2f} s")
+
+    allowed = catalog.allowed(["nuts", "dairy"], ["meat"])
+    cases = {
+        "prefix 'chi'": lambda: catalog.prefix("chi", limit=20),
+        "fuzzy 'chiken curyy'": lambda: catalog.fuzzy("chiken curyy", limit=20),
+        "allergen mask": lambda: catalog.allowed(["nuts", "dairy"], ["meat"]),
+        "protein/100kcal >= 20, top 50": lambda: catalog.query(
+            {"protein_per_100kcal": (20, None)}, allowed=allowed,
+            sort="protein_per_100kcal", descending=True, limit=50),
+        "calories 100-150, fat <= 3": lambda: catalog.query(
+            {"calories": (100, 150), "fat": (None, 3)}, allowed=allowed,
+            meal=MealType.BREAKFAST),
+        "scan: calories 100-150, fat <= 3": lambda: [
+            food for food in foods if 100 <= food.calories <= 150
+            and food.fat <= 3 and MealType.BREAKFAST in food.meal_types
+            and not {"nuts", "dairy"}.intersection(food.allergens)
+            and "meat" not in food.tags][:50],
+    }
+    for name, function in cases.items():
+        repeat = 10 if name.startswith("scan") else args.repeat
+        p50, p95 = timed(function, repeat)
+        print(f"{name:<36} p50 {p50:8.3f} ms   p95 {p95:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
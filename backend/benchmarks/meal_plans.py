@@ -0,0 +1,93 @@
+"""
+Time the meal planner, for one customer and for a batch across processes.
+
+Synthetic profiles are planned against the default catalog, no database
+needed. Prints the latency of a week's plan for one customer and the
+throughput of the process pool used by ``POST /meal-plans/batch``.
+
+Usage (from the ``backend/`` folder):
+
+    python -m benchmarks.meal_plans --customers 5000 --processes 8
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from app.enums import Gender
+from app.foods.catalog import FoodCatalog
+from app.foods.data import DEFAULT_FOODS
+from app.meal_plans import batch
+from app.meal_plans.engine import MealPlanner
+from app.meal_plans.profiles import DIET_EXCLUSIONS, build_profile
+from app.meal_plans.schemas import DEFAULT_MEALS
+
+ALLERGENS = ["gluten", "dairy", "egg", "nuts", "peanuts", "soy", "fish"]
+
+
+def synthetic_profiles(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    diets = [None, *DIET_EXCLUSIONS]
+    profiles = []
+    for _ in range(count):
+        customer = {
+            "id": None,
+            "date_of_birth": date(rng.randint(1950, 2005), 1, 1),
+            "gender": rng.choice([Gender.MALE, Gender.FEMALE]),
+            "preferences": {"diet": rng.choice(diets)},
+            "allergies": {allergen: True for allergen in
+                          rng.sample(ALLERGENS, rng.randint(0, 2))},
+        }
+        summary = {"weight": rng.uniform(45, 120),
+                   "height": rng.uniform(150, 195), "bmi": None}
+        profiles.append(build_profile(customer, summary, []))
+    return profiles
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--customers", type=int, default=2000)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--chunk-size", type=int, default=200)
+    args = parser.parse_args()
+
+    profiles = synthetic_profiles(args.customers)
+    catalog = FoodCatalog(DEFAULT_FOODS)
+    planner = MealPlanner(catalog)
+
+    timings = []
+    for profile in profiles[:200]:
+        start = time.perf_counter()
+        planner.plan(profile, DEFAULT_MEALS, args.days)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    print(f"single customer, {args.days} days: "
+          f"p50 {statistics.median(timings):.1f} ms, "
+          f"p95 {timings[int(len(timings) * 0.95) - 1]:.1f} ms")
+
+    chunks = [[profile.model_dump() for profile in profiles[start:start + args.chunk_size]]
+              for start in range(0, len(profiles), args.chunk_size)]
+    with ProcessPoolExecutor(max_workers=args.processes,
+                             initializer=batch.init_worker,
+                             initargs=(catalog,)) as executor:
+        # Warm the workers up before timing.
+        list(executor.map(batch.plan_chunk, chunks[:1],
+                          [DEFAULT_MEALS], [args.days]))
+
+        start = time.perf_counter()
+        plans = sum(len(result) for result in executor.map(
+            batch.plan_chunk, chunks, [DEFAULT_MEALS] * len(chunks),
+            [args.days] * len(chunks)))
+        elapsed = time.perf_counter() - start
+
+    print(f"batch: {plans} customers in {elapsed:.2f} s, "
+          f"{plans / elapsed:.0f} plans/s "
+          f"({args.processes or os.cpu_count()} processes)")
+
+
+if __name__ == "__main__":
+    main()
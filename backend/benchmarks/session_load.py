@@ -0,0 +1,84 @@
+"""
+Load test for the per-request session factory.
+
+Drives ``GET /customers/`` in-process with an increasing number of
+concurrent clients and prints the throughput reached at each level.
+With one session per request the throughput should keep climbing until
+the connection pool (``DATABASE_POOL_SIZE`` + ``DATABASE_MAX_OVERFLOW``)
+is saturated.
+
+Usage (from the ``backend/`` folder):
+
+    python -m benchmarks.session_load --requests 2000 --clients 1 2 4 8 16 32
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+
+from httpx import ASGITransport, AsyncClient
+
+from app.database import engine
+from app.main import app
+
+
+async def _client(client: AsyncClient, path: str, counter: List[int],
+                  total: int) -> None:
+    """
+    Keep issuing requests until the shared counter reaches the total.
+    """
+    while counter[0] < total:
+        counter[0] += 1
+        response = await client.get(path)
+        response.raise_for_status()
+
+
+async def run_level(clients: int, total: int, path: str) -> float:
+    """
+    Run a single concurrency level.
+
+    Args:
+        clients (int): Number of concurrent clients.
+        total (int): Number of requests to issue across all clients.
+        path (str): The endpoint to request.
+
+    Returns:
+        float: Requests per second.
+    """
+    counter = [0]
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport,
+                           base_url="http://benchmark") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            _client(client, path, counter, total) for _ in range(clients)
+        ))
+        elapsed = time.perf_counter() - started
+
+    return total / elapsed
+
+
+async def main(args: argparse.Namespace) -> None:
+    # Warm the pool so the first level doesn't pay for connection setup.
+    await run_level(max(args.clients), max(args.clients), args.path)
+
+    print(f"{'clients':>8} {'req/s':>10} {'speedup':>8}")
+    baseline = None
+    for clients in args.clients:
+        throughput = await run_level(clients, args.requests, args.path)
+        baseline = baseline or throughput
+        print(f"{clients:>8} {throughput:>10.1f} {throughput / baseline:>7.2f}x")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000,
+                        help="Requests issued per concurrency level.")
+    parser.add_argument("--clients", type=int, nargs="+",
+                        default=[1, 2, 4, 8, 16, 32],
+                        help="Concurrency levels to run.")
+    parser.add_argument("--path", default="/customers/?limit=10",
+                        help="Endpoint to drive.")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,141 @@
+"""
+Move the JSON document columns to JSONB without long table locks.
+
+The migration runs in three steps so the tables stay writable throughout:
+
+1. expand (revision ``d3f8b6a2e417``): every column gets a nullable
+   ``<column>_jsonb`` shadow, and a trigger keeps the shadow of inserted
+   and updated rows in sync. Adding a nullable column without a default
+   only touches the catalog.
+2. backfill (this script): existing rows are converted in small batches,
+   each committed on its own, so row locks are held for one batch only.
+   It can be interrupted and run again, converted rows are skipped.
+3. contract (revision ``e6a1c9d4b830``): the remaining rows are backfilled,
+   the shadows replace the old columns in one short transaction, and the
+   GIN indexes are built ``CONCURRENTLY``.
+
+``alembic upgrade head`` runs the three in a row. On large tables, upgrade
+to the expand revision first, run this script while the API keeps
+serving, then upgrade to head.
+
+Usage (from the ``backend/`` folder):
+
+    alembic upgrade d3f8b6a2e417
+    python -m scripts.jsonb_migration --batch-size 5000 --pause 0.1
+    alembic upgrade head
+"""
+import argparse
+import time
+from typing import Dict, Sequence, Tuple
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
+
+# The JSON document columns moved to JSONB, by table.
+JSONB_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "customermaster": ("preferences", "allergies"),
+    "injurymaster": ("impact_on_diet",),
+    "diseasemaster": ("medications", "impact_on_diet"),
+}
+
+FIRST_ID = "00000000-0000-0000-0000-000000000000"
+
+
+def shadow(column: str) -> str:
+    return f"{column}_jsonb"
+
+
+def sync_trigger(table: str, columns: Sequence[str]) -> Tuple[str, str]:
+    """
+    SQL creating the trigger that fills the shadows of written rows.
+
+    Returns:
+        Tuple[str, str]: The trigger function and the trigger.
+    """
+    assignments = " ".join(f"NEW.{shadow(column)} := NEW.{column}::jsonb;"
+                           for column in columns)
+    function = (f"CREATE OR REPLACE FUNCTION {table}_jsonb_sync() "
+                f"RETURNS trigger AS $$ BEGIN {assignments} RETURN NEW; END; $$ "
+                f"LANGUAGE plpgsql")
+    trigger = (f"CREATE TRIGGER {table}_jsonb_sync BEFORE INSERT OR UPDATE "
+               f"ON {table} FOR EACH ROW EXECUTE FUNCTION {table}_jsonb_sync()")
+    return function, trigger
+
+
+def pending(columns: Sequence[str]) -> str:
+    """
+    SQL condition matching the rows whose shadows are still empty.
+    """
+    return " OR ".join(f"({column} IS NOT NULL AND {shadow(column)} IS NULL)"
+                       for column in columns)
+
+
+def assignments(table: str, columns: Sequence[str]) -> str:
+    return ", ".join(f"{shadow(column)} = {table}.{column}::jsonb"
+                     for column in columns)
+
+
+def backfill(connection: Connection, table: str, columns: Sequence[str],
+             batch_size: int = 5000, pause: float = 0.0) -> int:
+    """
+    Convert the rows of a table whose shadows are still empty.
+
+    Rows are walked in primary key order, one ``UPDATE`` per batch. The
+    connection must be in autocommit mode so every batch commits and
+    releases its row locks.
+
+    Args:
+        connection (Connection): An autocommit connection.
+        table (str): The table to convert.
+        columns (Sequence[str]): Its JSON document columns.
+        batch_size (int, optional): Rows per batch.
+        pause (float, optional): Seconds to sleep between batches, to
+            leave room to the application's writes.
+
+    Returns:
+        int: The number of rows converted.
+    """
+    statement = text(
+        f"WITH batch AS (SELECT id FROM {table} "
+        f"WHERE id > CAST(:after AS uuid) AND ({pending(columns)}) "
+        f"ORDER BY id LIMIT :batch_size) "
+        f"UPDATE {table} SET {assignments(table, columns)} FROM batch "
+        f"WHERE {table}.id = batch.id RETURNING {table}.id")
+
+    converted, after = 0, FIRST_ID
+    while True:
+        ids = connection.execute(statement, {"after": after,
+                                             "batch_size": batch_size}).scalars().all()
+        if not ids:
+            return converted
+        converted += len(ids)
+        after = str(max(ids))
+        if pause:
+            time.sleep(pause)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--pause", type=float, default=0.0,
+                        help="seconds to sleep between batches")
+    args = parser.parse_args()
+
+    from app.config import settings
+
+    engine = create_engine(settings.ALEMBIC_DATABASE_URL,
+                           isolation_level="AUTOCOMMIT")
+    try:
+        with engine.connect() as connection:
+            for table, columns in JSONB_COLUMNS.items():
+                start = time.perf_counter()
+                converted = backfill(connection, table, columns,
+                                     args.batch_size, args.pause)
+                print(f"{table}: {converted} rows converted in "
+                      f"{time.perf_counter() - start:.1f} s")
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()